@@ -1,82 +1,210 @@
-import os, json, uuid
+import asyncio, os, json, uuid
+from dataclasses import asdict
 from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
-
-from .db import Database, get_settings, set_settings, get_state, list_announcements
-from .events import EventBus
-from .timer import TimerService
-from .seating import randomize_seating, rebalance, deseat_seating, normalize_seats
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from .db import (
+    Database,
+    decode_cursor,
+    encode_cursor,
+    get_settings_snapshot,
+    set_settings,
+    get_state,
+    list_announcements,
+    player_name_filter,
+    search_players,
+)
+from .events import EventBus, RESYNC
+from .seating import randomize_seating, rebalance, deseat_seating, normalize_seats, list_tables, get_assignments
+from .read_model import invalidate_roster, read_model
+from .tournaments import TournamentRegistry, control_timer, get_tournament
 from .utils import now_ms
+from .ws_manager import ws_manager
 
 router = APIRouter()
-
-def sse_format(event: str, data: dict[str, Any]) -> str:
-    payload = json.dumps(data, separators=(",", ":"))
-    return f"event: {event}\ndata: {payload}\n\n"
+# Process-wide endpoints, mounted once (not per tournament)
+tournaments_router = APIRouter()
+
+# Comment line sent on idle SSE streams so proxies don't time them out
+SSE_KEEPALIVE_S = 15
+
+# Results returned by /players/search, unless the caller asks for fewer (or more, up to the max)
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+
+# Page sizes for /players and /announcements, unless the caller asks for fewer (or more, up to the max)
+PLAYERS_PAGE_LIMIT = 100
+ANNOUNCEMENTS_PAGE_LIMIT = 50
+PAGE_MAX_LIMIT = 500
+
+def sse_format(event: str, data: dict[str, Any] | str, id: Optional[str] = None) -> str:
+    payload = data if isinstance(data, str) else json.dumps(data, separators=(",", ":"))
+    head = f"id: {id}\n" if id is not None else ""
+    return f"{head}event: {event}\ndata: {payload}\n\n"
+
+def sse_event_id(bus: EventBus, seq: int) -> str:
+    return f"{bus.epoch}:{seq}"
+
+def parse_sse_event_id(bus: EventBus, value: Optional[str]) -> Optional[int]:
+    """Sequence number from a Last-Event-ID, or None if it isn't from this bus."""
+    epoch, _, seq = (value or "").partition(":")
+    if epoch != bus.epoch or not seq.isdigit():
+        return None
+    return int(seq)
+
+def page_cursor(cursor: Optional[str], types: tuple[type, ...]) -> Optional[list[Any]]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, types)
+    except ValueError:
+        raise HTTPException(400, "invalid cursor")
+
+def page_limit(limit: int) -> int:
+    return max(1, min(limit, PAGE_MAX_LIMIT))
+
+async def cached_roster_read(request: Request, key: tuple, load) -> Response:
+    """Serve a roster read from the in-process read model, honouring If-None-Match."""
+    rm = read_model(get_tournament(request).db)
+    etag = rm.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(await rm.get(key, load), headers=headers)
 
 @router.get("/health")
 async def health():
     return {"ok": True}
 
+@tournaments_router.get("/tournaments")
+async def list_tournaments_api(request: Request):
+    registry: TournamentRegistry = request.app.state.tournaments
+    return [{"id": t.id, "name": t.name} for t in registry.all()]
+
+@tournaments_router.post("/tournaments")
+async def create_tournament(request: Request, payload: dict):
+    registry: TournamentRegistry = request.app.state.tournaments
+    name = (payload.get("name") or "").strip()
+    if not name:
+        raise HTTPException(400, "name is required")
+    t = await registry.create(name)
+    return {"id": t.id}
+
+@router.get("/events/stats")
+async def event_stats(request: Request):
+    bus: EventBus = get_tournament(request).bus
+    return {
+        "subscribers": bus.subscriber_count,
+        "ws_clients": ws_manager.client_count,
+        "ws_evicted": ws_manager.evicted,
+        **asdict(bus.stats),
+    }
+
+@router.get("/events")
+async def event_stream(request: Request):
+    """
+    Server-Sent Events feed of the same events as the WebSocket, for display-only
+    clients.  Each `data:` line is the WebSocket message ({"type", "payload"}).
+    Ids are "<bus epoch>:<seq>"; a reconnect with Last-Event-ID resumes from the
+    bus's ring buffer, otherwise (or if the gap is too old) it starts with a
+    full `state` snapshot.
+    """
+    t = get_tournament(request)
+    db: Database = t.db
+    bus: EventBus = t.bus
+    after = parse_sse_event_id(bus, request.headers.get("last-event-id"))
+
+    async def snapshot(seq: int) -> str:
+        snap = bus.snapshot_frame()
+        if snap is not None:
+            seq, frame = snap
+            return sse_format("state", frame, id=sse_event_id(bus, seq))
+        settings = await get_settings_snapshot(db)
+        state = await get_state(db)
+        data = {"type": "state", "payload": {"settings": settings.raw, "state": {**state, "settings_version": settings.version}}}
+        return sse_format("state", data, id=sse_event_id(bus, seq))
+
+    async def stream():
+        yield "retry: 2000\n\n"
+        start = after
+        if start is None:
+            start = bus.last_seq
+            yield await snapshot(start)
+        events = bus.subscribe(after=start)
+        nxt = asyncio.ensure_future(events.__anext__())
+        try:
+            while True:
+                done, _ = await asyncio.wait({nxt}, timeout=SSE_KEEPALIVE_S)
+                if not done:
+                    yield ": keepalive\n\n"
+                    continue
+                ev = nxt.result()
+                nxt = asyncio.ensure_future(events.__anext__())
+                if ev.type == RESYNC:
+                    yield await snapshot(bus.last_seq)
+                    continue
+                yield sse_format(ev.type, ev.frame, id=sse_event_id(bus, ev.seq))
+        finally:
+            nxt.cancel()
+            try:
+                await nxt
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+            await events.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/state")
 async def read_state(request: Request):
-    db: Database = request.app.state.db
-    settings = await get_settings(db)
+    db: Database = get_tournament(request).db
+    snap = await get_settings_snapshot(db)
     state = await get_state(db)
-    return {"settings": settings, "state": state}
+    return {"settings": snap.raw, "settings_version": snap.version, "state": state}
+
+@router.get("/settings")
+async def read_settings(request: Request):
+    snap = await get_settings_snapshot(get_tournament(request).db)
+    return {"version": snap.version, "settings": snap.raw}
 
 @router.put("/settings")
 async def update_settings(request: Request, payload: dict[str, Any]):
-    db: Database = request.app.state.db
-    timer: TimerService = request.app.state.timer
+    db: Database = get_tournament(request).db
     if "levels" not in payload or not isinstance(payload["levels"], list) or len(payload["levels"]) == 0:
         raise HTTPException(400, "settings.levels must be a non-empty list")
     await set_settings(db, payload)
     await normalize_seats(db)
-    # Apply changes immediately: if current level duration changed, clamp remaining to new total
-    settings = payload
-    levels = settings.get("levels", [])
-    try:
-        idx = int(timer.current_level_index)
-        if 0 <= idx < len(levels):
-            total_ms = int(levels[idx].get("minutes", 0)) * 60_000
-            if total_ms > 0:
-                timer.remaining_ms = min(int(timer.remaining_ms), total_ms)
-    except Exception:
-        pass
-    await timer._persist()
-    await timer._emit_full_state()
+    # Apply changes immediately
+    await control_timer(request, "apply_settings")
     return {"ok": True}
 
 @router.post("/timer/pause")
 async def timer_pause(request: Request):
-    timer: TimerService = request.app.state.timer
-    await timer.pause()
+    await control_timer(request, "pause")
     return {"ok": True}
 
 @router.post("/timer/resume")
 async def timer_resume(request: Request):
-    timer: TimerService = request.app.state.timer
-    await timer.resume()
+    await control_timer(request, "resume")
     return {"ok": True}
 
 @router.post("/timer/add_time")
 async def timer_add_time(request: Request, delta_ms: int):
-    timer: TimerService = request.app.state.timer
-    await timer.add_time(delta_ms)
+    await control_timer(request, "add_time", delta_ms=delta_ms)
     return {"ok": True}
 
 @router.post("/timer/reset_level")
 async def timer_reset_level(request: Request):
-    timer: TimerService = request.app.state.timer
-    await timer.reset_level()
+    await control_timer(request, "reset_level")
     return {"ok": True}
 
 @router.post("/timer/go_to_level")
 async def timer_go_to_level(request: Request, level_index: int):
-    timer: TimerService = request.app.state.timer
-    await timer.go_to_level(level_index)
+    await control_timer(request, "go_to_level", level_index=level_index)
     return {"ok": True}
 
 @router.get("/sounds")
@@ -92,69 +220,137 @@ async def list_sounds(request: Request):
     return {"files": out}
 
 @router.get("/players")
-async def list_players(request: Request, q: Optional[str] = None, eliminated: Optional[bool] = None):
-    db: Database = request.app.state.db
-    sql = "SELECT id, name, eliminated FROM players"
+async def list_players(
+    request: Request,
+    q: Optional[str] = None,
+    eliminated: Optional[bool] = None,
+    unseated: Optional[bool] = None,
+    limit: int = PLAYERS_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+):
+    """
+    One page of the roster: active players first, newest first.  Pass the
+    returned `next_cursor` back as `cursor` for the next page (it is null on
+    the last one).  Pages resume after the last row seen, so players added
+    meanwhile never shift a page or show up twice.  `unseated=true` keeps
+    only the players without a seat, `unseated=false` only the seated ones.
+    """
+    db: Database = get_tournament(request).db
+    after = page_cursor(cursor, (int, int, str))
+    limit = page_limit(limit)
+    return await cached_roster_read(
+        request,
+        ("players", q or "", eliminated, unseated, limit, cursor),
+        lambda: _load_players(db, q, eliminated, limit, after, unseated=unseated),
+    )
+
+async def _load_players(
+    db: Database,
+    q: Optional[str],
+    eliminated: Optional[bool],
+    limit: int,
+    after: Optional[list[Any]],
+    *,
+    unseated: Optional[bool] = None,
+) -> dict[str, Any]:
+    sql = "SELECT id, name, eliminated, created_at_ms FROM players"
     clauses = []
     params: list[Any] = []
     if q:
-        clauses.append("LOWER(name) LIKE ?")
-        params.append(f"%{q.lower()}%")
+        clause, clause_params = player_name_filter(db, q)
+        clauses.append(clause)
+        params.extend(clause_params)
     if eliminated is not None:
         clauses.append("eliminated=?")
         params.append(1 if eliminated else 0)
+    if unseated is not None:
+        seated = "EXISTS (SELECT 1 FROM seat_assignments s WHERE s.player_id = players.id)"
+        clauses.append(f"NOT {seated}" if unseated else seated)
+    if after is not None:
+        # Rows after (eliminated, created_at_ms, id) in roster order
+        clauses.append("(eliminated > ? OR (eliminated = ? AND (created_at_ms < ? OR (created_at_ms = ? AND id < ?))))")
+        elim, created, pid = after
+        params.extend([elim, elim, created, created, pid])
     if clauses:
         sql += " WHERE " + " AND ".join(clauses)
-    sql += " ORDER BY eliminated ASC, created_at_ms DESC"
+    sql += " ORDER BY eliminated ASC, created_at_ms DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
     rows = await db.fetchall(sql, tuple(params))
-    return [{"id": r["id"], "name": r["name"], "eliminated": bool(r["eliminated"])} for r in rows]
+    last = rows[limit - 1] if len(rows) > limit else None
+    return {
+        "items": [{"id": r["id"], "name": r["name"], "eliminated": bool(r["eliminated"])} for r in rows[:limit]],
+        "next_cursor": encode_cursor(last["eliminated"], last["created_at_ms"], last["id"]) if last else None,
+    }
 
-@router.post("/players")
-async def create_player(request: Request, payload: dict):
-    db: Database = request.app.state.db
-    name = (payload.get("name") or "").strip()
+@router.get("/players/search")
+async def search_players_api(request: Request, q: str = "", limit: int = SEARCH_DEFAULT_LIMIT):
+    """Autocomplete: up to `limit` players whose name contains `q`, prefix matches first."""
+    q = q.strip()
+    if not q:
+        return []
+    db: Database = get_tournament(request).db
+    return await search_players(db, q, max(1, min(limit, SEARCH_MAX_LIMIT)))
+
+async def _checked_player_name(db: Database, raw: Any, *, player_id: Optional[str] = None) -> str:
+    """
+    The trimmed player name, after checking it is not empty (400) and that no
+    other player has it, ignoring case (409).  Call inside the transaction
+    that writes it: holding the write lock keeps the check valid until then.
+    """
+    name = str(raw or "").strip()
     if not name:
         raise HTTPException(400, "name is required")
+    row = await db.fetchone("SELECT id FROM players WHERE lower(name) = lower(?) AND id <> ?", (name, player_id or ""))
+    if row:
+        raise HTTPException(409, "A player with that name already exists")
+    return name
+
+@router.post("/players")
+async def create_player(request: Request, payload: dict):
+    db: Database = get_tournament(request).db
     pid = str(uuid.uuid4())
-    await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)", (pid, name, now_ms()))
-    await db.commit()
+    async with db.transaction():
+        name = await _checked_player_name(db, payload.get("name"))
+        await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)", (pid, name, now_ms()))
+        invalidate_roster(db)
     return {"id": pid}
 
 @router.patch("/players/{player_id}")
 async def update_player(request: Request, player_id: str, payload: dict):
-    db: Database = request.app.state.db
-    fields = []
-    params: list[Any] = []
-    if "name" in payload and payload["name"] is not None:
-        fields.append("name=?")
-        params.append(str(payload["name"]).strip())
-    if "eliminated" in payload and payload["eliminated"] is not None:
-        fields.append("eliminated=?")
-        params.append(1 if payload["eliminated"] else 0)
-    if not fields:
+    db: Database = get_tournament(request).db
+    if all(payload.get(k) is None for k in ("name", "eliminated")):
         return {"ok": True}
-    params.append(player_id)
-    await db.execute(f"UPDATE players SET {', '.join(fields)} WHERE id=?", tuple(params))
-    await db.commit()
+    async with db.transaction():
+        fields = []
+        params: list[Any] = []
+        if payload.get("name") is not None:
+            fields.append("name=?")
+            params.append(await _checked_player_name(db, payload["name"], player_id=player_id))
+        if payload.get("eliminated") is not None:
+            fields.append("eliminated=?")
+            params.append(1 if payload["eliminated"] else 0)
+        params.append(player_id)
+        await db.execute(f"UPDATE players SET {', '.join(fields)} WHERE id=?", tuple(params))
+        invalidate_roster(db)
     return {"ok": True}
 
 @router.delete("/players/{player_id}")
 async def delete_player(request: Request, player_id: str):
-    db: Database = request.app.state.db
-    await db.execute("DELETE FROM players WHERE id=?", (player_id,))
-    await db.execute("UPDATE seat_assignments SET player_id=NULL WHERE player_id=?", (player_id,))
-    await db.commit()
+    db: Database = get_tournament(request).db
+    async with db.transaction():
+        await db.execute("DELETE FROM players WHERE id=?", (player_id,))
+        await db.execute("UPDATE seat_assignments SET player_id=NULL WHERE player_id=?", (player_id,))
+        invalidate_roster(db)
     return {"ok": True}
 
 @router.get("/tables")
 async def list_tables_api(request: Request):
-    db: Database = request.app.state.db
-    rows = await db.fetchall("SELECT id, name, seats, enabled FROM tables ORDER BY created_at_ms ASC")
-    return [{"id": r["id"], "name": r["name"], "seats": r["seats"], "enabled": bool(r["enabled"])} for r in rows]
+    db: Database = get_tournament(request).db
+    return await cached_roster_read(request, ("tables",), lambda: list_tables(db))
 
 @router.post("/tables")
 async def create_table(request: Request, payload: dict):
-    db: Database = request.app.state.db
+    db: Database = get_tournament(request).db
     name = (payload.get("name") or "").strip()
     seats = int(payload.get("seats") or 9)
     if not name:
@@ -162,15 +358,18 @@ async def create_table(request: Request, payload: dict):
     if seats < 2 or seats > 12:
         raise HTTPException(400, "seats must be 2..12")
     tid = str(uuid.uuid4())
-    await db.execute("INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, ?, 1, ?)", (tid, name, seats, now_ms()))
-    for seat_num in range(1, seats + 1):
-        await db.execute("INSERT OR IGNORE INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, NULL)", (tid, seat_num))
-    await db.commit()
+    async with db.transaction():
+        await db.execute("INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, ?, 1, ?)", (tid, name, seats, now_ms()))
+        await db.executemany(
+            "INSERT OR IGNORE INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, NULL)",
+            [(tid, seat_num) for seat_num in range(1, seats + 1)],
+        )
+        invalidate_roster(db)
     return {"id": tid}
 
 @router.patch("/tables/{table_id}")
 async def update_table(request: Request, table_id: str, payload: dict):
-    db: Database = request.app.state.db
+    db: Database = get_tournament(request).db
     fields = []
     params: list[Any] = []
     if "name" in payload and payload["name"] is not None:
@@ -188,48 +387,45 @@ async def update_table(request: Request, table_id: str, payload: dict):
     if not fields:
         return {"ok": True}
     params.append(table_id)
-    await db.execute(f"UPDATE tables SET {', '.join(fields)} WHERE id=?", tuple(params))
-    await db.commit()
-    await normalize_seats(db)
+    async with db.transaction():
+        await db.execute(f"UPDATE tables SET {', '.join(fields)} WHERE id=?", tuple(params))
+        await normalize_seats(db)
+        invalidate_roster(db)
     return {"ok": True}
 
 @router.delete("/tables/{table_id}")
 async def delete_table(request: Request, table_id: str):
-    db: Database = request.app.state.db
-    await db.execute("DELETE FROM tables WHERE id=?", (table_id,))
-    await db.execute("DELETE FROM seat_assignments WHERE table_id=?", (table_id,))
-    await db.commit()
+    db: Database = get_tournament(request).db
+    async with db.transaction():
+        await db.execute("DELETE FROM tables WHERE id=?", (table_id,))
+        await db.execute("DELETE FROM seat_assignments WHERE table_id=?", (table_id,))
+        invalidate_roster(db)
     return {"ok": True}
 
 @router.get("/seats")
 async def list_seats(request: Request):
-    db: Database = request.app.state.db
-    rows = await db.fetchall(
-        '''
-        SELECT sa.table_id, sa.seat_num, sa.player_id, t.name AS table_name
-        FROM seat_assignments sa
-        JOIN tables t ON t.id = sa.table_id
-        ORDER BY t.created_at_ms ASC, sa.seat_num ASC
-        '''
-    )
-    return [{"table_id": r["table_id"], "table_name": r["table_name"], "seat_num": r["seat_num"], "player_id": r["player_id"]} for r in rows]
+    db: Database = get_tournament(request).db
+    return await cached_roster_read(request, ("seats",), lambda: get_assignments(db))
 
 @router.post("/seating/randomize")
 async def seating_randomize(request: Request):
-    db: Database = request.app.state.db
-    bus: EventBus = request.app.state.bus
+    t = get_tournament(request)
+    db: Database = t.db
+    bus: EventBus = t.bus
     return await randomize_seating(db, bus)
 
 @router.post("/seating/rebalance")
 async def seating_rebalance(request: Request):
-    db: Database = request.app.state.db
-    bus: EventBus = request.app.state.bus
+    t = get_tournament(request)
+    db: Database = t.db
+    bus: EventBus = t.bus
     return await rebalance(db, bus)
 
 @router.post("/seating/deseat")
 async def deseat(request: Request):
-    db: Database = request.app.state.db
-    bus: EventBus = request.app.state.bus
+    t = get_tournament(request)
+    db: Database = t.db
+    bus: EventBus = t.bus
     return await deseat_seating(db, bus)
 
 @router.post("/seating/move")
@@ -243,7 +439,7 @@ async def move_seat(request: Request, payload: dict[str, Any]):
         "mode": "swap" | "move"   # optional; default swap
       }
     """
-    db: Database = request.app.state.db
+    db: Database = get_tournament(request).db
 
     player_id = payload.get("player_id")
     to_table_id = payload.get("to_table_id")
@@ -253,53 +449,57 @@ async def move_seat(request: Request, payload: dict[str, Any]):
     if not player_id or not to_table_id:
         raise HTTPException(400, "player_id and to_table_id required")
 
-    # destination seat exists?
-    dest_row = await db.fetchone(
-        "SELECT player_id FROM seat_assignments WHERE table_id=? AND seat_num=?",
-        (to_table_id, to_seat_num),
-    )
-    if dest_row is None:
-        raise HTTPException(404, "Seat not found")
-    dest_player_id = dest_row["player_id"]
-
-    # find source seat
-    src = await db.fetchone(
-        "SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?",
-        (player_id,),
-    )
-    src_table_id = src["table_id"] if src else None
-    src_seat_num = src["seat_num"] if src else None
-
-    if src_table_id == to_table_id and src_seat_num == to_seat_num:
-        return {"ok": True, "mode": "noop"}
-
-    if mode == "move":
-        await db.execute(
-            "UPDATE seat_assignments SET player_id=NULL WHERE table_id=? AND seat_num=?",
+    # Read and write under one transaction: concurrent moves can't interleave.
+    async with db.transaction():
+        # destination seat exists?
+        dest_row = await db.fetchone(
+            "SELECT player_id FROM seat_assignments WHERE table_id=? AND seat_num=?",
             (to_table_id, to_seat_num),
         )
-        await db.execute(
-            "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
-            (player_id, to_table_id, to_seat_num),
+        if dest_row is None:
+            raise HTTPException(404, "Seat not found")
+        dest_player_id = dest_row["player_id"]
+
+        # find source seat
+        src = await db.fetchone(
+            "SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?",
+            (player_id,),
         )
-        if src_table_id is not None:
+        src_table_id = src["table_id"] if src else None
+        src_seat_num = src["seat_num"] if src else None
+
+        if src_table_id == to_table_id and src_seat_num == to_seat_num:
+            return {"ok": True, "mode": "noop"}
+
+        # A player may hold only one seat at a time (unique index), so every
+        # player is unseated before being seated again.
+        if mode == "move":
+            if src_table_id is not None:
+                await db.execute(
+                    "UPDATE seat_assignments SET player_id=NULL WHERE table_id=? AND seat_num=?",
+                    (src_table_id, src_seat_num),
+                )
+            await db.execute(
+                "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
+                (player_id, to_table_id, to_seat_num),
+            )
+        else:
+            # swap (default): swap with whoever is in dest (including empty)
             await db.execute(
                 "UPDATE seat_assignments SET player_id=NULL WHERE table_id=? AND seat_num=?",
-                (src_table_id, src_seat_num),
+                (to_table_id, to_seat_num),
             )
-    else:
-        # swap (default): swap with whoever is in dest (including empty)
-        if src_table_id is not None:
+            if src_table_id is not None:
+                await db.execute(
+                    "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
+                    (dest_player_id, src_table_id, src_seat_num),
+                )
             await db.execute(
                 "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
-                (dest_player_id, src_table_id, src_seat_num),
+                (player_id, to_table_id, to_seat_num),
             )
-        await db.execute(
-            "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
-            (player_id, to_table_id, to_seat_num),
-        )
+        invalidate_roster(db)
 
-    await db.commit()
     return {
         "ok": True,
         "mode": mode,
@@ -312,27 +512,35 @@ async def move_seat(request: Request, payload: dict[str, Any]):
 @router.post("/seating/unseat")
 async def unseat_player(request: Request, payload: dict[str, Any]):
     """Remove a single player from their current seat."""
-    db: Database = request.app.state.db
+    db: Database = get_tournament(request).db
 
     player_id = payload.get("player_id")
     if not player_id:
         raise HTTPException(400, "player_id required")
 
-    row = await db.fetchone(
-        "SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?",
-        (player_id,),
-    )
-    if row is None:
-        return {"ok": True, "mode": "noop", "from": {"table_id": None, "seat_num": None}}
+    async with db.transaction():
+        row = await db.fetchone(
+            "SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?",
+            (player_id,),
+        )
+        if row is None:
+            return {"ok": True, "mode": "noop", "from": {"table_id": None, "seat_num": None}}
 
-    await db.execute(
-        "UPDATE seat_assignments SET player_id=NULL WHERE table_id=? AND seat_num=?",
-        (row["table_id"], row["seat_num"]),
-    )
-    await db.commit()
+        await db.execute(
+            "UPDATE seat_assignments SET player_id=NULL WHERE table_id=? AND seat_num=?",
+            (row["table_id"], row["seat_num"]),
+        )
+        invalidate_roster(db)
     return {"ok": True, "mode": "unseat", "from": {"table_id": row["table_id"], "seat_num": row["seat_num"]}}
 
 @router.get("/announcements")
-async def announcements(request: Request, limit: int = 50):
-    db: Database = request.app.state.db
-    return {"items": await list_announcements(db, limit=limit)}
+async def announcements(request: Request, limit: int = ANNOUNCEMENTS_PAGE_LIMIT, cursor: Optional[str] = None):
+    """Newest first, a page at a time; `next_cursor` works as on /players."""
+    db: Database = get_tournament(request).db
+    after = page_cursor(cursor, (int,))
+    limit = page_limit(limit)
+    items = await list_announcements(db, limit=limit + 1, before_id=after[0] if after else None)
+    return {
+        "items": items[:limit],
+        "next_cursor": encode_cursor(items[limit - 1]["id"]) if len(items) > limit else None,
+    }
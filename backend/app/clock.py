@@ -0,0 +1,59 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+from .events import Event
+from .utils import now_ms
+
+
+class ClockBeacon:
+    """
+    Process-wide server clock broadcast.
+
+    Every `interval_ms` the beacon builds one `clock` event carrying the
+    server time, and wakes every connection waiting in beats().  The event's
+    frame is encoded once and shared by all of them, whatever the tournament.
+    This lets displays keep their clock offset estimate current without each
+    one pinging the server.  An interval of 0 disables the beacon.
+    """
+
+    def __init__(self, interval_ms: int) -> None:
+        self.interval_ms = max(0, int(interval_ms))
+        self.latest: Optional[Event] = None
+        self._new_beat = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_ms > 0
+
+    async def start(self) -> None:
+        if not self.enabled or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def beat(self) -> Event:
+        self.latest = Event("clock", {"server_time_ms": now_ms(), "interval_ms": self.interval_ms})
+        self.latest.frame  # encode before fan-out
+        waiters, self._new_beat = self._new_beat, asyncio.Event()
+        waiters.set()
+        return self.latest
+
+    async def beats(self) -> AsyncIterator[Event]:
+        """Yield each beat from now on; a slow reader skips to the newest one."""
+        while True:
+            await self._new_beat.wait()
+            yield self.latest
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_ms / 1000)
+            self.beat()
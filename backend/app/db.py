@@ -1,104 +1,18 @@
 import asyncio
+import base64
+import functools
+import os
 import re
 import json
+import sqlite3
 import aiosqlite
 import asyncpg
 from abc import ABC, abstractmethod
-from typing import Any, Optional
-
-SQLITE_SCHEMA = r"""
-PRAGMA journal_mode=WAL;
-
-CREATE TABLE IF NOT EXISTS settings (
-  id INTEGER PRIMARY KEY CHECK (id = 1),
-  json TEXT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS tourney_state (
-  id INTEGER PRIMARY KEY CHECK (id = 1),
-  current_level_index INTEGER NOT NULL,
-  remaining_ms INTEGER NOT NULL,
-  finish_at_server_ms INTEGER NOT NULL DEFAULT 0,
-  running INTEGER NOT NULL,
-  updated_at_ms INTEGER NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS players (
-  id TEXT PRIMARY KEY,
-  name TEXT NOT NULL,
-  eliminated INTEGER NOT NULL DEFAULT 0,
-  created_at_ms INTEGER NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS tables (
-  id TEXT PRIMARY KEY,
-  name TEXT NOT NULL,
-  seats INTEGER NOT NULL,
-  enabled INTEGER NOT NULL DEFAULT 1,
-  created_at_ms INTEGER NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS seat_assignments (
-  table_id TEXT NOT NULL,
-  seat_num INTEGER NOT NULL,
-  player_id TEXT NULL,
-  PRIMARY KEY (table_id, seat_num),
-  FOREIGN KEY (table_id) REFERENCES tables(id) ON DELETE CASCADE
-);
-
-CREATE TABLE IF NOT EXISTS announcements (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  created_at_ms INTEGER NOT NULL,
-  type TEXT NOT NULL,
-  payload_json TEXT NOT NULL
-);
-"""
-
-POSTGRES_SCHEMA = """
-CREATE TABLE IF NOT EXISTS settings (
-  id INTEGER PRIMARY KEY CHECK (id = 1),
-  json TEXT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS tourney_state (
-  id INTEGER PRIMARY KEY CHECK (id = 1),
-  current_level_index INTEGER NOT NULL,
-  remaining_ms BIGINT NOT NULL,
-  finish_at_server_ms BIGINT NOT NULL DEFAULT 0,
-  running INTEGER NOT NULL,
-  updated_at_ms BIGINT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS players (
-  id TEXT PRIMARY KEY,
-  name TEXT NOT NULL,
-  eliminated INTEGER NOT NULL DEFAULT 0,
-  created_at_ms BIGINT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS tables (
-  id TEXT PRIMARY KEY,
-  name TEXT NOT NULL,
-  seats INTEGER NOT NULL,
-  enabled INTEGER NOT NULL DEFAULT 1,
-  created_at_ms BIGINT NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS seat_assignments (
-  table_id TEXT NOT NULL,
-  seat_num INTEGER NOT NULL,
-  player_id TEXT NULL,
-  PRIMARY KEY (table_id, seat_num),
-  FOREIGN KEY (table_id) REFERENCES tables(id) ON DELETE CASCADE
-);
-
-CREATE TABLE IF NOT EXISTS announcements (
-  id SERIAL PRIMARY KEY,
-  created_at_ms BIGINT NOT NULL,
-  type TEXT NOT NULL,
-  payload_json TEXT NOT NULL
-);
-"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from .migrations import migrate_postgres, migrate_sqlite, sqlite_has_table
 
 DEFAULT_SETTINGS = {
   "levels": [
@@ -131,8 +45,16 @@ DEFAULT_STATE = {
 }
 
 
-def _to_pg(sql: str, params: tuple) -> tuple[str, list]:
-    """Translate SQLite-flavored SQL to PostgreSQL: ? -> $N, INSERT OR IGNORE -> ON CONFLICT DO NOTHING."""
+# Prepared statements kept per PostgreSQL connection
+STATEMENT_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=512)
+def _translate_sql(sql: str) -> str:
+    """Translate SQLite-flavored SQL to PostgreSQL: ? -> $N, INSERT OR IGNORE -> ON CONFLICT DO NOTHING.
+
+    Cached by SQL text: the app issues the same few dozen statements over and over.
+    """
     is_ignore = bool(re.search(r'\bINSERT\s+OR\s+IGNORE\b', sql, re.IGNORECASE))
     if is_ignore:
         sql = re.sub(r'\bINSERT\s+OR\s+IGNORE\s+INTO\b', 'INSERT INTO', sql, flags=re.IGNORECASE)
@@ -149,15 +71,85 @@ def _to_pg(sql: str, params: tuple) -> tuple[str, list]:
             pg_sql = pg_sql[:m.start()].rstrip() + ' ON CONFLICT DO NOTHING ' + pg_sql[m.start():]
         else:
             pg_sql = pg_sql.rstrip().rstrip(';') + ' ON CONFLICT DO NOTHING'
-    return pg_sql, list(params)
+    return pg_sql
+
+
+def _to_pg(sql: str, params: tuple) -> tuple[str, list]:
+    return _translate_sql(sql), list(params)
+
+
+@dataclass(frozen=True)
+class CompiledLevel:
+    duration_ms: int
+    is_break: bool
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """
+    Immutable view of the settings row.
+
+    `raw` is the decoded JSON exactly as stored (treat it as read-only; it is
+    shared by every reader of this version).  `levels` and `sounds` are the
+    pre-parsed pieces the timer needs on its hot path.
+    """
+    version: int
+    raw: dict[str, Any]
+    levels: tuple[CompiledLevel, ...]
+    sounds: dict[str, Optional[str]]
+
+    def level_duration_ms(self, index: int) -> int:
+        if 0 <= index < len(self.levels):
+            return self.levels[index].duration_ms
+        return 0
+
+
+def compile_settings(raw: dict[str, Any], version: int) -> SettingsSnapshot:
+    levels = tuple(
+        CompiledLevel(
+            duration_ms=int(level.get("minutes") or 0) * 60_000,
+            is_break=level.get("type") == "break",
+        )
+        for level in (raw.get("levels") or [])
+    )
+    sounds = dict(raw.get("sounds") or {})
+    return SettingsSnapshot(version=version, raw=raw, levels=levels, sounds=sounds)
 
 
 class Database(ABC):
-    """Async database abstraction supporting SQLite and PostgreSQL."""
+    """
+    Async database abstraction supporting SQLite and PostgreSQL.
+
+    Writes are serialized per database.  A task's first write takes the write
+    lock and opens a transaction, which stays with that task until it commits
+    or rolls back: other tasks' writes wait for it, and their reads never see
+    its uncommitted rows.  Use transaction() to group writes.
+    """
+
+    # Settings cache, owned by get_settings_snapshot()/set_settings().
+    # Swapped as a whole so readers never observe a half-updated snapshot.
+    _settings_snapshot: Optional[SettingsSnapshot] = None
+    # Roster read model (app.read_model.ReadModel), created on first use.
+    _read_model: Optional[Any] = None
+    # "sqlite" or "postgres", for the few queries that differ (see player_name_filter)
+    dialect: str
+    # Whether SQLite's trigram index over player names exists (an optional migration)
+    players_fts: bool = False
+
+    def __init__(self) -> None:
+        self._write_lock = asyncio.Lock()
+        self._writer: Optional[asyncio.Task] = None  # task holding the write lock
+        self._tx_depth = 0  # transaction() blocks open in that task
+        self._after_commit: list[Callable[[], None]] = []
+        self._after_rollback: list[Callable[[], None]] = []
 
     @abstractmethod
     async def execute(self, sql: str, params: tuple = ()) -> None: ...
 
+    @abstractmethod
+    async def executemany(self, sql: str, params_seq: Iterable[tuple]) -> None:
+        """Run one statement for every parameter tuple, as a single batch."""
+
     @abstractmethod
     async def execute_returning_id(self, sql: str, params: tuple = ()) -> int: ...
 
@@ -168,178 +160,493 @@ class Database(ABC):
     async def fetchall(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]: ...
 
     @abstractmethod
-    async def commit(self) -> None: ...
+    async def _begin(self) -> None:
+        """Take the write lock (unless this task holds it) and open a transaction."""
+
+    @abstractmethod
+    async def _commit(self) -> None: ...
+
+    @abstractmethod
+    async def _rollback(self) -> None: ...
 
     @abstractmethod
     async def close(self) -> None: ...
 
+    def _holds_writes(self) -> bool:
+        return self._writer is not None and self._writer is asyncio.current_task()
+
+    async def _claim_writes(self) -> bool:
+        """Take the write lock for this task; False if it already held it."""
+        if self._holds_writes():
+            return False
+        await self._write_lock.acquire()
+        self._writer = asyncio.current_task()
+        return True
+
+    def _release_writes(self, committed: bool) -> None:
+        on_commit, self._after_commit = self._after_commit, []
+        on_rollback, self._after_rollback = self._after_rollback, []
+        self._writer = None
+        self._tx_depth = 0
+        self._write_lock.release()
+        for callback in on_commit if committed else on_rollback:
+            callback()
+
+    async def commit(self) -> None:
+        """Commit this task's writes; inside transaction() this waits for the outermost block."""
+        if not self._holds_writes() or self._tx_depth:
+            return
+        try:
+            await self._commit()
+        except BaseException:
+            await self.rollback()
+            raise
+        self._release_writes(committed=True)
+
+    async def rollback(self) -> None:
+        if not self._holds_writes():
+            return
+        try:
+            await self._rollback()
+        finally:
+            self._release_writes(committed=False)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Call `callback` once this task's writes are committed (now, if there are none pending)."""
+        if self._holds_writes():
+            self._after_commit.append(callback)
+        else:
+            callback()
+
+    def after_rollback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` if this task's pending writes are rolled back (never, if there are none)."""
+        if self._holds_writes():
+            self._after_rollback.append(callback)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Run the block's writes as one transaction with one commit at the end,
+        or none of them if it raises.  commit() calls inside the block are
+        deferred to its end.  Blocks nest: an inner block joins the outer
+        transaction as a savepoint, so its failure only undoes its own writes.
+        All writes in the block must come from the calling task.
+        """
+        if self._tx_depth and self._holds_writes():
+            savepoint = f"sp{self._tx_depth}"
+            await self.execute(f"SAVEPOINT {savepoint}")
+            self._tx_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._tx_depth -= 1
+                await self.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                await self.execute(f"RELEASE SAVEPOINT {savepoint}")
+                raise
+            self._tx_depth -= 1
+            await self.execute(f"RELEASE SAVEPOINT {savepoint}")
+            return
+        await self._begin()
+        self._tx_depth = 1
+        try:
+            yield
+        except BaseException:
+            await self.rollback()
+            raise
+        self._tx_depth = 0
+        await self.commit()
+
+
+@dataclass(frozen=True)
+class SqlitePragmas:
+    """Per-connection SQLite tuning (see the SQLITE_* settings)."""
+    synchronous: str = "NORMAL"  # NORMAL is crash-safe under WAL; FULL also survives power loss
+    cache_size: int = -16_000  # negative: KiB, so 16 MB of page cache per connection
+    mmap_size: int = 64 * 1024 * 1024
+    busy_timeout_ms: int = 5_000
+
+    def statements(self) -> list[str]:
+        synchronous = self.synchronous.upper()
+        if synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid SQLite synchronous mode: {self.synchronous!r}")
+        return [
+            f"PRAGMA synchronous={synchronous}",
+            f"PRAGMA cache_size={int(self.cache_size)}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+        ]
+
 
 class SqliteDatabase(Database):
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    """
+    SQLite backend: one writer connection plus a pool of read connections.
+
+    In WAL mode readers don't block the writer (or each other), so reads run
+    on their own connections, each with its own aiosqlite thread, instead of
+    queueing behind timer persists and seating writes.  Read connections are
+    opened on demand, up to `read_connections`.  Reads by the task holding
+    the write transaction go to the writer, so they see its uncommitted rows.
+    Without a pool (`:memory:`, or `read_connections=0`) every read goes to
+    the writer too; other tasks' reads then take the write lock first, so
+    they wait for an open transaction instead of seeing its rows.
+
+    The WAL is checkpointed (and truncated) every `checkpoint_interval_ms`
+    on top of SQLite's automatic checkpoints, which a steady stream of
+    overlapping readers can otherwise keep from ever completing.  The same
+    pass closes read connections nobody used since the previous one.  Pass
+    a shared SqliteMaintenance to do this for many databases from one task.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        path: str = ":memory:",
+        pragmas: SqlitePragmas = SqlitePragmas(),
+        read_connections: int = 0,
+    ) -> None:
+        super().__init__()
         self._conn = conn
+        self._path = path
+        self._pragmas = pragmas
+        self._idle_readers: list[aiosqlite.Connection] = []
+        self._all_readers: list[aiosqlite.Connection] = []
+        self._read_slots = asyncio.Semaphore(read_connections) if read_connections > 0 and path != ":memory:" else None
+        self._pool_reads = 0  # since the last close_idle_readers()
+        self._maintenance: Optional[SqliteMaintenance] = None
 
     @classmethod
-    async def connect(cls, path: str) -> "SqliteDatabase":
-        conn = await aiosqlite.connect(path)
-        conn.row_factory = aiosqlite.Row
-        await conn.executescript(SQLITE_SCHEMA)
-        await conn.commit()
-        db = cls(conn)
+    async def connect(
+        cls,
+        path: str,
+        *,
+        pragmas: SqlitePragmas = SqlitePragmas(),
+        read_connections: int = 4,
+        checkpoint_interval_ms: int = 60_000,
+        maintenance: Optional["SqliteMaintenance"] = None,
+    ) -> "SqliteDatabase":
+        """Open (and migrate) `path`; `maintenance`, if given, replaces a private one every `checkpoint_interval_ms`."""
+        conn = await cls._open(path, pragmas)
+        try:
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await migrate_sqlite(conn)
+        except BaseException:
+            await conn.close()  # its thread would keep the process alive
+            raise
+        db = cls(conn, path=path, pragmas=pragmas, read_connections=read_connections)
+        db.players_fts = await sqlite_has_table(conn, "players_fts")
         await _ensure_defaults(db)
+        db._maintenance = maintenance if maintenance is not None else SqliteMaintenance(checkpoint_interval_ms)
+        db._maintenance.add(db)
         return db
 
+    @staticmethod
+    async def _open(path: str, pragmas: SqlitePragmas) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(path)
+        conn.row_factory = aiosqlite.Row
+        for stmt in pragmas.statements():
+            await conn.execute(stmt)
+        return conn
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._holds_writes():
+            yield self._conn
+            return
+        if self._read_slots is None:
+            async with self._write_lock:
+                yield self._conn
+            return
+        async with self._read_slots:
+            self._pool_reads += 1
+            if self._idle_readers:
+                conn = self._idle_readers.pop()
+            else:
+                conn = await self._open(self._path, self._pragmas)
+                await conn.execute("PRAGMA query_only=1")
+                self._all_readers.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle_readers.append(conn)
+
+    async def checkpoint(self) -> Optional[dict[str, int]]:
+        """
+        Copy the WAL into the database and truncate it.  Skipped (None) while
+        a write transaction is open; `busy` is 1 if readers kept it from
+        finishing, in which case the next run picks up where it left off.
+        """
+        if self._write_lock.locked():
+            return None
+        async with self._write_lock:
+            cur = await self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, log, checkpointed = await cur.fetchone()
+        return {"busy": busy, "log": log, "checkpointed": checkpointed}
+
+    async def close_idle_readers(self) -> None:
+        """Close the read connections if none was used since the last call; they reopen on demand."""
+        used, self._pool_reads = self._pool_reads, 0
+        if used or len(self._idle_readers) != len(self._all_readers):
+            return
+        readers, self._all_readers, self._idle_readers = self._all_readers, [], []
+        for conn in readers:
+            await conn.close()
+
+    async def _begin(self) -> None:
+        if await self._claim_writes():
+            try:
+                # IMMEDIATE: take SQLite's write lock now rather than on the
+                # first write, where another process could make it fail
+                await self._conn.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                # A cancelled await doesn't stop the statement on aiosqlite's
+                # thread: BEGIN may still have run, so end it before unlocking.
+                try:
+                    await self._conn.rollback()
+                finally:
+                    self._release_writes(committed=False)
+                raise
+
+    async def _write(self, run: Callable[[], Awaitable[Any]]) -> Any:
+        await self._begin()
+        try:
+            return await run()
+        except BaseException:
+            if not self._tx_depth:  # a transaction() block rolls back itself
+                await self.rollback()
+            raise
+
     async def execute(self, sql: str, params: tuple = ()) -> None:
-        await self._conn.execute(sql, params)
+        await self._write(lambda: self._conn.execute(sql, params))
+
+    async def executemany(self, sql: str, params_seq: Iterable[tuple]) -> None:
+        await self._write(lambda: self._conn.executemany(sql, params_seq))
 
     async def execute_returning_id(self, sql: str, params: tuple = ()) -> int:
-        cur = await self._conn.execute(sql, params)
+        cur = await self._write(lambda: self._conn.execute(sql, params))
         return cur.lastrowid
 
     async def fetchone(self, sql: str, params: tuple = ()) -> Optional[dict[str, Any]]:
-        cur = await self._conn.execute(sql, params)
-        row = await cur.fetchone()
+        async with self._reader() as conn:
+            cur = await conn.execute(sql, params)
+            row = await cur.fetchone()
         return dict(row) if row else None
 
     async def fetchall(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
-        cur = await self._conn.execute(sql, params)
-        rows = await cur.fetchall()
+        async with self._reader() as conn:
+            cur = await conn.execute(sql, params)
+            rows = await cur.fetchall()
         return [dict(r) for r in rows]
 
-    async def commit(self) -> None:
+    async def _commit(self) -> None:
         await self._conn.commit()
 
+    async def _rollback(self) -> None:
+        await self._conn.rollback()
+
     async def close(self) -> None:
+        if self._maintenance is not None:
+            await self._maintenance.remove(self)
+            self._maintenance = None
+        for conn in self._all_readers:
+            await conn.close()
+        self._all_readers.clear()
+        self._idle_readers.clear()
         await self._conn.close()
 
 
+class SqliteMaintenance:
+    """
+    Periodic upkeep of SQLite databases from one task: every `interval_ms`,
+    checkpoint each registered database's WAL and close its idle read
+    connections.  The task runs while any database is registered; with
+    `interval_ms` <= 0 there is none.
+    """
+
+    def __init__(self, interval_ms: int) -> None:
+        self._interval_ms = interval_ms
+        self._databases: list[SqliteDatabase] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, db: SqliteDatabase) -> None:
+        if self._interval_ms <= 0:
+            return
+        self._databases.append(db)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def remove(self, db: SqliteDatabase) -> None:
+        if db in self._databases:
+            self._databases.remove(db)
+        if not self._databases and self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_ms / 1000)
+            for db in list(self._databases):
+                try:
+                    await db.checkpoint()
+                except sqlite3.OperationalError:
+                    pass  # locked by another process's writer; try again next time
+                await db.close_idle_readers()
+
+
 class PostgresDatabase(Database):
     """
     PostgreSQL backend using a connection pool.
 
-    Writes serialize through a per-instance asyncio.Lock: the lock is acquired
-    on the first execute() call and released when commit() (or close()) is
-    called.  Reads (fetchone/fetchall) acquire a fresh pool connection each
-    time and see READ COMMITTED data — they never block on the write lock.
+    Statements are translated once per distinct SQL text (_translate_sql) and
+    every pooled connection keeps its own cache of prepared statements, so a
+    repeated query costs one Bind/Execute round trip rather than a Parse too.
+
+    A task's write transaction (see Database) runs on one pool connection,
+    held from its first write until it commits or rolls back; that task's
+    reads use the same connection.  Other reads acquire a fresh pool
+    connection each time and see READ COMMITTED data — they never block on
+    the write lock.
     """
 
+    dialect = "postgres"
+
     def __init__(self, pool: asyncpg.Pool) -> None:
+        super().__init__()
         self._pool = pool
-        self._write_lock = asyncio.Lock()
         self._conn: Optional[Any] = None  # pool connection held for current write tx
         self._tx: Optional[Any] = None
 
     @classmethod
-    async def connect(cls, dsn: str) -> "PostgresDatabase":
-        pool = await asyncpg.create_pool(dsn, min_size=1, max_size=5)
+    async def connect(cls, dsn: str, *, schema: Optional[str] = None) -> "PostgresDatabase":
+        pool_kwargs = dict(
+            statement_cache_size=STATEMENT_CACHE_SIZE,
+            # never expire cached statements; the schema only changes at startup
+            max_cached_statement_lifetime=0,
+        )
+        if schema is None:
+            pool = await asyncpg.create_pool(dsn, min_size=1, max_size=5, **pool_kwargs)
+        else:
+            # Per-tournament schema: keep no idle connections so hundreds of
+            # hosted tournaments don't exhaust the server's connection limit.
+            conn = await asyncpg.connect(dsn)
+            try:
+                await conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+            finally:
+                await conn.close()
+            pool = await asyncpg.create_pool(
+                dsn, min_size=0, max_size=2, server_settings={"search_path": schema}, **pool_kwargs,
+            )
         async with pool.acquire() as conn:
-            async with conn.transaction():
-                for stmt in POSTGRES_SCHEMA.split(';'):
-                    stmt = stmt.strip()
-                    if stmt:
-                        await conn.execute(stmt)
+            await migrate_postgres(conn)
         db = cls(pool)
         await _ensure_defaults(db)
         return db
 
     async def _begin(self) -> None:
-        if self._tx is None:
-            await self._write_lock.acquire()
+        if await self._claim_writes():
             try:
                 self._conn = await self._pool.acquire()
                 self._tx = self._conn.transaction()
                 await self._tx.start()
-            except Exception:
-                conn = self._conn
-                self._conn = None
-                if conn is not None:
-                    try:
-                        await self._pool.release(conn)
-                    except Exception:
-                        pass
-                self._write_lock.release()
+            except BaseException:
+                await self._release_conn()
+                self._release_writes(committed=False)
                 raise
 
-    async def _abort(self) -> None:
-        """Roll back the current transaction and release all resources."""
-        held_lock = self._conn is not None
-        tx, conn = self._tx, self._conn
+    async def _release_conn(self) -> None:
+        conn = self._conn
         self._tx = None
         self._conn = None
-        if tx is not None:
-            try:
-                await tx.rollback()
-            except Exception:
-                pass
         if conn is not None:
             try:
                 await self._pool.release(conn)
             except Exception:
                 pass
-        if held_lock:
-            self._write_lock.release()
 
-    async def execute(self, sql: str, params: tuple = ()) -> None:
-        if sql.strip().upper().startswith('PRAGMA'):
-            return
+    async def _write(self, run: Callable[[Any], Awaitable[Any]]) -> Any:
         await self._begin()
         try:
-            pg_sql, pg_params = _to_pg(sql, params)
-            await self._conn.execute(pg_sql, *pg_params)
-        except Exception:
-            await self._abort()
+            return await run(self._conn)
+        except BaseException:
+            if not self._tx_depth:  # a transaction() block rolls back itself
+                await self.rollback()
             raise
 
+    async def execute(self, sql: str, params: tuple = ()) -> None:
+        if sql.strip().upper().startswith('PRAGMA'):
+            return
+        pg_sql, pg_params = _to_pg(sql, params)
+        await self._write(lambda conn: conn.execute(pg_sql, *pg_params))
+
+    async def executemany(self, sql: str, params_seq: Iterable[tuple]) -> None:
+        rows = [list(p) for p in params_seq]
+        if not rows:
+            return
+        await self._write(lambda conn: conn.executemany(_translate_sql(sql), rows))
+
     async def execute_returning_id(self, sql: str, params: tuple = ()) -> int:
-        await self._begin()
-        try:
-            pg_sql, pg_params = _to_pg(sql + ' RETURNING id', params)
-            return await self._conn.fetchval(pg_sql, *pg_params)
-        except Exception:
-            await self._abort()
-            raise
+        pg_sql, pg_params = _to_pg(sql + ' RETURNING id', params)
+        return await self._write(lambda conn: conn.fetchval(pg_sql, *pg_params))
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[Any]:
+        if self._holds_writes():
+            yield self._conn
+        else:
+            async with self._pool.acquire() as conn:
+                yield conn
 
     async def fetchone(self, sql: str, params: tuple = ()) -> Optional[dict[str, Any]]:
         pg_sql, pg_params = _to_pg(sql, params)
-        async with self._pool.acquire() as conn:
+        async with self._reader() as conn:
             row = await conn.fetchrow(pg_sql, *pg_params)
             return dict(row) if row else None
 
     async def fetchall(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
         pg_sql, pg_params = _to_pg(sql, params)
-        async with self._pool.acquire() as conn:
+        async with self._reader() as conn:
             rows = await conn.fetch(pg_sql, *pg_params)
             return [dict(r) for r in rows]
 
-    async def commit(self) -> None:
-        if self._tx is None:
-            return
+    async def _commit(self) -> None:
         try:
             await self._tx.commit()
+        finally:
+            await self._release_conn()
+
+    async def _rollback(self) -> None:
+        try:
+            await self._tx.rollback()
         except Exception:
-            await self._abort()
-            raise
-        self._tx = None
-        conn = self._conn
-        self._conn = None
-        await self._pool.release(conn)
-        self._write_lock.release()
+            pass
+        finally:
+            await self._release_conn()
 
     async def close(self) -> None:
-        await self._abort()
+        if self._tx is not None:
+            # abandoned mid-transaction (shutdown): roll it back
+            await self._rollback()
         await self._pool.close()
 
 
 async def _ensure_defaults(db: Database) -> None:
+    # OR IGNORE: several worker processes may initialise a new database at once
     row = await db.fetchone("SELECT json FROM settings WHERE id=1")
     if not row:
         await db.execute(
-            "INSERT INTO settings (id, json) VALUES (?, ?)",
+            "INSERT OR IGNORE INTO settings (id, json) VALUES (?, ?)",
             (1, json.dumps(DEFAULT_SETTINGS)),
         )
     row = await db.fetchone("SELECT 1 FROM tourney_state WHERE id=1")
     if not row:
         await db.execute(
-            "INSERT INTO tourney_state (id, current_level_index, remaining_ms, finish_at_server_ms, running, updated_at_ms) VALUES (?, ?, ?, ?, ?, ?)",
+            "INSERT OR IGNORE INTO tourney_state (id, current_level_index, remaining_ms, finish_at_server_ms, running, updated_at_ms) VALUES (?, ?, ?, ?, ?, ?)",
             (
                 1,
                 DEFAULT_STATE["current_level_index"],
@@ -352,19 +659,78 @@ async def _ensure_defaults(db: Database) -> None:
     await db.commit()
 
 
-async def open_database(settings: Any) -> Database:
+def tournament_database_path(settings: Any, tournament_id: str) -> str:
+    directory = settings.tournaments_dir or os.path.dirname(settings.database_path) or "."
+    return os.path.join(directory, f"tournament-{tournament_id}.db")
+
+
+async def open_database(
+    settings: Any,
+    tournament_id: Optional[str] = None,
+    *,
+    maintenance: Optional[SqliteMaintenance] = None,
+) -> Database:
+    """
+    Open the main database, or with `tournament_id` the database of an
+    additional hosted tournament: its own SQLite file, with a smaller pool
+    of read connections, or its own schema on the same PostgreSQL server.
+    SQLite databases are looked after by `maintenance` if given.
+    """
     if settings.database_dsn:
-        return await PostgresDatabase.connect(settings.database_dsn)
-    return await SqliteDatabase.connect(settings.database_path)
+        schema = f"tournament_{tournament_id}" if tournament_id else None
+        db = await PostgresDatabase.connect(settings.database_dsn, schema=schema)
+    else:
+        path = tournament_database_path(settings, tournament_id) if tournament_id else settings.database_path
+        db = await SqliteDatabase.connect(
+            path,
+            pragmas=SqlitePragmas(
+                synchronous=settings.sqlite_synchronous,
+                cache_size=settings.sqlite_cache_size,
+                mmap_size=settings.sqlite_mmap_size,
+                busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+            ),
+            read_connections=(
+                settings.sqlite_tournament_read_connections if tournament_id else settings.sqlite_read_connections
+            ),
+            checkpoint_interval_ms=settings.sqlite_checkpoint_interval_ms,
+            maintenance=maintenance,
+        )
+    await get_settings_snapshot(db)
+    return db
 
 
-async def get_settings(db: Database) -> dict[str, Any]:
-    row = await db.fetchone("SELECT json FROM settings WHERE id=1")
-    return json.loads(row["json"])
+async def get_settings_snapshot(db: Database) -> SettingsSnapshot:
+    """Return the cached settings, loading them from the database on first use."""
+    snap = db._settings_snapshot
+    if snap is None:
+        snap = await reload_settings(db)
+    return snap
 
-async def set_settings(db: Database, settings: dict[str, Any]) -> None:
-    await db.execute("UPDATE settings SET json=? WHERE id=1", (json.dumps(settings),))
-    await db.commit()
+async def get_settings(db: Database) -> dict[str, Any]:
+    return (await get_settings_snapshot(db)).raw
+
+async def set_settings(db: Database, settings: dict[str, Any]) -> SettingsSnapshot:
+    encoded = json.dumps(settings)
+    async with db.transaction():
+        await db.execute("UPDATE settings SET json=?, version=version+1 WHERE id=1", (encoded,))
+        row = await db.fetchone("SELECT version FROM settings WHERE id=1")
+    # Write-through: re-decode so the cache never aliases the caller's dict.
+    snap = compile_settings(json.loads(encoded), version=int(row["version"]))
+    db._settings_snapshot = snap
+    return snap
+
+async def reload_settings(db: Database) -> SettingsSnapshot:
+    """Re-read the settings and their version, e.g. after another process wrote them."""
+    row = await db.fetchone("SELECT json, version FROM settings WHERE id=1")
+    snap = compile_settings(json.loads(row["json"]), version=int(row["version"]))
+    db._settings_snapshot = snap
+    return snap
+
+def adopt_settings(db: Database, raw: dict[str, Any], version: int) -> None:
+    """Cache settings published by the process driving the timers, with its version, unless ours are newer."""
+    prev = db._settings_snapshot
+    if prev is None or version >= prev.version:
+        db._settings_snapshot = compile_settings(raw, version=version)
 
 async def get_state(db: Database) -> dict[str, Any]:
     row = await db.fetchone(
@@ -387,6 +753,16 @@ async def set_state(
     )
     await db.commit()
 
+async def list_tournaments(db: Database) -> list[dict[str, Any]]:
+    return await db.fetchall("SELECT id, name, created_at_ms FROM tournaments ORDER BY created_at_ms ASC")
+
+async def add_tournament(db: Database, *, id: str, name: str, created_at_ms: int) -> None:
+    await db.execute(
+        "INSERT INTO tournaments (id, name, created_at_ms) VALUES (?, ?, ?)",
+        (id, name, created_at_ms),
+    )
+    await db.commit()
+
 async def add_announcement(db: Database, *, created_at_ms: int, type: str, payload: dict[str, Any]) -> int:
     row_id = await db.execute_returning_id(
         "INSERT INTO announcements (created_at_ms, type, payload_json) VALUES (?, ?, ?)",
@@ -395,11 +771,68 @@ async def add_announcement(db: Database, *, created_at_ms: int, type: str, paylo
     await db.commit()
     return row_id
 
-async def list_announcements(db: Database, limit: int = 50) -> list[dict[str, Any]]:
+# Shortest search the trigram indexes can answer; shorter ones scan the players.
+SEARCH_MIN_INDEXED_CHARS = 3
+
+def _like_escape(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def player_name_filter(db: Database, q: str) -> tuple[str, list[Any]]:
+    """
+    SQL condition on `players` matching names that contain `q`, ignoring case,
+    and its parameters.  Answered by the trigram index (FTS5 on SQLite,
+    pg_trgm on PostgreSQL) once `q` is SEARCH_MIN_INDEXED_CHARS long, where
+    the database has one.
+    """
+    if db.dialect == "sqlite" and db.players_fts and len(q) >= SEARCH_MIN_INDEXED_CHARS:
+        phrase = '"' + q.replace('"', '""') + '"'
+        return "id IN (SELECT id FROM players_fts WHERE players_fts MATCH ?)", [phrase]
+    like = "ILIKE" if db.dialect == "postgres" else "LIKE"
+    return f"name {like} ? ESCAPE '\\'", [f"%{_like_escape(q)}%"]
+
+async def search_players(db: Database, q: str, limit: int) -> list[dict[str, Any]]:
+    """Players whose name contains `q`: prefix matches first, then active before eliminated."""
+    where, params = player_name_filter(db, q)
+    like = "ILIKE" if db.dialect == "postgres" else "LIKE"
     rows = await db.fetchall(
-        "SELECT id, created_at_ms, type, payload_json FROM announcements ORDER BY id DESC LIMIT ?",
-        (limit,),
+        f"""
+        SELECT id, name, eliminated FROM players
+        WHERE {where}
+        ORDER BY CASE WHEN name {like} ? ESCAPE '\\' THEN 0 ELSE 1 END, eliminated ASC, name ASC
+        LIMIT ?
+        """,
+        (*params, f"{_like_escape(q)}%", limit),
     )
+    return [{"id": r["id"], "name": r["name"], "eliminated": bool(r["eliminated"])} for r in rows]
+
+def encode_cursor(*key: Any) -> str:
+    """Opaque pagination cursor for the sort key of the last row on a page."""
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> list[Any]:
+    """The sort key in `cursor`; ValueError unless it holds one value of each of `types`."""
+    key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(type(v) is t for v, t in zip(key, types))
+    ):
+        raise ValueError(f"malformed cursor: {cursor!r}")
+    return key
+
+async def list_announcements(db: Database, limit: int = 50, before_id: Optional[int] = None) -> list[dict[str, Any]]:
+    """Newest first; with `before_id`, only the ones older than that announcement."""
+    if before_id is None:
+        rows = await db.fetchall(
+            "SELECT id, created_at_ms, type, payload_json FROM announcements ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+    else:
+        rows = await db.fetchall(
+            "SELECT id, created_at_ms, type, payload_json FROM announcements WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit),
+        )
     return [
         {
             "id": r["id"],
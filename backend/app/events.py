@@ -1,38 +1,197 @@
-import asyncio
-from dataclasses import dataclass
-from typing import Any, AsyncIterator
+import asyncio, uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+from .relay import Relay
+from .utils import now_ms
+from .wire import HOLES, FrameTemplate, encode_binary, encode_text
+
+# Synthetic event yielded by EventBus.subscribe() to a subscriber that fell
+# behind the ring buffer: it has missed events and must reload full state.
+RESYNC = "resync"
 
 @dataclass
 class Event:
     type: str
     payload: dict[str, Any]
+    # Assigned by EventBus.publish(); 0 for events that were never published
+    seq: int = field(default=0, init=False, compare=False)
+    _frame: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _packed: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def _message(self) -> dict[str, Any]:
+        msg: dict[str, Any] = {"type": self.type, "payload": self.payload}
+        if self.seq:
+            msg["seq"] = self.seq
+        return msg
+
+    @property
+    def frame(self) -> str:
+        """The WebSocket text frame for this event, encoded once and shared by every subscriber."""
+        if self._frame is None:
+            self._frame = encode_text(self._message())
+        return self._frame
+
+    @property
+    def packed(self) -> bytes:
+        """The MessagePack frame for this event, encoded on first use and shared likewise."""
+        if self._packed is None:
+            self._packed = encode_binary(self._message())
+        return self._packed
+
+@dataclass
+class BusStats:
+    published: int = 0
+    coalesced: int = 0  # superseded `state` events skipped by a lagging subscriber
+    dropped: int = 0    # events overwritten before a subscriber read them
+    resyncs: int = 0    # subscribers sent RESYNC after falling off the ring
+
+class _Subscription:
+    __slots__ = ("cursor",)
+
+    def __init__(self, cursor: int) -> None:
+        self.cursor = cursor  # seq of the next event to read
 
 class EventBus:
-    def __init__(self) -> None:
-        self._subscribers: set[asyncio.Queue[Event]] = set()
-        self._lock = asyncio.Lock()
+    """
+    Fan-out over one shared ring buffer.
+
+    publish() writes each event once into the ring and wakes the readers; each
+    subscriber only keeps a cursor into it.  A subscriber that is behind only
+    gets the newest of its pending `state` events (each one is a full snapshot),
+    and one that falls more than `capacity` events behind gets a RESYNC event
+    instead of a silent gap.
+
+    Nothing here takes a lock: appending an event never awaits between
+    claiming a sequence number and waking readers, and the subscriber registry
+    is an immutable tuple replaced wholesale on subscribe/unsubscribe, so
+    connect and disconnect storms never contend with publishers.
+
+    With attach(relay, topic), events are published through a relay that
+    delivers them to the bus of every worker process in one global order (see
+    relay.py); otherwise publish() appends directly.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = capacity
+        # Sequence numbers restart with the process; the epoch tells a resuming
+        # client whether its last seen sequence number is from this bus.
+        self.epoch = uuid.uuid4().hex[:8]
+        self._ring: list[Optional[Event]] = [None] * capacity
+        self._next_seq = 1
+        self._latest_state_seq = 0
+        self._latest_state: Optional[Event] = None
+        self._latest_settings: Optional[Event] = None
+        # ((state seq, settings seq), template) for snapshot_frame()
+        self._snapshot: Optional[tuple[tuple[int, int], FrameTemplate]] = None
+        self._new_data = asyncio.Event()
+        self._subscribers: tuple[_Subscription, ...] = ()
+        self.stats = BusStats()
+        self._relay: Optional[Relay] = None
+        self._topic = ""
+
+    def attach(self, relay: Relay, topic: str) -> None:
+        """Publish through `relay` on `topic`, and append what it delivers."""
+        self._relay, self._topic = relay, topic
+        relay.subscribe(topic, self._receive, on_gap=self.mark_gap)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recently published event (0 if none)."""
+        return self._next_seq - 1
 
     async def publish(self, event: Event) -> None:
-        async with self._lock:
-            dead = []
-            for q in self._subscribers:
-                try:
-                    q.put_nowait(event)
-                except asyncio.QueueFull:
-                    pass
-                except Exception:
-                    dead.append(q)
-            for q in dead:
-                self._subscribers.discard(q)
-
-    async def subscribe(self) -> AsyncIterator[Event]:
-        q: asyncio.Queue[Event] = asyncio.Queue(maxsize=200)
-        async with self._lock:
-            self._subscribers.add(q)
+        if self._relay is not None:
+            # Appended (and numbered) when the relay delivers it back to us.
+            await self._relay.publish(self._topic, {"type": event.type, "payload": event.payload})
+            return
+        self._append(event)
+
+    def _receive(self, msg: dict[str, Any]) -> None:
+        self._append(Event(msg["type"], msg["payload"]))
+
+    def mark_gap(self) -> None:
+        """
+        Events may have been missed (the relay connection was lost): skip the
+        sequence past the ring so every subscriber, and every resume point
+        handed out so far, gets a RESYNC.
+        """
+        self._next_seq += self._capacity + 1
+        waiters, self._new_data = self._new_data, asyncio.Event()
+        waiters.set()
+
+    def _append(self, event: Event) -> None:
+        event.seq = self._next_seq
+        self._next_seq += 1
+        event.frame  # encode before fan-out
+        self._ring[event.seq % self._capacity] = event
+        if event.type == "state":
+            self._latest_state_seq = event.seq
+            self._latest_state = event
+        elif event.type == "settings":
+            self._latest_settings = event
+        self.stats.published += 1
+        # Wake everyone waiting on the current generation, start a new one.
+        waiters, self._new_data = self._new_data, asyncio.Event()
+        waiters.set()
+
+    def snapshot_frame(self, binary: bool = False) -> Optional[tuple[int, str | bytes]]:
+        """
+        The latest `state` event, together with the latest `settings` event, as
+        a connect-time `state` snapshot frame carrying both; None if no state
+        has been published yet.
+
+        Returns (seq, frame) where seq is the current bus position: subscribe with
+        after=seq to receive everything that follows.  The frame is encoded once
+        per state change and shared by every new connection; only its
+        server_time_ms (which clients use to seed their clock offset) and seq
+        are filled in per call.  `binary` selects the MessagePack encoding.
+        """
+        ev, settings_ev = self._latest_state, self._latest_settings
+        if ev is None or not isinstance(ev.payload.get("state"), dict):
+            return None
+        key = (ev.seq, settings_ev.seq if settings_ev is not None else 0)
+        snap = self._snapshot
+        if snap is None or snap[0] != key:
+            payload = {**ev.payload, "state": {**ev.payload["state"], "server_time_ms": HOLES[0]}}
+            if settings_ev is not None:
+                payload["settings"] = settings_ev.payload.get("settings")
+            msg = {"type": "state", "payload": payload, "epoch": self.epoch, "seq": HOLES[1]}
+            snap = self._snapshot = (key, FrameTemplate(msg))
+        seq = self.last_seq
+        template = snap[1]
+        return seq, (template.binary if binary else template.text)(now_ms(), seq)
+
+    async def subscribe(self, after: Optional[int] = None) -> AsyncIterator[Event]:
+        """
+        Yield events as they are published.  With `after`, start with the events
+        published after that sequence number instead (RESYNC if they are no
+        longer in the ring).
+        """
+        sub = _Subscription(self._next_seq if after is None else after + 1)
+        self._subscribers = self._subscribers + (sub,)
         try:
             while True:
-                ev = await q.get()
+                if sub.cursor == self._next_seq:
+                    await self._new_data.wait()
+                    continue
+                behind = self._next_seq - sub.cursor
+                if behind > self._capacity or behind < 0:
+                    self.stats.dropped += max(0, behind)
+                    self.stats.resyncs += 1
+                    sub.cursor = self._next_seq
+                    yield Event(RESYNC, {})
+                    continue
+                ev = self._ring[sub.cursor % self._capacity]
+                sub.cursor += 1
+                if ev.type == "state" and ev.seq < self._latest_state_seq:
+                    # A newer full snapshot is already waiting for this subscriber.
+                    self.stats.coalesced += 1
+                    continue
                 yield ev
         finally:
-            async with self._lock:
-                self._subscribers.discard(q)
+            self._subscribers = tuple(s for s in self._subscribers if s is not sub)
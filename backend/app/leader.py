@@ -0,0 +1,106 @@
+"""
+Leader election among worker processes: exactly one of them drives the
+tournament clocks (see TournamentRegistry).  Elections are non-blocking; the
+other processes simply retry every LEADER_POLL_MS, so one of them takes over
+within that bound after the leader exits.
+"""
+import fcntl, os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+import asyncpg
+
+
+class LeaderElection(ABC):
+    @abstractmethod
+    async def try_acquire(self) -> bool:
+        """Become the leader if nobody else is; True if this process leads."""
+
+    @abstractmethod
+    async def still_held(self) -> bool:
+        """Whether leadership, once acquired, is still held."""
+
+    @abstractmethod
+    async def release(self) -> None: ...
+
+
+class FileLockElection(LeaderElection):
+    """
+    An flock on a file next to the SQLite database.  The kernel drops it when
+    the holder exits, however it exits.  (SQLite's own POSIX locks on the
+    database file are left alone: any close() of that file would drop ours.)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    async def still_held(self) -> bool:
+        return self._fd is not None
+
+    async def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class AdvisoryLockElection(LeaderElection):
+    """
+    A session-level Postgres advisory lock, held on a dedicated connection.
+    It is released when that connection ends, including when the leader dies.
+    """
+
+    LOCK_KEY = 0x5350_5454_494D_4552  # "SPTTIMER"
+
+    def __init__(self, dsn: str) -> None:
+        self._dsn = dsn
+        self._conn: Optional[asyncpg.Connection] = None
+        self._held = False
+
+    async def try_acquire(self) -> bool:
+        if self._held:
+            return True
+        try:
+            if self._conn is None or self._conn.is_closed():
+                self._conn = await asyncpg.connect(self._dsn)
+            self._held = bool(await self._conn.fetchval("SELECT pg_try_advisory_lock($1)", self.LOCK_KEY))
+        except (OSError, asyncpg.PostgresError):
+            self._held = False
+        return self._held
+
+    async def still_held(self) -> bool:
+        if not self._held:
+            return False
+        try:
+            await self._conn.fetchval("SELECT 1")
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            # The session (and with it the lock) is gone; someone else may lead now.
+            self._held = False
+        return self._held
+
+    async def release(self) -> None:
+        self._held = False
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+def make_election(settings: Any) -> Optional[LeaderElection]:
+    """The election used with EVENT_BUS=shared; None when this is the only process."""
+    if settings.event_bus != "shared":
+        return None
+    if settings.database_dsn:
+        return AdvisoryLockElection(settings.database_dsn)
+    return FileLockElection(os.path.abspath(settings.database_path) + ".leader")
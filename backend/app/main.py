@@ -7,10 +7,9 @@ from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .settings import settings as app_settings
-from .db import open_database
-from .events import EventBus
-from .timer import TimerService
-from .api import router
+from .clock import ClockBeacon
+from .tournaments import TournamentRegistry
+from .api import router, tournaments_router
 from .ws_manager import router as ws_router
 
 
@@ -27,20 +26,18 @@ class _SPAStaticFiles(StaticFiles):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    db = await open_database(app_settings)
-    app.state.db = db
+    tournaments = TournamentRegistry(app_settings)
+    await tournaments.open()
+    app.state.tournaments = tournaments
 
-    bus = EventBus()
-    app.state.bus = bus
-
-    timer = TimerService(conn=db, bus=bus)
-    app.state.timer = timer
-    await timer.load()
-    await timer.start()
+    clock_beacon = ClockBeacon(app_settings.clock_beacon_interval_ms)
+    await clock_beacon.start()
+    app.state.clock_beacon = clock_beacon
 
     app.state.sounds_dir = app_settings.sounds_dir
     yield
-    await db.close()
+    await clock_beacon.stop()
+    await tournaments.close()
 
 app = FastAPI(title="Poker Tourney Timer", version="0.1.0", lifespan=lifespan)
 
@@ -57,7 +54,11 @@ app.add_middleware(
 os.makedirs(app_settings.sounds_dir, exist_ok=True)
 app.mount("/sounds", StaticFiles(directory=app_settings.sounds_dir), name="sounds")
 app.include_router(router, prefix="/api")
+app.include_router(tournaments_router, prefix="/api")
 app.include_router(ws_router, prefix="/ws")
+# The same endpoints scoped to one of the additional hosted tournaments
+app.include_router(router, prefix="/api/t/{tournament_id}")
+app.include_router(ws_router, prefix="/ws/t/{tournament_id}")
 
 if app_settings.static_dir and os.path.isdir(app_settings.static_dir):
     app.mount("/", _SPAStaticFiles(directory=app_settings.static_dir, html=True), name="frontend")
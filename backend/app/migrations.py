@@ -0,0 +1,310 @@
+"""
+Versioned schema for both database backends.
+
+MIGRATIONS is applied in order, each one at most once per database: the
+versions already applied are recorded in `schema_version`.  Add a new
+Migration at the end to change the schema; never edit one that has shipped.
+Each migration runs in the same transaction as its `schema_version` row,
+and concurrent starters (several workers on one database) take a lock
+first, so exactly one of them applies it.
+
+Version 1 is the schema as it was before versioning.  Every statement in it
+is IF NOT EXISTS, so a database created back then simply records it as
+applied.
+
+An optional migration needs something the database may lack (a SQLite
+tokenizer, a PostgreSQL extension).  If it fails, its changes are rolled
+back and it is recorded as applied anyway, with a warning: the app looks
+for what it adds before using it (see db.player_name_filter).
+"""
+import logging, sqlite3
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import aiosqlite
+import asyncpg
+
+from .utils import now_ms
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sqlite: str
+    postgres: str
+    optional: bool = False
+
+
+SQLITE_INITIAL = r"""
+CREATE TABLE IF NOT EXISTS settings (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tourney_state (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  current_level_index INTEGER NOT NULL,
+  remaining_ms INTEGER NOT NULL,
+  finish_at_server_ms INTEGER NOT NULL DEFAULT 0,
+  running INTEGER NOT NULL,
+  updated_at_ms INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS players (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  eliminated INTEGER NOT NULL DEFAULT 0,
+  created_at_ms INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tables (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  seats INTEGER NOT NULL,
+  enabled INTEGER NOT NULL DEFAULT 1,
+  created_at_ms INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seat_assignments (
+  table_id TEXT NOT NULL,
+  seat_num INTEGER NOT NULL,
+  player_id TEXT NULL,
+  PRIMARY KEY (table_id, seat_num),
+  FOREIGN KEY (table_id) REFERENCES tables(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS announcements (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  created_at_ms INTEGER NOT NULL,
+  type TEXT NOT NULL,
+  payload_json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tournaments (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  created_at_ms INTEGER NOT NULL
+);
+"""
+
+POSTGRES_INITIAL = """
+CREATE TABLE IF NOT EXISTS settings (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tourney_state (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  current_level_index INTEGER NOT NULL,
+  remaining_ms BIGINT NOT NULL,
+  finish_at_server_ms BIGINT NOT NULL DEFAULT 0,
+  running INTEGER NOT NULL,
+  updated_at_ms BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS players (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  eliminated INTEGER NOT NULL DEFAULT 0,
+  created_at_ms BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tables (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  seats INTEGER NOT NULL,
+  enabled INTEGER NOT NULL DEFAULT 1,
+  created_at_ms BIGINT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seat_assignments (
+  table_id TEXT NOT NULL,
+  seat_num INTEGER NOT NULL,
+  player_id TEXT NULL,
+  PRIMARY KEY (table_id, seat_num),
+  FOREIGN KEY (table_id) REFERENCES tables(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS announcements (
+  id SERIAL PRIMARY KEY,
+  created_at_ms BIGINT NOT NULL,
+  type TEXT NOT NULL,
+  payload_json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tournaments (
+  id TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  created_at_ms BIGINT NOT NULL
+);
+"""
+
+# Same SQL on both backends
+INDEXES = """
+-- One seat per player: clear any duplicates first, keeping the lowest seat.
+UPDATE seat_assignments SET player_id = NULL
+WHERE player_id IS NOT NULL AND EXISTS (
+  SELECT 1 FROM seat_assignments o
+  WHERE o.player_id = seat_assignments.player_id
+    AND (o.table_id < seat_assignments.table_id
+         OR (o.table_id = seat_assignments.table_id AND o.seat_num < seat_assignments.seat_num))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS seat_assignments_player ON seat_assignments (player_id) WHERE player_id IS NOT NULL;
+
+-- Active players in join order, and the roster listing (eliminated last, newest first).
+CREATE INDEX IF NOT EXISTS players_eliminated_created ON players (eliminated, created_at_ms DESC);
+
+-- Tables (and the seat listing joined to them) in creation order.
+CREATE INDEX IF NOT EXISTS tables_created ON tables (created_at_ms);
+"""
+
+# Trigram index over player names for substring search (db.player_name_filter).
+# SQLite keeps a copy keyed by players.id, not by rowid: the rowids of a table
+# without an INTEGER PRIMARY KEY may change on VACUUM.  Optional: SQLite builds
+# without FTS5 (or older than 3.34, without its trigram tokenizer) and servers
+# where pg_trgm isn't installed or we may not create it search without an index.
+SQLITE_NAME_SEARCH = r"""
+CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(id UNINDEXED, name, tokenize='trigram');
+DELETE FROM players_fts;
+INSERT INTO players_fts (id, name) SELECT id, name FROM players;
+
+CREATE TRIGGER IF NOT EXISTS players_fts_insert AFTER INSERT ON players BEGIN
+  INSERT INTO players_fts (id, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS players_fts_rename AFTER UPDATE OF name ON players BEGIN
+  UPDATE players_fts SET name = new.name WHERE id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS players_fts_delete AFTER DELETE ON players BEGIN
+  DELETE FROM players_fts WHERE id = old.id;
+END;
+"""
+
+# In public, so the per-tournament schemas (search_path = their own schema)
+# can name the operator class too.
+POSTGRES_NAME_SEARCH = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public;
+CREATE INDEX IF NOT EXISTS players_name_trgm ON players USING gin (name public.gin_trgm_ops);
+"""
+
+# Keyset pagination of the roster (GET /players) orders by id after the
+# roster columns, so every row has a distinct position to resume from.
+ROSTER_KEYSET = """
+DROP INDEX IF EXISTS players_eliminated_created;
+CREATE INDEX IF NOT EXISTS players_roster ON players (eliminated, created_at_ms DESC, id DESC);
+"""
+
+# Settings versions are shared by every worker process, so they live in the
+# row rather than in each process's cache (db.get_settings_snapshot).
+SQLITE_SETTINGS_VERSION = "ALTER TABLE settings ADD COLUMN version INTEGER NOT NULL DEFAULT 1;"
+POSTGRES_SETTINGS_VERSION = "ALTER TABLE settings ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;"
+
+# Case-insensitive name lookups (the duplicate-name check in api.py).
+PLAYER_NAME_LOWER = "CREATE INDEX IF NOT EXISTS players_name_lower ON players (lower(name));"
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial schema", SQLITE_INITIAL, POSTGRES_INITIAL),
+    Migration(2, "indexes for seat, roster and table lookups", INDEXES, INDEXES),
+    Migration(3, "trigram index for player name search", SQLITE_NAME_SEARCH, POSTGRES_NAME_SEARCH, optional=True),
+    Migration(4, "roster index with a unique order for keyset pagination", ROSTER_KEYSET, ROSTER_KEYSET),
+    Migration(5, "settings version", SQLITE_SETTINGS_VERSION, POSTGRES_SETTINGS_VERSION),
+    Migration(6, "case-insensitive player name index", PLAYER_NAME_LOWER, PLAYER_NAME_LOWER),
+]
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+  version INTEGER PRIMARY KEY,
+  name TEXT NOT NULL,
+  applied_at_ms BIGINT NOT NULL
+)
+"""
+
+# Serializes migrations across processes on one PostgreSQL server
+POSTGRES_MIGRATION_LOCK = 0x5350545343484D41  # "SPTSCHMA"
+
+log = logging.getLogger(__name__)
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version
+
+
+def _pending(current: int) -> list[Migration]:
+    if current > latest_version():
+        raise RuntimeError(
+            f"Database schema is at version {current}, newer than this app knows ({latest_version()})"
+        )
+    return [m for m in MIGRATIONS if m.version > current]
+
+
+def _sqlite_statements(script: str) -> Iterator[str]:
+    """Split a script into statements (aiosqlite runs one per execute())."""
+    stmt = ""
+    for line in script.splitlines(keepends=True):
+        stmt += line
+        if sqlite3.complete_statement(stmt):
+            yield stmt.strip()
+            stmt = ""
+
+
+async def migrate_sqlite(conn: aiosqlite.Connection) -> int:
+    """Bring a SQLite database up to date; returns the schema version."""
+    # IMMEDIATE takes the write lock up front, so a second process waits
+    # (busy_timeout) and then finds the migrations already applied.
+    await conn.execute("BEGIN IMMEDIATE")
+    try:
+        await conn.execute(SCHEMA_VERSION_TABLE)
+        cur = await conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        (current,) = await cur.fetchone()
+        for m in _pending(current):
+            await conn.execute("SAVEPOINT migration")
+            try:
+                for stmt in _sqlite_statements(m.sqlite):
+                    await conn.execute(stmt)
+            except sqlite3.OperationalError as e:
+                if not m.optional:
+                    raise
+                await conn.execute("ROLLBACK TO migration")
+                _skipped(m, e)
+            await conn.execute("RELEASE migration")
+            await conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at_ms) VALUES (?, ?, ?)",
+                (m.version, m.name, now_ms()),
+            )
+            current = m.version
+        await conn.commit()
+    except BaseException:
+        await conn.rollback()
+        raise
+    return current
+
+
+async def migrate_postgres(conn: Any) -> int:
+    """Bring a PostgreSQL database (the connection's search_path schema) up to date."""
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", POSTGRES_MIGRATION_LOCK)
+        await conn.execute(SCHEMA_VERSION_TABLE)
+        current = await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        for m in _pending(current):
+            try:
+                async with conn.transaction():  # a savepoint, so a failed optional migration can be undone
+                    await conn.execute(m.postgres)  # no arguments: runs as one multi-statement script
+            except asyncpg.PostgresError as e:
+                if not m.optional:
+                    raise
+                _skipped(m, e)
+            await conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at_ms) VALUES ($1, $2, $3)",
+                m.version, m.name, now_ms(),
+            )
+            current = m.version
+    return current
+
+
+def _skipped(m: Migration, error: Exception) -> None:
+    log.warning("Migration %d (%s) is not supported by this database, skipped: %s", m.version, m.name, error)
+
+
+async def sqlite_has_table(conn: aiosqlite.Connection, name: str) -> bool:
+    cur = await conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return await cur.fetchone() is not None
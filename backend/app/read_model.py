@@ -0,0 +1,93 @@
+import asyncio, uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from .db import Database
+from .relay import Relay
+
+
+class ReadModel:
+    """
+    In-process copy of the roster reads (players, tables, seat assignments).
+
+    Every write to those tables calls invalidate(), which bumps `version` and
+    drops the cached views; the next read of each view reloads it once from the
+    database.  `etag` identifies the current version so an unchanged read can
+    be answered with 304 without touching the database at all.
+
+    With attach(relay, topic), every invalidation is also published on the
+    relay, so the read models of the other worker processes drop their views
+    too (and stop answering 304 for the old version).
+    """
+
+    # distinct views kept per version (player searches vary per keystroke)
+    MAX_VIEWS = 64
+
+    def __init__(self) -> None:
+        self.version = 1
+        # ETags must not repeat across restarts, when version starts over
+        self._epoch = uuid.uuid4().hex[:8]
+        self._views: OrderedDict[tuple, Any] = OrderedDict()
+        self._relay: Optional[Relay] = None
+        self._topic = ""
+        self._publishing: set[asyncio.Task] = set()
+
+    def attach(self, relay: Relay, topic: str) -> None:
+        """Share invalidations with the other processes through `relay` on `topic`."""
+        self._relay, self._topic = relay, topic
+        # Missed messages may have been invalidations.
+        relay.subscribe(topic, self._receive, on_gap=self.drop)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self._epoch}-{self.version}"'
+
+    def invalidate(self) -> None:
+        self.drop()
+        if self._relay is not None:
+            msg = {"type": "invalidate", "payload": {"origin": self._epoch}}
+            task = asyncio.get_running_loop().create_task(self._relay.publish(self._topic, msg))
+            self._publishing.add(task)
+            task.add_done_callback(self._publishing.discard)
+
+    def _receive(self, msg: dict[str, Any]) -> None:
+        if msg.get("type") == "invalidate" and (msg.get("payload") or {}).get("origin") != self._epoch:
+            self.drop()
+
+    def drop(self) -> None:
+        """Drop the cached views of this process only."""
+        self.version += 1
+        self._views.clear()
+
+    async def get(self, key: tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        if key in self._views:
+            self._views.move_to_end(key)
+            return self._views[key]
+        version = self.version
+        value = await load()
+        # Don't cache a result that raced with a write.
+        if version == self.version:
+            self._views[key] = value
+            if len(self._views) > self.MAX_VIEWS:
+                self._views.popitem(last=False)
+        return value
+
+
+def read_model(db: Database) -> ReadModel:
+    rm = db._read_model
+    if rm is None:
+        rm = db._read_model = ReadModel()
+    return rm
+
+
+def invalidate_roster(db: Database) -> None:
+    """
+    Call after any change to players, tables or seat_assignments.  Inside a
+    transaction the views are dropped once it commits: dropping them earlier
+    would let a read of the old rows be cached as current.  If it rolls back
+    they are dropped too, as the writing task may have cached its own
+    uncommitted rows meanwhile.
+    """
+    rm = read_model(db)
+    db.after_rollback(rm.drop)
+    db.after_commit(rm.invalidate)
@@ -0,0 +1,312 @@
+"""
+Cross-process fan-out for EventBus, for running several worker processes.
+
+With a relay, EventBus.publish() hands each event to the relay instead of
+appending it to the ring directly.  The relay delivers every message to
+every process, the publisher included, in one global order.  Each process's
+bus then appends what it receives, so clients see the same events in the
+same order whichever worker they are connected to.  Sequence numbers and the
+bus epoch stay per process; a client that reconnects to another worker gets
+a fresh snapshot instead of a replay.
+
+Two backends:
+  * PostgresRelay: LISTEN/NOTIFY on the DATABASE_DSN database.
+  * UnixSocketRelay: a broker on a Unix socket.  The first process to start
+    hosts it, and every process (including that one) connects as a client.
+"""
+import asyncio, fcntl, json, logging, os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+import asyncpg
+
+from .utils import now_ms
+from .wire import encode_text
+
+log = logging.getLogger(__name__)
+
+# Called with each message ({"type", "payload"}) delivered on a topic
+Handler = Callable[[dict[str, Any]], None]
+
+
+class Relay(ABC):
+    def __init__(self) -> None:
+        self._handlers: dict[str, Handler] = {}
+        self._gap_handlers: list[Callable[[], None]] = []
+
+    def subscribe(self, topic: str, handler: Handler, on_gap: Optional[Callable[[], None]] = None) -> None:
+        """
+        Deliver messages on `topic` to `handler`.  `on_gap` is called if this
+        process may have missed messages (lost connection to the relay).
+        """
+        self._handlers[topic] = handler
+        if on_gap is not None:
+            self._gap_handlers.append(on_gap)
+
+    async def publish(self, topic: str, msg: dict[str, Any]) -> None:
+        # One line per message: compact JSON never contains a raw newline.
+        await self._send(f"{topic} {encode_text(msg)}")
+
+    def _deliver(self, data: str) -> None:
+        # Never raises: a bad message or a failing handler must not stop the
+        # delivery of everything after it.
+        topic, _, body = data.partition(" ")
+        handler = self._handlers.get(topic)
+        if handler is None:
+            return
+        try:
+            handler(json.loads(body))
+        except Exception:
+            log.exception("relay message on %r could not be delivered: %.200s", topic, body)
+
+    def _gap(self) -> None:
+        for on_gap in self._gap_handlers:
+            try:
+                on_gap()
+            except Exception:
+                log.exception("relay gap handler %r failed", on_gap)
+
+    @abstractmethod
+    async def start(self) -> None: ...
+
+    @abstractmethod
+    async def _send(self, data: str) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+class UnixSocketRelay(Relay):
+    """
+    Newline-delimited messages through a broker on a Unix socket.  The broker
+    writes each line it reads to every connection in the order it read them,
+    which is the global order.  Whichever process gets to bind the socket
+    runs the broker, guarded by an flock on `<path>.lock` so that exactly one
+    process does.  If that process exits, the others see EOF, one of them
+    takes over, and all of them report a gap.
+    """
+
+    RECONNECT_DELAY_S = 0.2
+    # A client this far behind on reading is dropped; it will reconnect and resync.
+    MAX_CLIENT_BUFFER = 16 * 1024 * 1024
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._lock_fd: Optional[int] = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._serving: set[asyncio.Task] = set()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self._connect()
+        self._task = asyncio.create_task(self._run())
+
+    async def _send(self, data: str) -> None:
+        await self._connected.wait()
+        self._writer.write(data.encode() + b"\n")
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass  # lost the broker: _run() reconnects and reports the gap
+
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writer:
+            self._writer.close()
+        if self._server:
+            server, self._server = self._server, None
+            server.close()
+            for w in list(self._clients):
+                w.close()
+            await asyncio.gather(*self._serving, return_exceptions=True)
+            await server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # releases the flock
+            self._lock_fd = None
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                await self._become_broker()
+        self._reader, self._writer = reader, writer
+        self._connected.set()
+        return reader, writer
+
+    async def _become_broker(self) -> None:
+        # Nobody is listening: the socket file is missing or left over from a
+        # process that died.  Whoever holds the lock replaces it; the others
+        # retry the connect shortly.
+        if self._server is None:
+            fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                await asyncio.sleep(self.RECONNECT_DELAY_S)
+                return
+            self._lock_fd = fd
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._server is None:  # accepted while shutting down
+            writer.close()
+            return
+        self._clients.add(writer)
+        self._serving.add(asyncio.current_task())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                for w in list(self._clients):
+                    if w.transport.get_write_buffer_size() > self.MAX_CLIENT_BUFFER:
+                        self._clients.discard(w)
+                        w.close()
+                        continue
+                    w.write(line)
+        finally:
+            self._clients.discard(writer)
+            self._serving.discard(asyncio.current_task())
+            writer.close()
+
+    async def _run(self) -> None:
+        reader = self._reader
+        while True:
+            try:
+                line = await reader.readline()
+            except ConnectionError:
+                line = b""
+            if line:
+                self._deliver(line.decode().rstrip("\n"))
+                continue
+            # Lost the broker: reconnect (maybe becoming it) and tell the
+            # buses their subscribers may have missed events.
+            self._connected.clear()
+            self._writer.close()
+            await asyncio.sleep(self.RECONNECT_DELAY_S)
+            reader, _ = await self._connect()
+            self._gap()
+
+
+class PostgresRelay(Relay):
+    """
+    LISTEN/NOTIFY on one channel; Postgres delivers notifications to every
+    listener in commit order.  NOTIFY payloads are limited to 8000 bytes, so
+    larger messages are stored in `bus_spill` and only their id is notified.
+    """
+
+    CHANNEL = "spt_events"
+    MAX_NOTIFY_BYTES = 7900
+    SPILL_TTL_MS = 60_000
+
+    def __init__(self, dsn: str) -> None:
+        super().__init__()
+        self._dsn = dsn
+        self._listen: Optional[asyncpg.Connection] = None
+        self._send_conn: Optional[asyncpg.Connection] = None
+        self._send_lock = asyncio.Lock()
+        # Notifications are handled one at a time, in order, even when one
+        # has to be fetched from bus_spill.
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._send_conn = await asyncpg.connect(self._dsn)
+        await self._send_conn.execute(
+            "CREATE TABLE IF NOT EXISTS bus_spill (id BIGSERIAL PRIMARY KEY, body TEXT NOT NULL, created_at_ms BIGINT NOT NULL)"
+        )
+        await self._listen_start()
+        self._task = asyncio.create_task(self._run())
+
+    async def _listen_start(self) -> None:
+        self._listen = await asyncpg.connect(self._dsn)
+        self._listen.add_termination_listener(self._on_terminated)
+        await self._listen.add_listener(self.CHANNEL, self._on_notify)
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        self._inbox.put_nowait(payload)
+
+    def _on_terminated(self, conn) -> None:
+        self._inbox.put_nowait("")  # reconnect marker
+
+    async def _send(self, data: str) -> None:
+        async with self._send_lock:
+            if len(data.encode()) > self.MAX_NOTIFY_BYTES:
+                now = now_ms()
+                spill_id = await self._send_conn.fetchval(
+                    "INSERT INTO bus_spill (body, created_at_ms) VALUES ($1, $2) RETURNING id", data, now
+                )
+                await self._send_conn.execute("DELETE FROM bus_spill WHERE created_at_ms < $1", now - self.SPILL_TTL_MS)
+                data = f"@{spill_id}"
+            await self._send_conn.execute("SELECT pg_notify($1, $2)", self.CHANNEL, data)
+
+    async def _run(self) -> None:
+        while True:
+            payload = await self._inbox.get()
+            if payload == "":
+                await self._reconnect()
+                continue
+            if payload.startswith("@"):
+                async with self._send_lock:
+                    payload = await self._send_conn.fetchval("SELECT body FROM bus_spill WHERE id=$1", int(payload[1:]))
+                if payload is None:
+                    self._gap()
+                    continue
+            self._deliver(payload)
+
+    async def _reconnect(self) -> None:
+        while True:
+            try:
+                await self._listen_start()
+                break
+            except (OSError, asyncpg.PostgresError):
+                await asyncio.sleep(1)
+        self._gap()
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listen is not None:
+            self._listen.remove_termination_listener(self._on_terminated)
+            await self._listen.close()
+        if self._send_conn is not None:
+            await self._send_conn.close()
+
+
+def make_relay(settings: Any) -> Optional[Relay]:
+    """The relay selected by EVENT_BUS=shared, or None for an in-process bus."""
+    if settings.event_bus != "shared":
+        return None
+    if settings.database_dsn:
+        return PostgresRelay(settings.database_dsn)
+    path = settings.bus_socket_path or os.path.join(
+        os.path.dirname(os.path.abspath(settings.database_path)), ".bus.sock"
+    )
+    return UnixSocketRelay(path)
@@ -0,0 +1,164 @@
+import asyncio, heapq, itertools, logging
+from typing import Optional, Protocol
+from .utils import now_ms
+
+log = logging.getLogger(__name__)
+
+
+class Schedulable(Protocol):
+    async def next_deadline_ms(self) -> Optional[int]: ...
+
+    async def _tick(self) -> None: ...
+
+
+class TimerScheduler:
+    """
+    Drives any number of timers from one task and one heap of deadlines.
+
+    Each timer asks for a recompute with schedule(timer) whenever its timeline
+    changes; the scheduler then asks it for next_deadline_ms() and keeps a single
+    (deadline, seq, generation, timer) entry for it in the heap.  Superseded
+    entries are left in place and discarded lazily when they reach the top.
+    Due timers tick in their own task, so one slow database can't hold up the
+    rest, and are re-queued for a recompute once the tick finishes.
+
+    A tick that raises, or that leaves the timer's deadline where it was, is
+    re-armed no sooner than min_rearm_ms later, doubling on every further
+    stall, so a misbehaving timer can't turn into a hot loop.
+    """
+
+    def __init__(self, *, max_sleep_ms: int = 60_000, min_rearm_ms: int = 100) -> None:
+        # Upper bound on a single sleep, as a guard against wall-clock steps
+        self._max_sleep_ms = max_sleep_ms
+        self._min_rearm_ms = min_rearm_ms
+        # timer -> (deadline it was ticked for, whether the tick raised)
+        self._ticked: dict[Schedulable, tuple[int, bool]] = {}
+        # timer -> consecutive ticks that made no progress
+        self._stalls: dict[Schedulable, int] = {}
+        self._heap: list[tuple[int, int, int, Schedulable]] = []
+        self._seq = itertools.count()
+        self._generation: dict[Schedulable, int] = {}
+        self._dirty: set[Schedulable] = set()
+        self._ticking: set[Schedulable] = set()
+        self._tick_tasks: set[asyncio.Task] = set()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._generation)
+
+    def add(self, timer: Schedulable) -> None:
+        self._generation.setdefault(timer, 0)
+        self.schedule(timer)
+
+    def remove(self, timer: Schedulable) -> None:
+        self._generation.pop(timer, None)
+        self._dirty.discard(timer)
+        self._ticked.pop(timer, None)
+        self._stalls.pop(timer, None)
+
+    def schedule(self, timer: Schedulable) -> None:
+        """Ask for timer's next deadline to be recomputed."""
+        if timer not in self._generation:
+            return
+        self._dirty.add(timer)
+        self._wake.set()
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and cancel the ticks in flight; no timer is ticked once this returns."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        ticks = list(self._tick_tasks)
+        for task in ticks:
+            task.cancel()
+        if ticks:
+            await asyncio.gather(*ticks, return_exceptions=True)
+
+    async def _recompute(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        for timer in dirty:
+            if timer not in self._generation or timer in self._ticking:
+                continue
+            gen = self._generation[timer] + 1
+            self._generation[timer] = gen
+            due, failed = self._ticked.pop(timer, (None, False))
+            try:
+                deadline = await timer.next_deadline_ms()
+            except Exception:
+                log.exception("computing the next deadline of %r failed", timer)
+                deadline, failed = now_ms(), True
+            if due is not None or failed:
+                deadline = self._backoff(timer, deadline, due, failed)
+            if deadline is not None:
+                heapq.heappush(self._heap, (deadline, next(self._seq), gen, timer))
+
+    def _discard_stale(self) -> None:
+        heap = self._heap
+        while heap and self._generation.get(heap[0][3]) != heap[0][2]:
+            heapq.heappop(heap)
+
+    def _backoff(self, timer: Schedulable, deadline: Optional[int], due: Optional[int], failed: bool) -> Optional[int]:
+        if deadline is None or not (failed or (due is not None and deadline <= due)):
+            self._stalls.pop(timer, None)
+            return deadline
+        stalls = self._stalls.get(timer, 0) + 1
+        self._stalls[timer] = stalls
+        delay = min(self._min_rearm_ms << min(stalls - 1, 16), self._max_sleep_ms)
+        if not failed:
+            log.warning("%r made no progress past its deadline; re-arming in %d ms", timer, delay)
+        return max(deadline, now_ms() + delay)
+
+    async def _run_tick(self, timer: Schedulable, due: int) -> None:
+        failed = False
+        try:
+            await timer._tick()
+        except Exception:
+            failed = True
+            log.exception("tick of %r failed", timer)
+        finally:
+            self._ticking.discard(timer)
+            if timer in self._generation:
+                self._ticked[timer] = (due, failed)
+            self.schedule(timer)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            await self._recompute()
+            self._discard_stale()
+
+            sleep_ms = self._max_sleep_ms
+            if self._heap:
+                sleep_ms = min(sleep_ms, self._heap[0][0] - now_ms())
+            if sleep_ms > 0:
+                # Not wait_for(): on 3.11 it swallows a cancel that lands as the
+                # wake-up fires (e.g. a cancelled tick re-queueing itself in stop()).
+                waiter = asyncio.ensure_future(self._wake.wait())
+                try:
+                    done, _ = await asyncio.wait((waiter,), timeout=sleep_ms / 1000)
+                finally:
+                    waiter.cancel()
+                if done:
+                    continue
+
+            now = now_ms()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _seq, gen, timer = heapq.heappop(self._heap)
+                if self._generation.get(timer) != gen:
+                    continue
+                # Invalidate the entry; _run_tick re-queues a recompute when done.
+                self._generation[timer] = gen + 1
+                self._ticking.add(timer)
+                task = asyncio.create_task(self._run_tick(timer, deadline))
+                self._tick_tasks.add(task)
+                task.add_done_callback(self._tick_tasks.discard)
@@ -1,7 +1,8 @@
 import random, time
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 from .db import Database, add_announcement, get_settings
 from .events import EventBus, Event
+from .read_model import invalidate_roster
 
 def now_ms() -> int:
     return int(time.time() * 1000)
@@ -17,13 +18,25 @@ async def list_tables(conn: Database) -> list[dict[str, Any]]:
 async def get_assignments(conn: Database) -> list[dict[str, Any]]:
     rows = await conn.fetchall(
         '''
-        SELECT sa.table_id, sa.seat_num, sa.player_id, t.name AS table_name
+        SELECT sa.table_id, sa.seat_num, sa.player_id, t.name AS table_name, p.name AS player_name,
+               p.eliminated AS player_eliminated
         FROM seat_assignments sa
         JOIN tables t ON t.id = sa.table_id
+        LEFT JOIN players p ON p.id = sa.player_id
         ORDER BY t.created_at_ms ASC, sa.seat_num ASC
         '''
     )
-    return [{"table_id": r["table_id"], "table_name": r["table_name"], "seat_num": r["seat_num"], "player_id": r["player_id"]} for r in rows]
+    return [
+        {
+            "table_id": r["table_id"],
+            "table_name": r["table_name"],
+            "seat_num": r["seat_num"],
+            "player_id": r["player_id"],
+            "player_name": r["player_name"],
+            "player_eliminated": bool(r["player_eliminated"]) if r["player_id"] else None,
+        }
+        for r in rows
+    ]
 
 async def clear_eliminated_assignments(conn: Database) -> int:
     await conn.execute("""
@@ -34,39 +47,71 @@ async def clear_eliminated_assignments(conn: Database) -> int:
         )
     """)
     await conn.commit()
+    invalidate_roster(conn)
     return 0
 
-async def _ensure_seats_for_table(conn: Database, table_id: str, seats: int) -> None:
-    row = await conn.fetchone("SELECT COUNT(*) AS c FROM seat_assignments WHERE table_id=?", (table_id,))
-    existing = int(row["c"])
-    if existing < seats:
-        for n in range(existing + 1, seats + 1):
-            await conn.execute(
-                "INSERT OR IGNORE INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, NULL)",
-                (table_id, n)
-            )
-    if existing > seats:
-        await conn.execute("DELETE FROM seat_assignments WHERE table_id=? AND seat_num>?", (table_id, seats))
-    await conn.commit()
+# Every table gets exactly seats 1..tables.seats: add the missing seat rows
+# for all tables in one statement, and drop the surplus ones in another.
+_INSERT_MISSING_SEATS = """
+    WITH RECURSIVE seat(n) AS (
+        SELECT 1
+        UNION ALL
+        SELECT n + 1 FROM seat WHERE n < (SELECT MAX(seats) FROM tables)
+    )
+    INSERT OR IGNORE INTO seat_assignments (table_id, seat_num)
+    SELECT t.id, seat.n FROM tables t, seat WHERE seat.n <= t.seats
+"""
+_DELETE_SURPLUS_SEATS = """
+    DELETE FROM seat_assignments
+    WHERE seat_num > (SELECT t.seats FROM tables t WHERE t.id = seat_assignments.table_id)
+"""
 
 async def normalize_seats(conn: Database) -> None:
-    rows = await conn.fetchall("SELECT id, seats FROM tables")
-    for r in rows:
-        await _ensure_seats_for_table(conn, r["id"], int(r["seats"]))
+    async with conn.transaction():
+        await conn.execute(_INSERT_MISSING_SEATS)
+        await conn.execute(_DELETE_SURPLUS_SEATS)
+        invalidate_roster(conn)
 
 async def clear_all_assignments(conn: Database) -> None:
     await conn.execute("UPDATE seat_assignments SET player_id=NULL")
 
+async def _announce(conn: Database, type: str, payload: dict[str, Any]) -> Event:
+    """Record an announcement; returns its event, to publish once the transaction commits."""
+    ts = now_ms()
+    await add_announcement(conn, created_at_ms=ts, type=type, payload=payload)
+    return Event("announcement", {"type": type, "payload": payload, "created_at_ms": ts})
+
+async def _run_seating(
+    conn: Database,
+    bus: EventBus,
+    op: Callable[[Database], Awaitable[tuple[dict[str, Any], Optional[Event]]]],
+) -> dict[str, Any]:
+    """Run a seating operation as one transaction, and announce it once committed."""
+    async with conn.transaction():
+        payload, announcement = await op(conn)
+    if announcement is not None:
+        await bus.publish(announcement)
+    return payload
+
 async def randomize_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
+    return await _run_seating(conn, bus, _randomize_seating)
+
+async def rebalance(conn: Database, bus: EventBus) -> dict[str, Any]:
+    return await _run_seating(conn, bus, _rebalance)
+
+async def deseat_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
+    return await _run_seating(conn, bus, _deseat_seating)
+
+async def _randomize_seating(conn: Database) -> tuple[dict[str, Any], Optional[Event]]:
     await normalize_seats(conn)
     players = await list_active_players(conn)
     tables = [t for t in await list_tables(conn) if t["enabled"]]
     if not tables:
-        return {"message": "No enabled tables.", "changes": []}
+        return {"message": "No enabled tables.", "changes": []}, None
 
     capacity = sum(t["seats"] for t in tables)
     if len(players) > capacity:
-        return {"message": f"Not enough seats for {len(players)} players (capacity {capacity}).", "changes": []}
+        return {"message": f"Not enough seats for {len(players)} players (capacity {capacity}).", "changes": []}, None
 
     prev = await get_assignments(conn)
     prev_map = {a["player_id"]: (a["table_id"], a["seat_num"]) for a in prev if a["player_id"]}
@@ -116,13 +161,10 @@ async def randomize_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
         include_all=True,  # randomize usually wants "full list"
     )
 
-    ts = now_ms()
     payload = {"changes": changes}
-    await add_announcement(conn, created_at_ms=ts, type="randomize", payload=payload)
-    await bus.publish(Event("announcement", {"type": "randomize", "payload": payload, "created_at_ms": ts}))
-    return payload
+    return payload, await _announce(conn, "randomize", payload)
 
-async def rebalance(conn: Database, bus: EventBus) -> dict[str, Any]:
+async def _rebalance(conn: Database) -> tuple[dict[str, Any], Optional[Event]]:
     await normalize_seats(conn)
 
     removed = await clear_eliminated_assignments(conn)
@@ -130,21 +172,18 @@ async def rebalance(conn: Database, bus: EventBus) -> dict[str, Any]:
     players = await list_active_players(conn)
     tables = [t for t in await list_tables(conn) if t["enabled"]]
     if not tables:
-        return {"message": "No enabled tables.", "changes": []}
+        return {"message": "No enabled tables.", "changes": []}, None
 
     n_players = len(players)
     if n_players == 0:
         await clear_all_assignments(conn)
-        await conn.commit()
+        invalidate_roster(conn)
         payload = {"changes": []}
-        ts = now_ms()
-        await add_announcement(conn, created_at_ms=ts, type="rebalance", payload=payload)
-        await bus.publish(Event("announcement", {"type": "rebalance", "payload": payload, "created_at_ms": ts}))
-        return payload
+        return payload, await _announce(conn, "rebalance", payload)
 
     capacity = sum(t["seats"] for t in tables)
     if n_players > capacity:
-        return {"message": f"Not enough seats for {n_players} players (capacity {capacity}).", "changes": []}
+        return {"message": f"Not enough seats for {n_players} players (capacity {capacity}).", "changes": []}, None
 
     prev = await get_assignments(conn)
     prev_map = {a["player_id"]: (a["table_id"], a["seat_num"]) for a in prev if a["player_id"]}
@@ -237,13 +276,10 @@ async def rebalance(conn: Database, bus: EventBus) -> dict[str, Any]:
         include_all=False,  # rebalance usually wants only changes
     )
 
-    ts = now_ms()
     payload = {"changes": changes}
-    await add_announcement(conn, created_at_ms=ts, type="rebalance", payload=payload)
-    await bus.publish(Event("announcement", {"type": "rebalance", "payload": payload, "created_at_ms": ts}))
-    return payload
+    return payload, await _announce(conn, "rebalance", payload)
 
-async def deseat_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
+async def _deseat_seating(conn: Database) -> tuple[dict[str, Any], Optional[Event]]:
     # Capture previous assignments (for announcements)
     prev = await get_assignments(conn)
     prev_map = {
@@ -254,18 +290,11 @@ async def deseat_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
 
     if not prev_map:
         payload = {"changes": []}
-        ts = now_ms()
-        await add_announcement(conn, created_at_ms=ts, type="deseat", payload=payload)
-        await bus.publish(Event("announcement", {
-            "type": "deseat",
-            "payload": payload,
-            "created_at_ms": ts,
-        }))
-        return payload
+        return payload, await _announce(conn, "deseat", payload)
 
     # Clear all seat assignments
     await clear_all_assignments(conn)
-    await conn.commit()
+    invalidate_roster(conn)
 
     # Build changes list (everyone goes to nowhere)
     changes = []
@@ -278,28 +307,10 @@ async def deseat_seating(conn: Database, bus: EventBus) -> dict[str, Any]:
             "to_seat": None,
         })
 
-    ts = now_ms()
     payload = {
         "changes": changes,
     }
-
-    await add_announcement(
-        conn,
-        created_at_ms=ts,
-        type="deseat",
-        payload=payload,
-    )
-
-    await bus.publish(Event(
-        "announcement",
-        {
-            "type": "deseat",
-            "payload": payload,
-            "created_at_ms": ts,
-        }
-    ))
-
-    return payload
+    return payload, await _announce(conn, "deseat", payload)
 
 def compute_table_targets(tables_sorted: list[dict[str, Any]], n_players: int) -> dict[str, int]:
     """Balanced target counts per table.
@@ -543,12 +554,12 @@ async def apply_assignments_and_build_changes(
 ) -> list[dict[str, Any]]:
     # Apply: clear and reassign
     await clear_all_assignments(conn)
-    for pid, (tid, seat_num) in final_assignments.items():
-        await conn.execute(
-            "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
-            (pid, tid, seat_num),
-        )
+    await conn.executemany(
+        "UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?",
+        [(pid, tid, seat_num) for pid, (tid, seat_num) in final_assignments.items()],
+    )
     await conn.commit()
+    invalidate_roster(conn)
 
     # Build changes
     changes: list[dict[str, Any]] = []
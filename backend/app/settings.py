@@ -4,8 +4,29 @@ import os
 class AppSettings(BaseModel):
     database_path: str = os.getenv("DATABASE_PATH", "./app.db")
     database_dsn: str | None = os.getenv("DATABASE_DSN")
+    tournaments_dir: str | None = os.getenv("TOURNAMENTS_DIR")
+    # SQLite tuning, applied to every connection (see db.SqlitePragmas)
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-16000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Read-only connections per SQLite database, opened as needed (0: read on the writer)
+    sqlite_read_connections: int = int(os.getenv("SQLITE_READ_CONNECTIONS", "4"))
+    # The same for the database of each additional hosted tournament
+    sqlite_tournament_read_connections: int = int(os.getenv("SQLITE_TOURNAMENT_READ_CONNECTIONS", "1"))
+    # How often to checkpoint and truncate the WAL and close idle read connections
+    # (0: leave the WAL to SQLite's autocheckpoint and keep read connections open)
+    sqlite_checkpoint_interval_ms: int = int(os.getenv("SQLITE_CHECKPOINT_INTERVAL_MS", "60000"))
     sounds_dir: str = os.getenv("SOUNDS_DIR", "./sounds")
     cors_allow_origins: str = os.getenv("CORS_ALLOW_ORIGINS", "*")
     static_dir: str | None = os.getenv("STATIC_DIR")
+    state_max_staleness_ms: int = int(os.getenv("STATE_MAX_STALENESS_MS", "60000"))
+    clock_beacon_interval_ms: int = int(os.getenv("CLOCK_BEACON_INTERVAL_MS", "2000"))
+    # "local": events stay in this process; "shared": fan them out across worker
+    # processes (LISTEN/NOTIFY with DATABASE_DSN, else a Unix socket broker)
+    event_bus: str = os.getenv("EVENT_BUS", "local")
+    bus_socket_path: str | None = os.getenv("BUS_SOCKET_PATH")
+    # With EVENT_BUS=shared: how often followers try to take over the timers
+    leader_poll_ms: int = int(os.getenv("LEADER_POLL_MS", "1000"))
 
 settings = AppSettings()
@@ -1,7 +1,8 @@
-import asyncio, time
+import time
 from typing import Optional
 from .events import EventBus, Event
-from .db import get_settings, get_state, set_state, add_announcement
+from .scheduler import TimerScheduler
+from .db import SettingsSnapshot, get_settings_snapshot, get_state, set_state, add_announcement
 
 def now_ms() -> int:
     return int(time.time() * 1000)
@@ -16,9 +17,19 @@ class TimerService:
           paused   => remaining_s
     """
 
-    def __init__(self, *, conn, bus: EventBus) -> None:
+    def __init__(
+        self,
+        *,
+        conn,
+        bus: EventBus,
+        scheduler: Optional[TimerScheduler] = None,
+        persist_max_staleness_ms: int = 60_000,
+    ) -> None:
         self.conn = conn
         self.bus = bus
+        # Usually shared by every hosted tournament; a private one otherwise.
+        self._own_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler()
 
         self.current_level_index = 0
 
@@ -29,11 +40,16 @@ class TimerService:
         self.finish_at_server_ms: int = 0
 
         self.running = False
-        self._task: Optional[asyncio.Task] = None
 
-        # Persist / broadcast throttles
-        self._persist_every_ms = 1000
+        # Write-behind persistence: tourney_state is only written when the
+        # authoritative fields change, or when the stored remaining_ms snapshot
+        # of a running clock is older than the staleness bound.
+        self._persist_max_staleness_ms = int(persist_max_staleness_ms)
         self._last_persist_ms = 0
+        self._persisted_key: Optional[tuple] = None
+
+        # Settings version last published as a `settings` event
+        self._published_settings_version = 0
 
         self._reset_milestones()
 
@@ -63,7 +79,8 @@ class TimerService:
             # paused => remaining_ms is authoritative, finish_at not used
             self.finish_at_server_ms = 0
 
-        self._reset_milestones()
+        # Whoever drove the clock before us already played the cues it passed.
+        self._restore_milestones(await get_settings_snapshot(self.conn))
         await self._emit_full_state()
 
     def _reset_milestones(self) -> None:
@@ -71,10 +88,49 @@ class TimerService:
         self._thirty_fired = False
         self._five_fired = False
 
+    def _restore_milestones(self, snap: SettingsSnapshot) -> None:
+        total_ms = snap.level_duration_ms(self.current_level_index)
+        rem = self._current_remaining_ms()
+        self._half_fired = total_ms > 0 and rem <= total_ms // 2
+        self._thirty_fired = total_ms > 0 and rem <= 30_000
+        self._five_fired = total_ms > 0 and rem <= 5_000
+
     async def start(self) -> None:
-        if self._task and not self._task.done():
-            return
-        self._task = asyncio.create_task(self._loop())
+        self.scheduler.add(self)
+        if self._own_scheduler:
+            await self.scheduler.start()
+
+    async def stop(self) -> None:
+        """Stop ticking and flush the latest state."""
+        self.scheduler.remove(self)
+        if self._own_scheduler:
+            await self.scheduler.stop()
+        await self._persist(force=True)
+
+    def _rearm(self) -> None:
+        # The timeline changed: have the scheduler recompute our deadline.
+        self.scheduler.schedule(self)
+
+    async def next_deadline_ms(self) -> Optional[int]:
+        return self._next_deadline_ms(await get_settings_snapshot(self.conn))
+
+    def _next_deadline_ms(self, snap: SettingsSnapshot) -> Optional[int]:
+        """Earliest server time at which _tick has work to do (milestone, level end or persist), or None when idle."""
+        if not self.running:
+            return None
+        finish = int(self.finish_at_server_ms)
+        deadlines = [finish, self._last_persist_ms + self._persist_max_staleness_ms]
+        total_ms = snap.level_duration_ms(self.current_level_index)
+        if total_ms <= 0:
+            # Level no longer in the schedule: _fire_milestones has nothing to do
+            return min(deadlines)
+        if not self._half_fired:
+            deadlines.append(finish - total_ms // 2)
+        if not self._thirty_fired:
+            deadlines.append(finish - 30_000)
+        if not self._five_fired:
+            deadlines.append(finish - 5_000)
+        return min(deadlines)
 
     def _current_remaining_ms(self) -> int:
         if not self.running:
@@ -82,7 +138,12 @@ class TimerService:
         return max(0, int(self.finish_at_server_ms) - now_ms())
 
     async def _emit_full_state(self) -> None:
-        settings = await get_settings(self.conn)
+        # The settings blob goes out as its own event, only when it changed;
+        # `state` events carry the timer fields and the settings version.
+        snap = await get_settings_snapshot(self.conn)
+        if snap.version != self._published_settings_version:
+            self._published_settings_version = snap.version
+            await self.bus.publish(Event("settings", {"version": snap.version, "settings": snap.raw}))
 
         if self.running:
             payload_state = {
@@ -90,6 +151,7 @@ class TimerService:
                 "running": True,
                 "server_time_ms": now_ms(),
                 "finish_at_server_ms": int(self.finish_at_server_ms),
+                "settings_version": snap.version,
             }
         else:
             payload_state = {
@@ -97,16 +159,27 @@ class TimerService:
                 "running": False,
                 "server_time_ms": now_ms(),
                 "remaining_s": int(max(0, self.remaining_ms) // 1000),
+                "settings_version": snap.version,
             }
 
-        await self.bus.publish(Event("state", {
-            "state": payload_state,
-            "settings": settings,
-        }))
+        await self.bus.publish(Event("state", {"state": payload_state}))
 
-    async def _persist(self) -> None:
+    def _authoritative_key(self) -> tuple:
+        if self.running:
+            return (self.current_level_index, True, int(self.finish_at_server_ms), None)
+        return (self.current_level_index, False, 0, int(self.remaining_ms))
+
+    async def _persist(self, *, force: bool = False) -> None:
         # Persist both remaining_ms and finish_at_server_ms so we can recover accurately.
         # remaining_ms is the paused truth; while running it's just a snapshot.
+        key = self._authoritative_key()
+        now = now_ms()
+        if (
+            not force
+            and key == self._persisted_key
+            and now - self._last_persist_ms < self._persist_max_staleness_ms
+        ):
+            return
         rem = self._current_remaining_ms()
         await set_state(
             self.conn,
@@ -114,21 +187,21 @@ class TimerService:
             remaining_ms=int(rem),
             finish_at_server_ms=int(self.finish_at_server_ms) if self.running else 0,
             running=1 if self.running else 0,
-            updated_at_ms=now_ms(),
+            updated_at_ms=now,
         )
+        self._persisted_key = key
+        self._last_persist_ms = now
 
     async def _announce(self, type: str, payload: dict) -> None:
         ts = now_ms()
         await add_announcement(self.conn, created_at_ms=ts, type=type, payload=payload)
         await self.bus.publish(Event("announcement", {"type": type, "payload": payload, "created_at_ms": ts}))
 
-    async def _fire_milestones(self, settings: dict) -> None:
-        levels = settings.get("levels", [])
-        if not levels or self.current_level_index >= len(levels):
+    async def _fire_milestones(self, snap: SettingsSnapshot) -> None:
+        if self.current_level_index >= len(snap.levels):
             return
-        level = levels[self.current_level_index]
-        total_ms = int(level["minutes"]) * 60_000
-        sounds = (settings.get("sounds") or {})
+        total_ms = snap.levels[self.current_level_index].duration_ms
+        sounds = snap.sounds
 
         # compute remaining from finish time (no drift)
         self.remaining_ms = self._current_remaining_ms()
@@ -145,19 +218,18 @@ class TimerService:
             self._five_fired = True
             await self.bus.publish(Event("sound", {"cue": "five", "file": sounds.get("five"), "play_id": now_ms()}))
 
-    async def _advance_level(self, settings: dict) -> None:
-        levels = settings.get("levels", [])
+    async def _advance_level(self, snap: SettingsSnapshot) -> None:
+        levels = snap.levels
         if not levels:
             return
-        sounds = (settings.get("sounds") or {})
+        sounds = snap.sounds
 
         await self._announce("level_change", {"old_idx": self.current_level_index, "new_idx": self.current_level_index + 1})
 
         if self.current_level_index < len(levels) - 1:
             await self.bus.publish(Event("sound", {"cue": "transition", "file": sounds.get("transition"), "play_id": now_ms()}))
             self.current_level_index += 1
-            nxt = levels[self.current_level_index]
-            self.remaining_ms = int(nxt["minutes"]) * 60_000
+            self.remaining_ms = levels[self.current_level_index].duration_ms
             self._reset_milestones()
 
             if self.running:
@@ -172,26 +244,24 @@ class TimerService:
         await self._emit_full_state()
         await self._persist()
 
-    async def _loop(self) -> None:
-        while True:
-            await asyncio.sleep(0.25)
-            now = now_ms()
-
-            if self.running:
-                settings = await get_settings(self.conn)
-                # derive remaining from finish time
-                self.remaining_ms = max(0, self.finish_at_server_ms - now)
+    async def _tick(self) -> None:
+        if not self.running:
+            return
+        now = now_ms()
+        snap = await get_settings_snapshot(self.conn)
+        # derive remaining from finish time
+        self.remaining_ms = max(0, self.finish_at_server_ms - now)
 
-                if self.remaining_ms <= 0:
-                    await self._advance_level(settings)
-                else:
-                    # Only fire milestones if we would not advance level
-                    await self._fire_milestones(settings)
+        if self.remaining_ms <= 0:
+            await self._advance_level(snap)
+        else:
+            # Only fire milestones if we would not advance level
+            await self._fire_milestones(snap)
 
-            if now - self._last_persist_ms >= self._persist_every_ms:
-                self._last_persist_ms = now
-                await self._persist()
-                # NOTE: no more "tick" events; clients render from finish_at_server_ms
+        if self.running:
+            # No-op unless the stored snapshot has gone stale
+            await self._persist()
+            # NOTE: no more "tick" events; clients render from finish_at_server_ms
 
     async def pause(self) -> None:
         if not self.running:
@@ -201,6 +271,7 @@ class TimerService:
         self.finish_at_server_ms = 0
         self.running = False
         await self._persist()
+        self._rearm()
         await self._emit_full_state()
 
     async def resume(self) -> None:
@@ -210,6 +281,7 @@ class TimerService:
         self.running = True
         self.finish_at_server_ms = now_ms() + int(self.remaining_ms)
         await self._persist()
+        self._rearm()
         await self._emit_full_state()
 
     async def add_time(self, delta_ms: int) -> None:
@@ -222,28 +294,29 @@ class TimerService:
             self.remaining_ms = max(0, int(self.remaining_ms) + delta_ms)
 
         await self._persist()
+        self._rearm()
         await self._emit_full_state()
 
     async def reset_level(self) -> None:
-        settings = await get_settings(self.conn)
-        levels = settings.get("levels", [])
-        if not levels or self.current_level_index >= len(levels):
+        snap = await get_settings_snapshot(self.conn)
+        if self.current_level_index >= len(snap.levels):
             return
 
         await self._announce("level_reset", None)
 
-        self.remaining_ms = int(levels[self.current_level_index]["minutes"]) * 60_000
+        self.remaining_ms = snap.level_duration_ms(self.current_level_index)
         self._reset_milestones()
 
         if self.running:
             self.finish_at_server_ms = now_ms() + int(self.remaining_ms)
 
         await self._persist()
+        self._rearm()
         await self._emit_full_state()
 
     async def go_to_level(self, level_index: int) -> None:
-        settings = await get_settings(self.conn)
-        levels = settings.get("levels", [])
+        snap = await get_settings_snapshot(self.conn)
+        levels = snap.levels
         if not levels:
             return
 
@@ -251,11 +324,26 @@ class TimerService:
         await self._announce("level_change", {"old_idx": self.current_level_index, "new_idx": level_index})
 
         self.current_level_index = level_index
-        self.remaining_ms = int(levels[level_index]["minutes"]) * 60_000
+        self.remaining_ms = levels[level_index].duration_ms
         self._reset_milestones()
 
         if self.running:
             self.finish_at_server_ms = now_ms() + int(self.remaining_ms)
 
         await self._persist()
+        self._rearm()
+        await self._emit_full_state()
+
+    async def apply_settings(self, snap: SettingsSnapshot) -> None:
+        """Re-evaluate the current level against freshly saved settings."""
+        # If current level duration changed, clamp remaining to new total
+        total_ms = snap.level_duration_ms(int(self.current_level_index))
+        if total_ms > 0:
+            if self.running:
+                self.finish_at_server_ms = min(int(self.finish_at_server_ms), now_ms() + total_ms)
+            else:
+                self.remaining_ms = min(int(self.remaining_ms), total_ms)
+
+        await self._persist()
+        self._rearm()
         await self._emit_full_state()
@@ -0,0 +1,300 @@
+import asyncio, uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+from fastapi import HTTPException
+from starlette.requests import HTTPConnection
+
+from .db import (
+    Database,
+    SqliteMaintenance,
+    open_database,
+    list_tournaments,
+    add_tournament,
+    adopt_settings,
+    get_settings_snapshot,
+    reload_settings,
+)
+from .events import EventBus, RESYNC
+from .leader import make_election
+from .read_model import read_model
+from .relay import make_relay
+from .scheduler import TimerScheduler
+from .timer import TimerService
+from .utils import now_ms
+
+DEFAULT_TOURNAMENT_ID = "default"
+# Relay topic announcing tournaments created by any worker process
+REGISTRY_TOPIC = "registry"
+# Relay topic carrying timer commands to the leader, and its acks
+TIMER_TOPIC = "timer"
+# Relay topic prefix for a tournament's roster invalidations
+ROSTER_TOPIC = "roster:"
+
+# Timer operations a follower may forward to the leader, with their arguments
+TIMER_OPS = {
+    "pause": (),
+    "resume": (),
+    "add_time": ("delta_ms",),
+    "reset_level": (),
+    "go_to_level": ("level_index",),
+    "apply_settings": (),
+}
+# How long a forwarded timer command waits for the leader's ack
+TIMER_COMMAND_TIMEOUT_S = 5
+
+
+@dataclass
+class Tournament:
+    id: str
+    name: str
+    db: Database
+    bus: EventBus
+    timer: TimerService
+
+
+class TournamentRegistry:
+    """
+    Every tournament hosted by this process.
+
+    The default tournament lives in the main database (DATABASE_PATH /
+    DATABASE_DSN), which also holds the `tournaments` table listing the
+    others.  Each additional tournament gets its own database (see
+    open_database) and its own EventBus, while all timers share one
+    TimerScheduler.
+
+    With EVENT_BUS=shared every bus publishes through one relay shared with
+    the other worker processes, and a tournament created by any of them is
+    announced on the relay so that every process hosts it.  Roster writes
+    invalidate the read model (see read_model.py) of every process.  Only the
+    elected leader process (see leader.py) drives the timers: followers
+    forward timer operations to it over the relay, and keep their settings
+    cache in step with the `settings` events it publishes.
+    """
+
+    def __init__(self, settings: Any) -> None:
+        self._settings = settings
+        self.scheduler = TimerScheduler()
+        # One task checkpointing (and closing idle readers of) every hosted SQLite database
+        self._maintenance = SqliteMaintenance(settings.sqlite_checkpoint_interval_ms)
+        self.relay = make_relay(settings)
+        self.election = make_election(settings)
+        # A lone process always leads.
+        self.is_leader = self.election is None
+        self._tournaments: dict[str, Tournament] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._mirrors: dict[str, asyncio.Task] = {}
+        self._pending_commands: dict[str, asyncio.Future] = {}
+        self._command_lock = asyncio.Lock()
+        self._campaign_task: Optional[asyncio.Task] = None
+
+    @property
+    def default(self) -> Tournament:
+        return self._tournaments[DEFAULT_TOURNAMENT_ID]
+
+    def get(self, tournament_id: str) -> Optional[Tournament]:
+        return self._tournaments.get(tournament_id)
+
+    def all(self) -> list[Tournament]:
+        return list(self._tournaments.values())
+
+    async def open(self) -> None:
+        if self.relay is not None:
+            self.relay.subscribe(REGISTRY_TOPIC, self._on_registry_message)
+            self.relay.subscribe(TIMER_TOPIC, self._on_timer_message)
+            await self.relay.start()
+        if self.election is not None:
+            self.is_leader = await self.election.try_acquire()
+        main_db = await open_database(self._settings, maintenance=self._maintenance)
+        await self._host(DEFAULT_TOURNAMENT_ID, "Main", main_db)
+        for row in await list_tournaments(main_db):
+            db = await open_database(self._settings, row["id"], maintenance=self._maintenance)
+            await self._host(row["id"], row["name"], db)
+        if self.is_leader:
+            await self.scheduler.start()
+        if self.election is not None:
+            self._campaign_task = asyncio.create_task(self._campaign())
+
+    async def create(self, name: str) -> Tournament:
+        tid = uuid.uuid4().hex
+        db = await open_database(self._settings, tid, maintenance=self._maintenance)
+        await add_tournament(self.default.db, id=tid, name=name, created_at_ms=now_ms())
+        t = await self._host(tid, name, db)
+        if self.relay is not None:
+            await self.relay.publish(REGISTRY_TOPIC, {"type": "created", "payload": {"id": tid, "name": name}})
+        return t
+
+    async def control(self, t: Tournament, op: str, **args: Any) -> None:
+        """
+        Run a timer operation (a TimerService method, or "apply_settings" after
+        a settings change) on the process that drives the timers.
+        """
+        if self.is_leader:
+            await self._run_timer_op(t, op, args)
+            return
+        command_id = uuid.uuid4().hex
+        done = asyncio.get_running_loop().create_future()
+        self._pending_commands[command_id] = done
+        try:
+            await self.relay.publish(TIMER_TOPIC, {
+                "type": "command",
+                "payload": {"id": command_id, "tournament": t.id, "op": op, "args": args},
+            })
+            error = await asyncio.wait_for(done, TIMER_COMMAND_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            raise HTTPException(503, "No process is driving the timer right now")
+        finally:
+            self._pending_commands.pop(command_id, None)
+        if error:
+            raise HTTPException(400, error)
+
+    async def _run_timer_op(self, t: Tournament, op: str, args: dict[str, Any], *, forwarded: bool = False) -> None:
+        if op == "apply_settings":
+            # A forwarding follower wrote the new settings; our cache predates them.
+            snap = await (reload_settings(t.db) if forwarded else get_settings_snapshot(t.db))
+            await t.timer.apply_settings(snap)
+            return
+        await getattr(t.timer, op)(**args)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _on_registry_message(self, msg: dict[str, Any]) -> None:
+        payload = msg.get("payload") or {}
+        tid = payload.get("id")
+        if msg.get("type") != "created" or not tid or tid in self._tournaments:
+            return
+        self._spawn(self._host_existing(tid, payload.get("name") or ""))
+
+    def _on_timer_message(self, msg: dict[str, Any]) -> None:
+        payload = msg.get("payload") or {}
+        if msg.get("type") == "ack":
+            done = self._pending_commands.get(payload.get("id"))
+            if done is not None and not done.done():
+                done.set_result(payload.get("error"))
+        elif msg.get("type") == "command" and self.is_leader:
+            self._spawn(self._execute_command(payload))
+
+    async def _execute_command(self, payload: dict[str, Any]) -> None:
+        # One at a time, in the order the relay delivered them.
+        async with self._command_lock:
+            t = self.get(payload.get("tournament"))
+            op = payload.get("op")
+            args = payload.get("args") or {}
+            error = None
+            if t is None:
+                error = "Tournament not found"
+            elif op not in TIMER_OPS or set(args) != set(TIMER_OPS[op]):
+                error = "Unknown timer operation"
+            else:
+                try:
+                    await self._run_timer_op(t, op, args, forwarded=True)
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+        await self.relay.publish(TIMER_TOPIC, {"type": "ack", "payload": {"id": payload.get("id"), "error": error}})
+
+    async def _host_existing(self, tid: str, name: str) -> None:
+        db = await open_database(self._settings, tid, maintenance=self._maintenance)
+        if tid in self._tournaments:  # raced with another announcement
+            await db.close()
+            return
+        await self._host(tid, name, db)
+
+    async def _host(self, tid: str, name: str, db: Database) -> Tournament:
+        bus = EventBus()
+        if self.relay is not None:
+            bus.attach(self.relay, tid)
+            read_model(db).attach(self.relay, ROSTER_TOPIC + tid)
+        timer = TimerService(
+            conn=db,
+            bus=bus,
+            scheduler=self.scheduler,
+            persist_max_staleness_ms=self._settings.state_max_staleness_ms,
+        )
+        t = Tournament(id=tid, name=name, db=db, bus=bus, timer=timer)
+        if self.is_leader:
+            await self._drive(t)
+        else:
+            self._mirror(t)
+        self._tournaments[tid] = t
+        return t
+
+    async def _drive(self, t: Tournament) -> None:
+        await t.timer.load()
+        await t.timer.start()
+
+    def _mirror(self, t: Tournament) -> None:
+        async def follow() -> None:
+            # Settings events published before we got here are only in the
+            # database; anything delivered while we read it is replayed.
+            seq = t.bus.last_seq
+            await reload_settings(t.db)
+            async for ev in t.bus.subscribe(after=seq):
+                if ev.type == "settings":
+                    adopt_settings(t.db, ev.payload["settings"], ev.payload["version"])
+                elif ev.type == RESYNC:
+                    await reload_settings(t.db)
+
+        self._mirrors[t.id] = asyncio.create_task(follow())
+
+    async def _campaign(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.leader_poll_ms / 1000)
+            if self.is_leader:
+                if not await self.election.still_held():
+                    await self._step_down()
+            elif await self.election.try_acquire():
+                await self._take_over()
+
+    async def _take_over(self) -> None:
+        # The old leader is gone: pick the clocks up from what it persisted.
+        self.is_leader = True
+        for task in self._mirrors.values():
+            task.cancel()
+        self._mirrors.clear()
+        for t in self.all():
+            await reload_settings(t.db)
+            await self._drive(t)
+        await self.scheduler.start()
+
+    async def _step_down(self) -> None:
+        # Lost the lock (e.g. the database connection dropped), so another
+        # process may lead already: stop driving at once, without persisting.
+        self.is_leader = False
+        await self.scheduler.stop()
+        for t in self.all():
+            self.scheduler.remove(t.timer)
+            self._mirror(t)
+
+    async def close(self) -> None:
+        if self._campaign_task is not None:
+            self._campaign_task.cancel()
+        for task in [*self._tasks, *self._mirrors.values()]:
+            task.cancel()
+        await self.scheduler.stop()
+        for t in self._tournaments.values():
+            if self.is_leader:
+                await t.timer.stop()
+            await t.db.close()
+        self._tournaments.clear()
+        if self.relay is not None:
+            await self.relay.close()
+        if self.election is not None:
+            await self.election.release()
+
+
+def get_tournament(conn: HTTPConnection) -> Tournament:
+    """Resolve the tournament addressed by a request (or the default one)."""
+    registry: TournamentRegistry = conn.app.state.tournaments
+    tid = conn.path_params.get("tournament_id", DEFAULT_TOURNAMENT_ID)
+    t = registry.get(tid)
+    if t is None:
+        raise HTTPException(404, "Tournament not found")
+    return t
+
+
+async def control_timer(conn: HTTPConnection, op: str, **args: Any) -> None:
+    """Run a timer operation for the addressed tournament, wherever the timers are driven."""
+    registry: TournamentRegistry = conn.app.state.tournaments
+    await registry.control(get_tournament(conn), op, **args)
@@ -0,0 +1,133 @@
+"""
+WebSocket wire formats.
+
+Clients get JSON text frames unless they ask for the MessagePack subprotocol
+when connecting; then every server message is a binary MessagePack frame
+with the same {"type", "payload", "seq"} structure, and the client may send
+its own messages (ping, resume) either way.
+"""
+import json, struct
+from typing import Any
+
+import msgpack
+
+MSGPACK_SUBPROTOCOL = "spt.msgpack"
+
+class Hole:
+    """Marks where FrameTemplate fills in an integer per send (see HOLES)."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"HOLES[{self.index}]"
+
+# Placeholders for FrameTemplate's per-send integers.  They are objects that
+# neither encoder accepts, so they can't be confused with anything the
+# message itself contains.
+HOLES = (Hole(0), Hole(1))
+
+def encode_text(msg: Any) -> str:
+    return json.dumps(msg, ensure_ascii=False, separators=(",", ":"))
+
+def encode_binary(msg: Any) -> bytes:
+    return msgpack.packb(msg)
+
+def decode_binary(data: bytes) -> Any:
+    return msgpack.unpackb(data)
+
+class FrameTemplate:
+    """
+    A message encoded once (per format, on first use) with integer holes that
+    are spliced in on every send, e.g. the sender's clock reading.
+
+    `msg` contains some of HOLES, as dict values or list items; text() and
+    binary() take the value for HOLES[0], HOLES[1], ... in that order.  In
+    MessagePack each hole is written as a full uint64, which decoders accept
+    for any value.
+    """
+
+    __slots__ = ("_msg", "_text", "_binary")
+
+    def __init__(self, msg: Any) -> None:
+        self._msg = msg
+        self._text: tuple[list[str], list[int]] | None = None
+        self._binary: tuple[list[bytes], list[int]] | None = None
+
+    def text(self, *values: int) -> str:
+        if self._text is None:
+            self._text = _literals(_text_parts(self._msg), "")
+        parts, holes = self._text
+        out = [parts[0]]
+        for hole, part in zip(holes, parts[1:]):
+            out += (str(values[hole]), part)
+        return "".join(out)
+
+    def binary(self, *values: int) -> bytes:
+        if self._binary is None:
+            self._binary = _literals(_binary_parts(self._msg), b"")
+        parts, holes = self._binary
+        out = [parts[0]]
+        for hole, part in zip(holes, parts[1:]):
+            out += (b"\xcf" + struct.pack(">Q", values[hole]), part)
+        return b"".join(out)
+
+# The encoders reject holes, so a value they accept has none and is encoded in
+# one go; only the containers on the way to a hole are taken apart.
+
+def _text_parts(value: Any) -> list:
+    if isinstance(value, Hole):
+        return [value]
+    try:
+        return [encode_text(value)]
+    except TypeError:
+        if not isinstance(value, (dict, list, tuple)):
+            raise
+    if isinstance(value, dict):
+        parts: list = ["{"]
+        for i, (k, v) in enumerate(value.items()):
+            parts.append(("," if i else "") + encode_text(k) + ":")
+            parts += _text_parts(v)
+        parts.append("}")
+    else:
+        parts = ["["]
+        for i, v in enumerate(value):
+            if i:
+                parts.append(",")
+            parts += _text_parts(v)
+        parts.append("]")
+    return parts
+
+def _binary_parts(value: Any) -> list:
+    if isinstance(value, Hole):
+        return [value]
+    try:
+        return [encode_binary(value)]
+    except TypeError:
+        if not isinstance(value, (dict, list, tuple)):
+            raise
+    if isinstance(value, dict):
+        parts: list = [_packer.pack_map_header(len(value))]
+        for k, v in value.items():
+            parts.append(encode_binary(k))
+            parts += _binary_parts(v)
+    else:
+        parts = [_packer.pack_array_header(len(value))]
+        for v in value:
+            parts += _binary_parts(v)
+    return parts
+
+_packer = msgpack.Packer()
+
+def _literals(parts: list, empty):
+    """Encoded chunks and holes -> (literals between the holes, hole indices in order)."""
+    literals, holes = [empty], []
+    for part in parts:
+        if isinstance(part, Hole):
+            holes.append(part.index)
+            literals.append(empty)
+        else:
+            literals[-1] += part
+    return literals, holes
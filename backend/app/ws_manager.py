@@ -1,106 +1,256 @@
-import asyncio
-from typing import Set, Dict, Any
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from .db import Database, get_settings, get_state
-from .events import EventBus
+import asyncio, json
+from typing import Set, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from .clock import ClockBeacon
+from .db import Database, get_settings_snapshot, get_state
+from .events import Event, EventBus, RESYNC
+from .tournaments import get_tournament
 from .utils import now_ms
+from .wire import MSGPACK_SUBPROTOCOL, decode_binary, encode_binary, encode_text
 
 router = APIRouter()
 
-class WSManager:
-    def __init__(self) -> None:
-        self._clients: Set[WebSocket] = set()
-        self._lock = asyncio.Lock()
+# How long a connection opened with ?resume=1 waits for the client's `resume`
+# message before sending the snapshot anyway
+RESUME_WAIT_S = 0.25
 
-    async def connect(self, ws: WebSocket) -> None:
-        await ws.accept()
-        async with self._lock:
-            self._clients.add(ws)
+# Longest one frame may take to be accepted by a client's connection before
+# the client is evicted (stalled reader or half-open socket)
+SEND_TIMEOUT_S = 5.0
 
-    async def disconnect(self, ws: WebSocket) -> None:
-        async with self._lock:
-            self._clients.discard(ws)
+# A client silent for LIVENESS_INTERVAL_S is asked to answer (clients reply
+# with a ping) and evicted if it is still silent LIVENESS_TIMEOUT_S later.
+# Done at the application level: ASGI exposes no protocol pings, and a
+# reverse proxy would answer those on the client's behalf anyway.
+LIVENESS_INTERVAL_S = 15.0
+LIVENESS_TIMEOUT_S = 10.0
 
-    async def broadcast(self, msg: Dict[str, Any]) -> None:
-        async with self._lock:
-            clients = list(self._clients)
+class ClientEvicted(Exception):
+    pass
 
-        dead: list[WebSocket] = []
-        for ws in clients:
-            try:
-                await ws.send_json(msg)
-            except Exception:
-                dead.append(ws)
+class ClientConnection:
+    """
+    The writer for one WebSocket client.  Every frame for the client goes
+    through send(), one at a time and each with a deadline; a client that
+    misses a deadline is evicted, and no other client waits on it.
+    """
 
-        if dead:
+    def __init__(self, ws: WebSocket, *, binary: bool) -> None:
+        self.ws = ws
+        self.binary = binary
+        self.last_received_ms = now_ms()
+        self.evicted: Optional[str] = None
+        self._lock = asyncio.Lock()
+
+    async def send(self, frame: str | bytes) -> None:
+        if self.evicted:
+            raise ClientEvicted(self.evicted)
+        try:
             async with self._lock:
-                for ws in dead:
-                    self._clients.discard(ws)
+                await asyncio.wait_for(self._write(frame), SEND_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            self.evict("send timeout")
+            raise ClientEvicted(self.evicted)
+
+    async def _write(self, frame: str | bytes) -> None:
+        if isinstance(frame, bytes):
+            await self.ws.send_bytes(frame)
+        else:
+            await self.ws.send_text(frame)
+
+    async def send_message(self, msg: Dict[str, Any]) -> None:
+        await self.send(encode_binary(msg) if self.binary else encode_text(msg))
+
+    async def send_event(self, ev: Event) -> None:
+        await self.send(ev.packed if self.binary else ev.frame)
+
+    async def receive_message(self) -> Any:
+        message = await self.ws.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        self.last_received_ms = now_ms()
+        if message.get("bytes") is not None:
+            return decode_binary(message["bytes"])
+        return json.loads(message["text"])
+
+    def evict(self, reason: str) -> None:
+        if self.evicted is None:
+            self.evicted = reason
+            ws_manager.evicted += 1
+
+    async def close(self) -> None:
+        """Close an evicted client's socket, without waiting long on a stalled peer."""
+        try:
+            await asyncio.wait_for(self.ws.close(code=1011, reason=self.evicted), SEND_TIMEOUT_S)
+        except Exception:
+            pass
+
+class WSManager:
+    def __init__(self) -> None:
+        self._clients: Set[ClientConnection] = set()
+        self.evicted = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def connect(self, ws: WebSocket, subprotocol: Optional[str] = None) -> ClientConnection:
+        await ws.accept(subprotocol=subprotocol)
+        client = ClientConnection(ws, binary=subprotocol == MSGPACK_SUBPROTOCOL)
+        self._clients.add(client)
+        return client
+
+    def disconnect(self, client: ClientConnection) -> None:
+        self._clients.discard(client)
 
 ws_manager = WSManager()
 
 @router.websocket("")
 async def websocket_endpoint(ws: WebSocket):
-    await ws_manager.connect(ws)
+    try:
+        tournament = get_tournament(ws)
+    except HTTPException:
+        await ws.close(code=4404)
+        return
+
+    # Clients opt in to MessagePack frames by offering the subprotocol.
+    binary = MSGPACK_SUBPROTOCOL in ws.scope.get("subprotocols", [])
+    client = await ws_manager.connect(ws, subprotocol=MSGPACK_SUBPROTOCOL if binary else None)
 
-    conn: Database = ws.app.state.db
-    event_bus: EventBus = ws.app.state.bus
+    conn: Database = tournament.db
+    event_bus: EventBus = tournament.bus
+    clock_beacon: ClockBeacon = ws.app.state.clock_beacon
 
     async def send_initial_state():
-        settings = await get_settings(conn)
+        snap = event_bus.snapshot_frame(binary=binary)
+        if snap is not None:
+            seq, frame = snap
+            await client.send(frame)
+            return seq
+        seq = event_bus.last_seq  # before the reads: later events follow the snapshot
+        settings = await get_settings_snapshot(conn)
         state = await get_state(conn)  # should include server_time_ms + finish_at_server_ms OR remaining_ms
-        await ws.send_json({"type": "state", "payload": {"settings": settings, "state": state}})
+        await client.send_message({
+            "type": "state",
+            "payload": {"settings": settings.raw, "state": {**state, "settings_version": settings.version}},
+            "seq": seq,
+            "epoch": event_bus.epoch,
+        })
+        return seq
+
+    async def handle_message(msg):
+        if not isinstance(msg, dict):
+            return
+        if msg.get("type") == "ping":
+            payload = msg.get("payload") or {}
+            client_send_ms = payload.get("client_send_ms")
+            # respond with server time; include the original client timestamp
+            await client.send_message({
+                "type": "pong",
+                "payload": {
+                    "client_send_ms": client_send_ms,
+                    "server_time_ms": now_ms(),
+                },
+            })
+        # (Optional later: client can request resync, etc.)
 
     async def recv_loop():
         """
         Client -> server messages (time sync ping).
         """
         while True:
-            msg = await ws.receive_json()
-            if not isinstance(msg, dict):
+            await handle_message(await client.receive_message())
+
+    async def liveness_loop():
+        """
+        Evict clients that have gone silent, e.g. a display whose network
+        vanished without closing the socket.
+        """
+        while True:
+            await asyncio.sleep(LIVENESS_INTERVAL_S)
+            if now_ms() - client.last_received_ms < LIVENESS_INTERVAL_S * 1000:
                 continue
-            if msg.get("type") == "ping":
-                payload = msg.get("payload") or {}
-                client_send_ms = payload.get("client_send_ms")
-                # respond with server time; include the original client timestamp
-                await ws.send_json({
-                    "type": "pong",
-                    "payload": {
-                        "client_send_ms": client_send_ms,
-                        "server_time_ms": now_ms(),
-                    },
-                })
-            # (Optional later: client can request resync, etc.)
-
-    async def send_loop():
+            asked_ms = now_ms()
+            await client.send_message({"type": "liveness", "payload": {}})
+            await asyncio.sleep(LIVENESS_TIMEOUT_S)
+            if client.last_received_ms < asked_ms:
+                client.evict("liveness timeout")
+                raise ClientEvicted(client.evicted)
+
+    async def beacon_loop():
+        """
+        Server clock beacons, so the client can follow our clock without pinging.
+        """
+        async for ev in clock_beacon.beats():
+            await client.send_event(ev)
+
+    async def send_loop(after: int):
         """
-        Server -> client events from bus.
+        Server -> client events from bus, starting after sequence number `after`.
         """
-        async for ev in event_bus.subscribe():
-            await ws.send_json({"type": ev.type, "payload": ev.payload})
+        async for ev in event_bus.subscribe(after=after):
+            if ev.type == RESYNC:
+                # fell behind the bus and missed events: start over from a snapshot
+                await send_initial_state()
+                continue
+            await client.send_event(ev)
+
+    def resume_point(msg) -> Optional[int]:
+        """Last seen sequence number from a valid `resume` message, else None."""
+        if not isinstance(msg, dict) or msg.get("type") != "resume":
+            return None
+        payload = msg.get("payload") or {}
+        last_seq = payload.get("last_seq")
+        if payload.get("epoch") != event_bus.epoch or not isinstance(last_seq, int):
+            return None
+        if not 0 <= last_seq <= event_bus.last_seq:
+            return None
+        return last_seq
 
     try:
-        # 1) initial snapshot
-        await send_initial_state()
+        # 1) a reconnecting client (?resume=1) says where it left off in its first
+        #    message; replay what it missed from the bus instead of a fresh
+        #    snapshot.  Everyone else gets the snapshot straight away.
+        first = None
+        if ws.query_params.get("resume") == "1":
+            try:
+                first = await asyncio.wait_for(client.receive_message(), RESUME_WAIT_S)
+            except asyncio.TimeoutError:
+                pass
+        after = resume_point(first)
+        if after is None:
+            after = await send_initial_state()
+        if first is not None:
+            await handle_message(first)
 
-        # 2) run send+recv concurrently; whichever ends first cancels the other
-        send_task = asyncio.create_task(send_loop())
-        recv_task = asyncio.create_task(recv_loop())
+        # 2) run send+recv (+beacons, liveness) concurrently; whichever ends first cancels the others
+        tasks = {
+            asyncio.create_task(send_loop(after)),
+            asyncio.create_task(recv_loop()),
+            asyncio.create_task(liveness_loop()),
+        }
+        if clock_beacon.enabled:
+            tasks.add(asyncio.create_task(beacon_loop()))
         done, pending = await asyncio.wait(
-            {send_task, recv_task},
+            tasks,
             return_when=asyncio.FIRST_EXCEPTION,
         )
         for t in pending:
             t.cancel()
-        for t in done:
-            # surface WS disconnects as normal exit
-            exc = t.exception()
-            if isinstance(exc, WebSocketDisconnect):
-                return
+        # A cancelled send to a closed socket may still end in an error;
+        # retrieve every outcome so none is reported as never retrieved.
+        await asyncio.gather(*pending, return_exceptions=True)
+        excs = [t.exception() for t in done]
+        # surface WS disconnects as normal exit
+        if any(isinstance(exc, (WebSocketDisconnect, ClientEvicted)) for exc in excs):
+            return
+        for exc in excs:
             if exc:
                 raise exc
 
-    except WebSocketDisconnect:
+    except (WebSocketDisconnect, ClientEvicted):
         pass
     finally:
-        await ws_manager.disconnect(ws)
\ No newline at end of file
+        ws_manager.disconnect(client)
+        if client.evicted:
+            await client.close()
\ No newline at end of file
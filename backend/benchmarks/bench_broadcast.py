@@ -0,0 +1,58 @@
+"""
+Encode cost per published event, by number of subscribers.
+
+Compares encoding the event once per subscriber (the old send_json path)
+with the shared pre-encoded Event.frame.  Uses a full `state` event, which
+carries the default settings blob.
+
+    cd backend
+    python -m benchmarks.bench_broadcast --subscribers 10 100 1000
+"""
+import argparse, json, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import DEFAULT_SETTINGS  # noqa: E402
+from app.events import Event  # noqa: E402
+
+
+def make_event() -> Event:
+    return Event("state", {
+        "state": {"current_level_index": 3, "running": True, "server_time_ms": 0, "finish_at_server_ms": 0},
+        "settings": DEFAULT_SETTINGS,
+    })
+
+
+def per_client(n: int, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        ev = make_event()
+        for _ in range(n):
+            json.dumps({"type": ev.type, "payload": ev.payload}, ensure_ascii=False, separators=(",", ":"))
+    return (time.perf_counter() - t0) / rounds
+
+
+def shared_frame(n: int, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        ev = make_event()
+        for _ in range(n):
+            ev.frame
+    return (time.perf_counter() - t0) / rounds
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subscribers", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+    size = len(make_event().frame)
+    print(f"state event frame: {size} bytes")
+    for n in args.subscribers:
+        a = per_client(n, args.rounds)
+        b = shared_frame(n, args.rounds)
+        print(f"{n:>5} subscribers | per-client {a * 1e3:8.3f} ms/publish | shared {b * 1e3:8.3f} ms/publish | {a / b:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Publish latency while clients connect and disconnect.
+
+Measures how long EventBus.publish() takes (await to return) while a pool of
+tasks keeps subscribing, reading one event and unsubscribing, i.e. a
+reconnect storm.  The same workload is run against a reference copy of the
+previous design (one asyncio.Lock shared by publish and subscribe, one queue
+per subscriber) for comparison.
+
+    cd backend
+    python -m benchmarks.bench_bus_churn --churners 50 500
+"""
+import argparse, asyncio, os, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.events import Event, EventBus  # noqa: E402
+
+
+class LockedQueueBus:
+    """The pre-ring-buffer EventBus, kept here only as a baseline."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[asyncio.Queue] = set()
+        self._lock = asyncio.Lock()
+
+    async def publish(self, event: Event) -> None:
+        async with self._lock:
+            for q in self._subscribers:
+                try:
+                    q.put_nowait(event)
+                except asyncio.QueueFull:
+                    pass
+
+    async def subscribe(self):
+        q: asyncio.Queue = asyncio.Queue(maxsize=200)
+        async with self._lock:
+            self._subscribers.add(q)
+        try:
+            while True:
+                yield await q.get()
+        finally:
+            async with self._lock:
+                self._subscribers.discard(q)
+
+
+async def churn(bus, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        sub = bus.subscribe()
+        try:
+            await asyncio.wait_for(sub.__anext__(), 0.01)
+        except asyncio.TimeoutError:
+            pass
+        await sub.aclose()
+        await asyncio.sleep(0)
+
+
+async def measure(bus, churners: int, publishes: int) -> list[float]:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(churn(bus, stop)) for _ in range(churners)]
+    await asyncio.sleep(0.05)
+    lat: list[float] = []
+    for i in range(publishes):
+        t0 = time.perf_counter()
+        await bus.publish(Event("sound", {"cue": "five", "play_id": i}))
+        lat.append((time.perf_counter() - t0) * 1e6)
+        await asyncio.sleep(0.001)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return lat
+
+
+def report(name: str, lat: list[float]) -> None:
+    q = statistics.quantiles(lat, n=100)
+    print(f"  {name:<16} p50 {q[49]:8.1f} us | p99 {q[98]:8.1f} us | max {max(lat):8.1f} us")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--churners", type=int, nargs="+", default=[50, 500])
+    ap.add_argument("--publishes", type=int, default=500)
+    args = ap.parse_args()
+    for n in args.churners:
+        print(f"{n} connect/disconnect loops:")
+        report("locked queues", asyncio.run(measure(LockedQueueBus(), n, args.publishes)))
+        report("ring, lock-free", asyncio.run(measure(EventBus(), n, args.publishes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Time to first frame when many WebSocket clients connect at once.
+
+Starts the app under uvicorn in a subprocess (on a throwaway SQLite database),
+opens --clients WebSockets simultaneously, and reports how long each one
+waited from the start of its connect until the initial `state` frame arrived.
+Like the frontend on a first connect, clients send nothing: without
+`?resume=1` the server sends the snapshot as soon as the socket is open, and
+the clock beacons that follow replace the pings clients used to send.
+
+    cd backend
+    python -m benchmarks.bench_connect_storm --clients 1000
+"""
+import argparse, asyncio, os, socket, statistics, subprocess, sys, tempfile, time
+import urllib.request
+
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["DATABASE_PATH"] = os.path.join(workdir, "app.db")
+    env["SOUNDS_DIR"] = os.path.join(workdir, "sounds")
+    os.makedirs(env["SOUNDS_DIR"], exist_ok=True)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/state", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def client(url: str, start: asyncio.Event) -> float:
+    await start.wait()
+    t0 = time.perf_counter()
+    async with websockets.connect(url, open_timeout=60, max_size=None) as ws:
+        while True:
+            msg = await ws.recv()
+            if msg.startswith('{"type":"state"'):
+                return (time.perf_counter() - t0) * 1000
+
+
+async def storm(url: str, clients: int) -> list[float]:
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(client(url, start)) for _ in range(clients)]
+    await asyncio.sleep(0.1)
+    start.set()
+    return await asyncio.gather(*tasks)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=1000)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = start_server(port, workdir)
+        try:
+            url = f"ws://127.0.0.1:{port}/ws"
+            for r in range(args.rounds):
+                lat = asyncio.run(storm(url, args.clients))
+                q = statistics.quantiles(lat, n=100)
+                print(
+                    f"round {r + 1}: {args.clients} clients | p50 {q[49]:7.1f} ms | "
+                    f"p90 {q[89]:7.1f} ms | p99 {q[98]:7.1f} ms | max {max(lat):7.1f} ms"
+                )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Roster and seat lookup latency with and without the migration 2 indexes.
+
+Builds a SQLite database with --players players seated at 9-seat tables,
+once at schema version 1 (no secondary indexes) and once fully migrated,
+then times the lookups the API issues: a player's seat (move/unseat/delete),
+the active-player list and roster listing, and the seat listing.
+
+    cd backend
+    python -m benchmarks.bench_indexes --players 5000
+"""
+import argparse, asyncio, os, statistics, sys, tempfile, time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import migrations  # noqa: E402
+from app.db import SqliteDatabase  # noqa: E402
+from app.seating import get_assignments, list_active_players  # noqa: E402
+
+SEATS_PER_TABLE = 9
+
+
+async def populate(db: SqliteDatabase, players: int) -> None:
+    await db.executemany(
+        "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, ?)",
+        [(f"p{i}", f"Player {i}", int(i % 10 == 0), i) for i in range(players)],
+    )
+    tables = -(-players // SEATS_PER_TABLE)
+    await db.executemany(
+        "INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, ?, 1, ?)",
+        [(f"t{i}", f"Table {i}", SEATS_PER_TABLE, i) for i in range(tables)],
+    )
+    await db.executemany(
+        "INSERT INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, ?)",
+        [
+            (f"t{i // SEATS_PER_TABLE}", i % SEATS_PER_TABLE + 1, f"p{i}" if i < players else None)
+            for i in range(tables * SEATS_PER_TABLE)
+        ],
+    )
+    await db.commit()
+
+
+async def timed(fn, rounds: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def measure(path: str, players: int, rounds: int) -> dict[str, float]:
+    db = await SqliteDatabase.connect(path, read_connections=0, checkpoint_interval_ms=0)
+    try:
+        await populate(db, players)
+        step = max(1, players // rounds)
+        ids = iter(f"p{(i * step) % players}" for i in range(rounds))
+        return {
+            "seat of player": await timed(
+                lambda: db.fetchone("SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?", (next(ids),)),
+                rounds,
+            ),
+            "active players": await timed(lambda: list_active_players(db), max(1, rounds // 20)),
+            "roster, first 50": await timed(
+                lambda: db.fetchall("SELECT id, name, eliminated FROM players ORDER BY eliminated ASC, created_at_ms DESC LIMIT 50"),
+                rounds,
+            ),
+            "seat listing": await timed(lambda: get_assignments(db), max(1, rounds // 20)),
+        }
+    finally:
+        await db.close()
+
+
+async def run(players: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        with mock.patch.object(migrations, "MIGRATIONS", migrations.MIGRATIONS[:1]):
+            before = await measure(os.path.join(tmp, "before.db"), players, rounds)
+        after = await measure(os.path.join(tmp, "after.db"), players, rounds)
+    print(f"{players} players, median per query")
+    for name in before:
+        print(f"  {name:16} {before[name]:8.3f} ms -> {after[name]:8.3f} ms ({before[name] / after[name]:5.1f}x)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=5000)
+    ap.add_argument("--rounds", type=int, default=500)
+    args = ap.parse_args()
+    asyncio.run(run(args.players, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
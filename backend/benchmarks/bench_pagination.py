@@ -0,0 +1,95 @@
+"""
+Roster and announcement listing: everything at once vs keyset pages.
+
+Fills a SQLite database with --players players and --announcements seating
+announcements (each carrying a full list of seat changes, like a randomize),
+then times the old unpaginated roster query and the old `?limit=` listing
+against the first, middle and last page of GET /players and the first
+page of GET /announcements, and reports the response sizes.
+
+    cd backend
+    python -m benchmarks.bench_pagination --players 10000
+"""
+import argparse, asyncio, json, os, statistics, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api import _load_players  # noqa: E402
+from app.db import SqliteDatabase, decode_cursor, list_announcements  # noqa: E402
+
+PAGE = 100
+
+
+async def timed(fn, rounds: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def populate(db: SqliteDatabase, players: int, announcements: int) -> None:
+    await db.executemany(
+        "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, ?)",
+        [(f"p{i}", f"Player {i}", int(i % 10 == 0), i) for i in range(players)],
+    )
+    changes = [{"player_id": f"p{i}", "to_table": f"t{i // 9}", "to_seat": i % 9 + 1} for i in range(min(players, 300))]
+    await db.executemany(
+        "INSERT INTO announcements (created_at_ms, type, payload_json) VALUES (?, 'randomize', ?)",
+        [(i, json.dumps({"changes": changes})) for i in range(announcements)],
+    )
+    await db.commit()
+
+
+async def page_cursors(load) -> list:
+    """The cursor that starts each page, walking the whole listing once."""
+    cursors = [None]
+    while (page := await load(cursors[-1]))["next_cursor"] is not None:
+        cursors.append(page["next_cursor"])
+    return cursors
+
+
+async def run(players: int, announcements: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = await SqliteDatabase.connect(os.path.join(tmp, "t.db"), read_connections=0, checkpoint_interval_ms=0)
+        try:
+            await populate(db, players, announcements)
+
+            async def roster_page(cursor):
+                after = decode_cursor(cursor, (int, int, str)) if cursor else None
+                return await _load_players(db, None, None, PAGE, after)
+
+            async def all_players():
+                return await db.fetchall("SELECT id, name, eliminated FROM players ORDER BY eliminated ASC, created_at_ms DESC")
+
+            size = lambda obj: len(json.dumps(obj, separators=(",", ":")))
+            print(f"{players} players, {announcements} announcements; median ms per request, page size {PAGE}")
+
+            cursors = await page_cursors(roster_page)
+            everything = [dict(r) for r in await all_players()]
+            print(f"  players, unpaginated   {await timed(all_players, rounds):8.3f} ms  {size(everything):>9} bytes")
+            for label, cursor in (("first", cursors[0]), ("middle", cursors[len(cursors) // 2]), ("last", cursors[-1])):
+                ms = await timed(lambda: roster_page(cursor), rounds)
+                print(f"  players, {label:6} page    {ms:8.3f} ms  {size(await roster_page(cursor)):>9} bytes")
+
+            old = lambda: list_announcements(db, limit=announcements)
+            print(f"  announcements, ?limit={announcements:<5}{await timed(old, rounds):6.3f} ms  {size(await old()):>9} bytes")
+            first = lambda: list_announcements(db, limit=PAGE)
+            print(f"  announcements, first page {await timed(first, rounds):6.3f} ms  {size(await first()):>9} bytes")
+        finally:
+            await db.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=10_000)
+    ap.add_argument("--announcements", type=int, default=1000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+    asyncio.run(run(args.players, args.announcements, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Player name search on a large registration list.
+
+Fills a SQLite database with --players generated names and times, per query
+string, the old roster filter (LOWER(name) LIKE '%q%', a full scan) against
+the trigram-indexed filter now behind GET /players?q=, and the autocomplete
+query behind GET /players/search (first 10 results).
+
+    cd backend
+    python -m benchmarks.bench_player_search --players 10000
+"""
+import argparse, asyncio, os, random, statistics, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import SqliteDatabase, player_name_filter, search_players  # noqa: E402
+
+FIRST = ["Anna", "Ben", "Carla", "Dmitri", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+         "Kofi", "Lena", "Marco", "Nadia", "Oskar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST = ["Smith", "Nguyen", "Garcia", "Muller", "Rossi", "Kowalski", "Okafor", "Tanaka", "Silva",
+        "Johansson", "Dubois", "Haddad", "Petrov", "Larsen", "Moreau", "Costa", "Novak", "Sato"]
+QUERIES = ["an", "ann", "smith", "ina jo", "zzz"]
+
+
+async def timed(fn, rounds: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def run(players: int, rounds: int) -> None:
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = await SqliteDatabase.connect(os.path.join(tmp, "t.db"), read_connections=0, checkpoint_interval_ms=0)
+        try:
+            await db.executemany(
+                "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)",
+                [(f"p{i}", f"{rng.choice(FIRST)} {rng.choice(LAST)} {i}", i) for i in range(players)],
+            )
+            await db.commit()
+
+            def roster(where: str, params: list):
+                return lambda: db.fetchall(
+                    f"SELECT id, name, eliminated FROM players WHERE {where} ORDER BY eliminated ASC, created_at_ms DESC",
+                    tuple(params),
+                )
+
+            print(f"{players} players, median ms per query")
+            print(f"  {'query':8} {'matches':>8} {'LIKE scan':>10} {'indexed':>9} {'autocomplete':>13}")
+            for q in QUERIES:
+                matches = len(await roster(*player_name_filter(db, q))())
+                scan = await timed(roster("LOWER(name) LIKE ?", [f"%{q.lower()}%"]), rounds)
+                indexed = await timed(roster(*player_name_filter(db, q)), rounds)
+                complete = await timed(lambda: search_players(db, q, 10), rounds)
+                print(f"  {q!r:8} {matches:8} {scan:10.3f} {indexed:9.3f} {complete:13.3f}")
+        finally:
+            await db.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=10_000)
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+    asyncio.run(run(args.players, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
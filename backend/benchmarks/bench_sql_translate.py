@@ -0,0 +1,51 @@
+"""
+Per-query overhead of translating SQLite-flavored SQL for PostgreSQL.
+
+Runs the statements the timer and seating code issue most often through the
+uncached regex translation and through the memoized _to_pg().  (The other half
+of the change, prepared-statement reuse on each asyncpg connection, needs a
+live server and isn't measured here.)
+
+    cd backend
+    python -m benchmarks.bench_sql_translate
+"""
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import _to_pg, _translate_sql  # noqa: E402
+
+STATEMENTS = [
+    ("UPDATE tourney_state SET current_level_index=?, remaining_ms=?, finish_at_server_ms=?, running=?, updated_at_ms=? WHERE id=1",
+     (3, 1000, 0, 1, 0)),
+    ("UPDATE seat_assignments SET player_id=? WHERE table_id=? AND seat_num=?", ("p", "t", 3)),
+    ("INSERT OR IGNORE INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, NULL)", ("t", 3)),
+    ("SELECT table_id, seat_num FROM seat_assignments WHERE player_id=?", ("p",)),
+    ("INSERT INTO announcements (created_at_ms, type, payload_json) VALUES (?, ?, ?) RETURNING id", (0, "x", "{}")),
+]
+
+
+def uncached(sql: str, params: tuple) -> tuple[str, list]:
+    return _translate_sql.__wrapped__(sql), list(params)
+
+
+def bench(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for sql, params in STATEMENTS:
+            fn(sql, params)
+    return (time.perf_counter() - t0) / (rounds * len(STATEMENTS))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20_000)
+    args = ap.parse_args()
+    before = bench(uncached, args.rounds)
+    after = bench(_to_pg, args.rounds)
+    print(f"regex every call: {before * 1e6:6.2f} us/query")
+    print(f"memoized:         {after * 1e6:6.2f} us/query ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
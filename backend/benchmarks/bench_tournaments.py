@@ -0,0 +1,74 @@
+"""
+CPU and memory cost per hosted tournament.
+
+Opens N tournaments in a temporary directory, starts every clock, lets the
+shared TimerScheduler drive them for a while and reports process CPU time and
+resident memory divided by N.
+
+    cd backend
+    python -m benchmarks.bench_tournaments --counts 10 100 300 --seconds 10
+"""
+import argparse, asyncio, os, resource, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.settings import AppSettings  # noqa: E402
+from app.tournaments import TournamentRegistry  # noqa: E402
+
+
+def rss_kib() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def cpu_s() -> float:
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    return ru.ru_utime + ru.ru_stime
+
+
+async def run(count: int, seconds: float, staleness_ms: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = AppSettings(
+            database_path=os.path.join(tmp, "app.db"),
+            database_dsn=None,
+            tournaments_dir=tmp,
+            state_max_staleness_ms=staleness_ms,
+            event_bus="local",
+        )
+        registry = TournamentRegistry(settings)
+        await registry.open()
+        rss_before = rss_kib()
+        for i in range(count - 1):
+            await registry.create(f"Flight {i}")
+        for t in registry.all():
+            await t.timer.resume()
+        rss_after = rss_kib()
+
+        cpu0, wall0 = cpu_s(), time.perf_counter()
+        await asyncio.sleep(seconds)
+        cpu = cpu_s() - cpu0
+        wall = time.perf_counter() - wall0
+        await registry.close()
+
+    print(
+        f"{count:>5} tournaments | "
+        f"CPU {100 * cpu / wall:6.2f}% total, {1000 * cpu / wall / count:7.3f} ms/s each | "
+        f"RSS {(rss_after - rss_before) / max(1, count - 1):8.1f} KiB each"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--counts", type=int, nargs="+", default=[10, 100, 300])
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--staleness-ms", type=int, default=60_000)
+    args = ap.parse_args()
+    for n in args.counts:
+        asyncio.run(run(n, args.seconds, args.staleness_ms))
+
+
+if __name__ == "__main__":
+    main()
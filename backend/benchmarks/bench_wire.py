@@ -0,0 +1,64 @@
+"""
+Bytes on the wire and server encode time per message, JSON vs MessagePack.
+
+Covers the messages a display actually receives: the connect snapshot
+(default settings), a settings change, a timer `state` delta, a sound cue and
+the pong answering each time-sync ping.
+
+    cd backend
+    python -m benchmarks.bench_wire --rounds 20000
+"""
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import DEFAULT_SETTINGS  # noqa: E402
+from app.wire import encode_binary, encode_text  # noqa: E402
+
+NOW = 1_790_000_000_000
+
+MESSAGES = {
+    "snapshot": {
+        "type": "state",
+        "payload": {
+            "state": {"current_level_index": 3, "running": True, "server_time_ms": NOW,
+                      "finish_at_server_ms": NOW + 600_000, "settings_version": 1},
+            "settings": DEFAULT_SETTINGS,
+        },
+        "epoch": "a1b2c3d4",
+        "seq": 1234,
+    },
+    "settings": {"type": "settings", "payload": {"version": 2, "settings": DEFAULT_SETTINGS}, "seq": 1235},
+    "state delta": {
+        "type": "state",
+        "payload": {"state": {"current_level_index": 3, "running": True, "server_time_ms": NOW,
+                              "finish_at_server_ms": NOW + 660_000, "settings_version": 2}},
+        "seq": 1236,
+    },
+    "sound": {"type": "sound", "payload": {"file": "half.mp3", "play_id": 17}, "seq": 1237},
+    "pong": {"type": "pong", "payload": {"client_send_ms": NOW - 40, "server_time_ms": NOW}},
+}
+
+
+def encode_us(encode, msg, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        encode(msg)
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20000)
+    args = ap.parse_args()
+    print(f"  {'message':<12} {'json B':>7} {'msgpack B':>10} {'json us':>8} {'msgpack us':>11}")
+    for name, msg in MESSAGES.items():
+        text, packed = encode_text(msg), encode_binary(msg)
+        print(
+            f"  {name:<12} {len(text.encode()):>7} {len(packed):>10} "
+            f"{encode_us(encode_text, msg, args.rounds):>8.2f} {encode_us(encode_binary, msg, args.rounds):>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
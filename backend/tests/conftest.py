@@ -0,0 +1,25 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+from app.db import SqliteDatabase
+
+
+@pytest.fixture
+def run_with_db(tmp_path) -> Callable[..., Any]:
+    """
+    run_with_db(test, **connect_kwargs) runs `await test(db)` in a fresh event
+    loop against a new SQLite database under tmp_path, and closes it afterwards.
+    """
+    def run(test: Callable[[SqliteDatabase], Awaitable[Any]], **connect_kwargs: Any) -> Any:
+        async def main() -> Any:
+            db = await SqliteDatabase.connect(str(tmp_path / "t.db"), **connect_kwargs)
+            try:
+                return await test(db)
+            finally:
+                await db.close()
+
+        return asyncio.run(main())
+
+    return run
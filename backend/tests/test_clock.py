@@ -0,0 +1,38 @@
+import asyncio
+
+from app.clock import ClockBeacon
+
+
+def test_beacon_shares_one_frame_per_beat() -> None:
+    async def run() -> None:
+        beacon = ClockBeacon(interval_ms=10)
+        got: list[list] = [[], []]
+
+        async def listen(i: int) -> None:
+            async for ev in beacon.beats():
+                got[i].append(ev)
+                if len(got[i]) == 2:
+                    return
+
+        tasks = [asyncio.create_task(listen(i)) for i in range(2)]
+        await asyncio.sleep(0)
+        await beacon.start()
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        finally:
+            await beacon.stop()
+
+        assert got[0][0] is got[1][0]
+        assert got[0][0].type == "clock" and got[0][0].payload["interval_ms"] == 10
+        assert got[0][1].payload["server_time_ms"] >= got[0][0].payload["server_time_ms"]
+
+    asyncio.run(run())
+
+
+def test_zero_interval_disables_the_beacon() -> None:
+    async def run() -> None:
+        beacon = ClockBeacon(interval_ms=0)
+        await beacon.start()
+        assert not beacon.enabled and beacon._task is None
+
+    asyncio.run(run())
@@ -0,0 +1,403 @@
+import asyncio, os
+
+import pytest
+
+from app.api import _load_players
+from app.db import (
+    SqliteDatabase,
+    SqliteMaintenance,
+    SqlitePragmas,
+    _to_pg,
+    _translate_sql,
+    add_announcement,
+    decode_cursor,
+    encode_cursor,
+    list_announcements,
+    search_players,
+)
+from app.events import EventBus
+from app.seating import get_assignments, normalize_seats, randomize_seating, rebalance
+
+
+def test_executemany_writes_every_row(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)",
+            [(f"p{i}", f"Player {i}", i) for i in range(50)],
+        )
+        await db.executemany("UPDATE players SET eliminated=1 WHERE id=?", [])
+        await db.commit()
+        row = await db.fetchone("SELECT COUNT(*) AS c FROM players")
+        assert row["c"] == 50
+
+    run_with_db(run)
+
+
+def test_randomize_seats_everyone(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)",
+            [(f"p{i}", f"Player {i}", i) for i in range(60)],
+        )
+        await db.executemany(
+            "INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, 9, 1, ?)",
+            [(f"t{i}", f"Table {i}", i) for i in range(8)],
+        )
+        await db.commit()
+
+        result = await randomize_seating(db, EventBus())
+        assert len(result["changes"]) == 60
+
+        seated = [a["player_id"] for a in await get_assignments(db) if a["player_id"]]
+        assert sorted(seated) == sorted(f"p{i}" for i in range(60))
+
+    run_with_db(run)
+
+
+def test_to_pg_translation_is_memoized() -> None:
+    sql = "INSERT OR IGNORE INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, NULL)"
+    pg_sql, params = _to_pg(sql, ("t1", 3))
+    assert pg_sql == (
+        "INSERT INTO seat_assignments (table_id, seat_num, player_id) VALUES ($1, $2, NULL) ON CONFLICT DO NOTHING"
+    )
+    assert params == ["t1", 3]
+
+    hits = _translate_sql.cache_info().hits
+    assert _to_pg(sql, ("t2", 4)) == (pg_sql, ["t2", 4])
+    assert _translate_sql.cache_info().hits == hits + 1
+
+
+def test_sqlite_reads_use_the_pool_outside_write_transactions(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES ('p1', 'Ann', 0, 1)")
+        # uncommitted: only the writer sees it, so the read must go there
+        assert (await db.fetchone("SELECT COUNT(*) AS c FROM players"))["c"] == 1
+        await db.commit()
+
+        rows = await asyncio.gather(*(db.fetchall("SELECT name FROM players") for _ in range(10)))
+        assert rows == [[{"name": "Ann"}]] * 10
+        assert 1 <= len(db._all_readers) <= 2
+        reader = db._all_readers[0]
+        cur = await reader.execute("PRAGMA cache_size")
+        assert (await cur.fetchone())[0] == -2000
+        cur = await reader.execute("PRAGMA query_only")
+        assert (await cur.fetchone())[0] == 1
+
+    run_with_db(run, pragmas=SqlitePragmas(cache_size=-2000), read_connections=2)
+
+
+def test_sqlite_checkpoint_truncates_the_wal(run_with_db) -> None:
+    async def run(db) -> None:
+        for i in range(100):
+            await db.execute("UPDATE tourney_state SET updated_at_ms=? WHERE id=1", (i,))
+            await db.commit()
+        assert os.path.getsize(db._path + "-wal") > 0
+        result = await db.checkpoint()
+        assert result["busy"] == 0
+        assert os.path.getsize(db._path + "-wal") == 0
+
+    run_with_db(run, checkpoint_interval_ms=0)
+
+
+def test_one_maintenance_task_looks_after_every_database(tmp_path) -> None:
+    async def run() -> None:
+        maintenance = SqliteMaintenance(interval_ms=20)
+        dbs = [await SqliteDatabase.connect(str(tmp_path / f"{i}.db"), maintenance=maintenance) for i in range(3)]
+        task = maintenance._task
+        try:
+            for db in dbs:
+                await db.execute("UPDATE tourney_state SET updated_at_ms=1 WHERE id=1")
+                await db.commit()
+                await db.fetchone("SELECT 1")
+                assert db._all_readers
+            # one pass sees the reads, the next closes the readers
+            await asyncio.sleep(0.15)
+            assert maintenance._task is task
+            assert all(os.path.getsize(db._path + "-wal") == 0 for db in dbs)
+            assert not any(db._all_readers for db in dbs)
+            assert (await dbs[0].fetchone("SELECT COUNT(*) AS c FROM players"))["c"] == 0
+        finally:
+            for db in dbs:
+                await db.close()
+        assert maintenance._task is None and task.done()
+
+    asyncio.run(run())
+
+
+def test_transaction_nests_and_commits_once(run_with_db) -> None:
+    async def run(db) -> None:
+        add = "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, 0)"
+        count = "SELECT COUNT(*) AS c FROM players"
+        committed: list[str] = []
+        async with db.transaction():
+            await db.execute(add, ("p1", "Ann"))
+            await db.commit()  # deferred to the end of the block
+            db.after_commit(lambda: committed.append("done"))
+            # other tasks don't see the uncommitted row, this one does
+            assert (await asyncio.create_task(db.fetchone(count)))["c"] == 0
+            assert (await db.fetchone(count))["c"] == 1
+            try:
+                async with db.transaction():
+                    await db.execute(add, ("p2", "Bob"))
+                    raise RuntimeError("undo the inner block only")
+            except RuntimeError:
+                pass
+            async with db.transaction():
+                await db.execute(add, ("p3", "Cy"))
+            assert committed == []
+        assert committed == ["done"]
+        names = await db.fetchall("SELECT id FROM players ORDER BY id")
+        assert [r["id"] for r in names] == ["p1", "p3"]
+
+    run_with_db(run)
+
+
+def test_failed_transaction_rolls_back_and_other_writers_wait(run_with_db) -> None:
+    async def run(db) -> None:
+        add = "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, 0)"
+        order: list[str] = []
+
+        async def other_writer() -> None:
+            await db.execute(add, ("p9", "Other"))
+            order.append("other wrote")
+            await db.commit()
+
+        try:
+            async with db.transaction():
+                await db.execute(add, ("p1", "Ann"))
+                task = asyncio.create_task(other_writer())
+                await asyncio.sleep(0.05)
+                order.append("block still open")
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        await task
+        assert order == ["block still open", "other wrote"]
+        names = await db.fetchall("SELECT id FROM players")
+        assert [r["id"] for r in names] == ["p9"]
+
+    run_with_db(run)
+
+
+def test_reads_without_a_pool_wait_for_open_transactions(run_with_db) -> None:
+    async def run(db) -> None:
+        count = "SELECT COUNT(*) AS c FROM players"
+        try:
+            async with db.transaction():
+                await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES ('p1', 'Ann', 0, 0)")
+                reader = asyncio.create_task(db.fetchone(count))
+                await asyncio.sleep(0.05)
+                assert not reader.done()
+                assert (await db.fetchone(count))["c"] == 1
+                raise RuntimeError("roll back")
+        except RuntimeError:
+            pass
+        # the rolled-back row was never visible outside the writing task
+        assert (await reader)["c"] == 0
+
+    run_with_db(run, read_connections=0)
+
+
+def test_rebalance_commits_once(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, ?)",
+            [(f"p{i}", f"Player {i}", int(i < 5), i) for i in range(30)],
+        )
+        await db.executemany(
+            "INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, 9, 1, ?)",
+            [(f"t{i}", f"Table {i}", i) for i in range(4)],
+        )
+        await db.commit()
+
+        commits = 0
+        real_commit = db._commit
+
+        async def counting_commit() -> None:
+            nonlocal commits
+            commits += 1
+            await real_commit()
+
+        db._commit = counting_commit
+        result = await rebalance(db, EventBus())
+        assert len(result["changes"]) == 25
+        assert commits == 1
+
+    run_with_db(run)
+
+
+def test_normalize_seats_reconciles_every_table(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES (?, ?, ?, 1, ?)",
+            [("a", "A", 3, 1), ("b", "B", 2, 2), ("c", "C", 4, 3)],
+        )
+        # a: a gap at seat 2; b: two seats too many, one occupied; c: none yet
+        await db.executemany(
+            "INSERT INTO seat_assignments (table_id, seat_num, player_id) VALUES (?, ?, ?)",
+            [("a", 1, "p1"), ("a", 3, None), ("b", 1, None), ("b", 2, "p2"), ("b", 3, "p3"), ("b", 4, None)],
+        )
+        await db.commit()
+
+        await normalize_seats(db)
+
+        seats = await db.fetchall("SELECT table_id, seat_num, player_id FROM seat_assignments ORDER BY table_id, seat_num")
+        assert [(s["table_id"], s["seat_num"], s["player_id"]) for s in seats] == [
+            ("a", 1, "p1"), ("a", 2, None), ("a", 3, None),
+            ("b", 1, None), ("b", 2, "p2"),
+            ("c", 1, None), ("c", 2, None), ("c", 3, None), ("c", 4, None),
+        ]
+
+    run_with_db(run)
+
+
+def test_player_search_follows_creates_renames_and_deletes(run_with_db) -> None:
+    async def run(db) -> None:
+        add = "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, 0)"
+        names = lambda rows: [r["name"] for r in rows]
+        await db.executemany(add, [
+            ("p1", "Anna Smith", 0),
+            ("p2", "Joanna Lee", 0),
+            ("p3", "Annabel Ng", 1),
+            ("p4", "Bob 100%_sure", 0),
+        ])
+        await db.commit()
+
+        # prefix matches first (active before eliminated), then substrings
+        assert names(await search_players(db, "ANN", 10)) == ["Anna Smith", "Annabel Ng", "Joanna Lee"]
+        assert names(await search_players(db, "ann", 2)) == ["Anna Smith", "Annabel Ng"]
+        # short queries skip the index but match the same way (no prefix matches here)
+        assert names(await search_players(db, "nn", 10)) == ["Anna Smith", "Joanna Lee", "Annabel Ng"]
+        # LIKE wildcards in the query are literal
+        assert names(await search_players(db, "%_", 10)) == ["Bob 100%_sure"]
+        assert await search_players(db, "a_n", 10) == []
+
+        await db.execute("UPDATE players SET name='Hannah Ott' WHERE id='p2'")
+        await db.execute("DELETE FROM players WHERE id='p1'")
+        await db.commit()
+        assert names(await search_players(db, "ann", 10)) == ["Annabel Ng", "Hannah Ott"]
+        assert names(await search_players(db, "joanna", 10)) == []
+
+    run_with_db(run)
+
+
+def test_roster_pages_resume_after_concurrent_inserts(run_with_db) -> None:
+    async def run(db) -> None:
+        add = "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, ?)"
+        # p2..p5 share a timestamp, so only the id tiebreak orders them
+        await db.executemany(add, [
+            ("p1", "A", 0, 100), ("p2", "B", 0, 200), ("p3", "C", 0, 200),
+            ("p4", "D", 0, 200), ("p5", "E", 0, 200), ("p6", "F", 1, 300), ("p7", "G", 1, 50),
+        ])
+        await db.commit()
+
+        seen: list[str] = []
+        after = None
+        while True:
+            page = await _load_players(db, None, None, 2, after)
+            seen += [p["id"] for p in page["items"]]
+            if page["next_cursor"] is None:
+                break
+            after = decode_cursor(page["next_cursor"], (int, int, str))
+            # a player joining mid-listing sorts before the cursor: no shifts, no repeats
+            await db.execute(add, (f"new{len(seen)}", "N", 0, 1000 + len(seen)))
+            await db.commit()
+        assert seen == ["p5", "p4", "p3", "p2", "p1", "p6", "p7"]
+
+    run_with_db(run)
+
+
+def test_roster_filters_unseated_players(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, 0, ?)",
+            [(f"p{i}", f"Player {i}", i) for i in range(5)],
+        )
+        await db.execute("INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES ('t1', 'T1', 9, 1, 0)")
+        await db.executemany(
+            "INSERT INTO seat_assignments (table_id, seat_num, player_id) VALUES ('t1', ?, ?)",
+            [(1, "p1"), (2, None), (3, "p3")],
+        )
+        await db.commit()
+
+        async def ids(unseated, limit=10, after=None) -> list[str]:
+            return [p["id"] for p in (await _load_players(db, None, None, limit, after, unseated=unseated))["items"]]
+
+        assert await ids(True) == ["p4", "p2", "p0"]
+        assert await ids(False) == ["p3", "p1"]
+        # Pages of unseated players page through unseated players only.
+        page = await _load_players(db, None, None, 2, None, unseated=True)
+        rest = await ids(True, after=decode_cursor(page["next_cursor"], (int, int, str)))
+        assert [p["id"] for p in page["items"]] + rest == ["p4", "p2", "p0"]
+
+    run_with_db(run)
+
+
+def test_player_names_stay_unique_on_create_and_rename(run_with_db) -> None:
+    from types import SimpleNamespace
+
+    from fastapi import HTTPException
+
+    from app.api import create_player, update_player
+
+    async def run(db) -> None:
+        tournament = SimpleNamespace(db=db)
+        request = SimpleNamespace(
+            app=SimpleNamespace(state=SimpleNamespace(tournaments=SimpleNamespace(get=lambda tid: tournament))),
+            path_params={},
+        )
+
+        async def status(call) -> int:
+            with pytest.raises(HTTPException) as e:
+                await call
+            return e.value.status_code
+
+        ada = (await create_player(request, {"name": "Ada Lovelace"}))["id"]
+        assert await status(create_player(request, {"name": " ada LOVELACE "})) == 409
+        byron = (await create_player(request, {"name": "Ada Byron"}))["id"]
+
+        assert await status(update_player(request, byron, {"name": "ADA LOVELACE"})) == 409
+        assert await status(update_player(request, byron, {"name": "  "})) == 400
+        await update_player(request, ada, {"name": "ada lovelace "})  # her own name, recased
+        rows = await db.fetchall("SELECT name FROM players ORDER BY name")
+        assert [r["name"] for r in rows] == ["Ada Byron", "ada lovelace"]
+
+        plan = await db.fetchall("EXPLAIN QUERY PLAN SELECT id FROM players WHERE lower(name) = lower(?)", ("x",))
+        assert "players_name_lower" in " ".join(r["detail"] for r in plan)
+
+    run_with_db(run)
+
+
+def test_seat_listing_carries_whether_the_player_is_eliminated(run_with_db) -> None:
+    async def run(db) -> None:
+        await db.executemany(
+            "INSERT INTO players (id, name, eliminated, created_at_ms) VALUES (?, ?, ?, 0)",
+            [("p1", "Ann", 0), ("p2", "Bob", 1)],
+        )
+        await db.execute("INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES ('t1', 'T1', 3, 1, 0)")
+        await db.executemany(
+            "INSERT INTO seat_assignments (table_id, seat_num, player_id) VALUES ('t1', ?, ?)",
+            [(1, "p1"), (2, "p2"), (3, None)],
+        )
+        await db.commit()
+        assert [a["player_eliminated"] for a in await get_assignments(db)] == [False, True, None]
+
+    run_with_db(run)
+
+
+def test_announcements_page_by_id(run_with_db) -> None:
+    async def run(db) -> None:
+        ids = [await add_announcement(db, created_at_ms=i, type="note", payload={"i": i}) for i in range(5)]
+        first = await list_announcements(db, limit=3)
+        assert [a["id"] for a in first] == ids[:1:-1]
+        rest = await list_announcements(db, limit=3, before_id=first[-1]["id"])
+        assert [a["id"] for a in rest] == ids[1::-1]
+
+    run_with_db(run)
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    assert decode_cursor(encode_cursor(0, 123, "p1"), (int, int, str)) == [0, 123, "p1"]
+    for bad in ["", "!!", encode_cursor(1), encode_cursor(True, 1, "p"), encode_cursor("0", 1, "p")]:
+        with pytest.raises(ValueError):
+            decode_cursor(bad, (int, int, str))
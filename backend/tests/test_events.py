@@ -0,0 +1,169 @@
+import asyncio
+import json
+
+from app.events import RESYNC, Event, EventBus
+
+
+def test_event_frame_is_encoded_once() -> None:
+    ev = Event("announcement", {"type": "level_change", "payload": {"name": "Zoë"}})
+    frame = ev.frame
+    assert ev.frame is frame
+    assert json.loads(frame) == {"type": "announcement", "payload": ev.payload}
+    assert "Zoë" in frame
+
+
+def test_subscribers_share_the_published_frame() -> None:
+    async def run() -> None:
+        bus = EventBus()
+        got: list[list[str]] = [[], []]
+
+        async def consume(i: int) -> None:
+            async for ev in bus.subscribe():
+                got[i].append(ev.frame)
+                return
+
+        tasks = [asyncio.create_task(consume(i)) for i in range(2)]
+        await asyncio.sleep(0)
+        ev = Event("sound", {"cue": "half"})
+        await bus.publish(ev)
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        assert got[0][0] is got[1][0] is ev.frame
+
+    asyncio.run(run())
+
+
+def test_lagging_subscriber_gets_latest_state_only() -> None:
+    async def run() -> None:
+        bus = EventBus()
+        sub = bus.subscribe()
+        first = asyncio.create_task(sub.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish(Event("state", {"n": 1}))
+        await bus.publish(Event("announcement", {"n": 2}))
+        await bus.publish(Event("state", {"n": 3}))
+
+        # state 1 was superseded before the subscriber got to it
+        got = [await first, await sub.__anext__()]
+        assert [(e.type, e.payload["n"]) for e in got] == [("announcement", 2), ("state", 3)]
+
+        await bus.publish(Event("state", {"n": 4}))
+        await bus.publish(Event("state", {"n": 5}))
+        assert (await sub.__anext__()).payload == {"n": 5}
+        assert bus.stats.coalesced == 2
+        await sub.aclose()
+        assert bus.subscriber_count == 0
+
+    asyncio.run(run())
+
+
+def test_subscriber_that_falls_off_the_ring_is_resynced() -> None:
+    async def run() -> None:
+        bus = EventBus(capacity=4)
+        sub = bus.subscribe()
+        first = asyncio.create_task(sub.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish(Event("sound", {"n": 0}))
+        assert (await first).payload == {"n": 0}
+
+        for n in range(1, 7):
+            await bus.publish(Event("sound", {"n": n}))
+        assert (await sub.__anext__()).type == RESYNC
+        assert bus.stats.resyncs == 1
+        assert bus.stats.dropped == 6
+
+        await bus.publish(Event("sound", {"n": 7}))
+        assert (await sub.__anext__()).payload == {"n": 7}
+        await sub.aclose()
+
+    asyncio.run(run())
+
+
+def test_subscribe_after_replays_from_the_ring() -> None:
+    async def run() -> None:
+        bus = EventBus(capacity=4)
+        for n in range(1, 4):
+            await bus.publish(Event("sound", {"n": n}))
+        assert bus.last_seq == 3
+
+        sub = bus.subscribe(after=1)
+        assert [(await sub.__anext__()).seq for _ in range(2)] == [2, 3]
+        await sub.aclose()
+
+        # Too old, or from the future (e.g. a previous process): resync.
+        for n in range(4, 8):
+            await bus.publish(Event("sound", {"n": n}))
+        for after in (1, 99):
+            sub = bus.subscribe(after=after)
+            assert (await sub.__anext__()).type == RESYNC
+            await sub.aclose()
+
+    asyncio.run(run())
+
+
+def test_snapshot_frame_is_built_once_per_state() -> None:
+    async def run() -> None:
+        bus = EventBus()
+        assert bus.snapshot_frame() is None
+
+        await bus.publish(Event("state", {"state": {"running": False, "server_time_ms": 1}, "settings": {}}))
+        await bus.publish(Event("sound", {"cue": "half"}))
+        seq, frame = bus.snapshot_frame()
+        assert seq == 2
+        msg = json.loads(frame)
+        assert msg["type"] == "state" and msg["seq"] == 2 and msg["epoch"] == bus.epoch
+        assert msg["payload"]["state"]["running"] is False
+        assert msg["payload"]["state"]["server_time_ms"] > 1
+
+        cached = bus._snapshot
+        bus.snapshot_frame()
+        assert bus._snapshot is cached
+
+        await bus.publish(Event("state", {"state": {"running": True}, "settings": {}}))
+        seq, frame = bus.snapshot_frame()
+        assert bus._snapshot is not cached
+        assert seq == 3 and json.loads(frame)["payload"]["state"]["running"] is True
+
+    asyncio.run(run())
+
+
+def test_lock_free_bus_delivers_like_the_locked_queue_bus() -> None:
+    from benchmarks.bench_bus_churn import LockedQueueBus, churn
+
+    async def deliveries(bus) -> list[int]:
+        got: list[int] = []
+        ready = asyncio.Event()
+
+        async def listen() -> None:
+            sub = bus.subscribe()
+            pending = asyncio.ensure_future(sub.__anext__())
+            ready.set()
+            ev = await pending
+            while True:
+                got.append(ev.payload["n"])
+                if ev.payload["n"] == 199:
+                    await sub.aclose()
+                    return
+                ev = await sub.__anext__()
+
+        listener = asyncio.create_task(listen())
+        await ready.wait()
+        await asyncio.sleep(0)
+        stop = asyncio.Event()
+        churners = [asyncio.create_task(churn(bus, stop)) for _ in range(20)]
+        for n in range(200):
+            await bus.publish(Event("sound", {"n": n}))
+            if n % 10 == 0:
+                await asyncio.sleep(0)
+        await asyncio.wait_for(listener, 2)
+        stop.set()
+        await asyncio.gather(*churners)
+        return got
+
+    async def run() -> None:
+        bus = EventBus()
+        assert await deliveries(bus) == await deliveries(LockedQueueBus()) == list(range(200))
+        assert bus.subscriber_count == 0
+
+    asyncio.run(run())
@@ -0,0 +1,167 @@
+import asyncio
+
+from app.db import get_settings_snapshot, get_state, set_settings
+from app.leader import FileLockElection
+from app.settings import AppSettings
+from app.tournaments import TournamentRegistry
+
+
+def test_file_lock_election_has_one_leader(tmp_path) -> None:
+    async def run() -> None:
+        path = str(tmp_path / "app.db.leader")
+        first, second = FileLockElection(path), FileLockElection(path)
+        assert await first.try_acquire()
+        assert not await second.try_acquire()
+        await first.release()
+        assert await second.try_acquire()
+        assert await second.still_held()
+        await second.release()
+
+    asyncio.run(run())
+
+
+def test_follower_forwards_timer_commands_and_takes_over(tmp_path) -> None:
+    settings = AppSettings(
+        database_path=str(tmp_path / "app.db"),
+        event_bus="shared",
+        bus_socket_path=str(tmp_path / "bus.sock"),
+        leader_poll_ms=50,
+    )
+
+    async def run() -> None:
+        leader, follower = TournamentRegistry(settings), TournamentRegistry(settings)
+        await leader.open()
+        await follower.open()
+        try:
+            assert leader.is_leader and not follower.is_leader
+            assert len(follower.scheduler) == 0
+
+            await follower.control(follower.default, "resume")
+            assert leader.default.timer.running
+            assert (await get_state(follower.default.db))["running"]
+
+            # Settings written by a follower are applied by the leader, and the
+            # leader's version comes back to the follower.
+            db = follower.default.db
+            raw = (await get_settings_snapshot(db)).raw
+            await set_settings(db, {**raw, "levels": raw["levels"][:3]})
+            await follower.control(follower.default, "apply_settings")
+            assert len((await get_settings_snapshot(leader.default.db)).levels) == 3
+            for _ in range(50):
+                if (await get_settings_snapshot(db)).version == (await get_settings_snapshot(leader.default.db)).version:
+                    break
+                await asyncio.sleep(0.01)
+            assert (await get_settings_snapshot(db)).version == (await get_settings_snapshot(leader.default.db)).version
+
+            await leader.close()
+            for _ in range(100):
+                # is_leader is set first; the clocks are loaded and scheduled after
+                if follower.is_leader and len(follower.scheduler):
+                    break
+                await asyncio.sleep(0.02)
+            assert follower.is_leader
+            assert follower.default.timer.running
+            assert len((await get_settings_snapshot(follower.default.db)).levels) == 3
+            await follower.control(follower.default, "pause")
+            assert not follower.default.timer.running
+        finally:
+            await follower.close()
+            await leader.close()
+
+    asyncio.run(run())
+
+
+def test_late_follower_serves_the_leaders_settings_version(tmp_path) -> None:
+    settings = AppSettings(
+        database_path=str(tmp_path / "app.db"),
+        event_bus="shared",
+        bus_socket_path=str(tmp_path / "bus.sock"),
+    )
+
+    async def version(registry: TournamentRegistry) -> int:
+        return (await get_settings_snapshot(registry.default.db)).version
+
+    async def run() -> None:
+        leader = TournamentRegistry(settings)
+        await leader.open()
+        follower = None
+        try:
+            # Changed before the follower exists: its settings event is long gone.
+            raw = (await get_settings_snapshot(leader.default.db)).raw
+            await set_settings(leader.default.db, {**raw, "levels": raw["levels"][:3]})
+            await leader.control(leader.default, "apply_settings")
+
+            follower = TournamentRegistry(settings)
+            await follower.open()
+            assert await version(follower) == await version(leader) == 2
+
+            # A change the follower missed (relay gap) is picked up on RESYNC.
+            await set_settings(leader.default.db, {**raw, "levels": raw["levels"][:2]})
+            follower.default.bus.mark_gap()
+            for _ in range(50):
+                if await version(follower) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            assert await version(follower) == 3
+            assert len((await get_settings_snapshot(follower.default.db)).levels) == 2
+        finally:
+            if follower is not None:
+                await follower.close()
+            await leader.close()
+
+    asyncio.run(run())
+
+
+def test_take_over_does_not_replay_passed_milestones(tmp_path) -> None:
+    settings = AppSettings(
+        database_path=str(tmp_path / "app.db"),
+        event_bus="shared",
+        bus_socket_path=str(tmp_path / "bus.sock"),
+        leader_poll_ms=50,
+    )
+
+    async def run() -> None:
+        leader, follower = TournamentRegistry(settings), TournamentRegistry(settings)
+        await leader.open()
+        await follower.open()
+        try:
+            cues: list[str] = []
+
+            async def collect() -> None:
+                async for ev in follower.default.bus.subscribe():
+                    if ev.type == "sound":
+                        cues.append(ev.payload["cue"])
+
+            collector = asyncio.create_task(collect())
+            await asyncio.sleep(0)
+
+            # 20 s left in the level: the leader plays the half and thirty cues.
+            timer = leader.default.timer
+            await timer.resume()
+            await timer.add_time(20_000 - timer._current_remaining_ms())
+            for _ in range(50):
+                if cues == ["half", "thirty"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert cues == ["half", "thirty"]
+            cues.clear()
+
+            await leader.close()
+            for _ in range(100):
+                # is_leader is set first; the clocks are loaded and scheduled after
+                if follower.is_leader and len(follower.scheduler):
+                    break
+                await asyncio.sleep(0.02)
+            assert follower.is_leader
+            await asyncio.sleep(0.1)
+            collector.cancel()
+
+            new_timer = follower.default.timer
+            assert new_timer._half_fired and new_timer._thirty_fired
+            assert not new_timer._five_fired
+            assert cues == []
+        finally:
+            await follower.close()
+            await leader.close()
+
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+import asyncio, dataclasses, sqlite3
+
+import aiosqlite
+import pytest
+
+from app import migrations
+from app.db import SqliteDatabase, search_players
+from app.migrations import MIGRATIONS, SQLITE_INITIAL, SQLITE_NAME_SEARCH, latest_version, migrate_sqlite
+
+
+def test_fresh_database_records_every_migration_once(tmp_path) -> None:
+    async def run() -> None:
+        path = str(tmp_path / "t.db")
+        for _ in range(2):
+            db = await SqliteDatabase.connect(path)
+            await db.close()
+        db = await SqliteDatabase.connect(path)
+        try:
+            rows = await db.fetchall("SELECT version FROM schema_version ORDER BY version")
+            assert [r["version"] for r in rows] == [m.version for m in MIGRATIONS]
+            plan = await db.fetchall("EXPLAIN QUERY PLAN SELECT table_id FROM seat_assignments WHERE player_id=?", ("p1",))
+            assert "seat_assignments_player" in " ".join(r["detail"] for r in plan)
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_unversioned_database_is_upgraded_and_duplicate_seats_cleared(tmp_path) -> None:
+    async def run() -> None:
+        path = str(tmp_path / "t.db")
+        # a database from before versioning, with a player seated twice
+        async with aiosqlite.connect(path) as conn:
+            await conn.executescript(SQLITE_INITIAL)
+            await conn.executescript("""
+                INSERT INTO tables (id, name, seats, enabled, created_at_ms) VALUES ('t1', 'One', 2, 1, 1);
+                INSERT INTO seat_assignments VALUES ('t1', 1, 'p1'), ('t1', 2, 'p1');
+            """)
+            await conn.commit()
+
+        async with aiosqlite.connect(path) as conn:
+            assert await migrate_sqlite(conn) == latest_version()
+            cur = await conn.execute("SELECT seat_num, player_id FROM seat_assignments ORDER BY seat_num")
+            assert await cur.fetchall() == [(1, "p1"), (2, None)]
+            with pytest.raises(sqlite3.IntegrityError):
+                await conn.execute("UPDATE seat_assignments SET player_id='p1' WHERE seat_num=2")
+            await conn.rollback()
+            assert await migrate_sqlite(conn) == latest_version()
+
+    asyncio.run(run())
+
+
+def test_sqlite_without_the_trigram_tokenizer_searches_without_the_index(tmp_path, monkeypatch) -> None:
+    # what a SQLite without FTS5's trigram tokenizer makes of migration 3
+    no_trigram = SQLITE_NAME_SEARCH.replace("tokenize='trigram'", "tokenize='no_such_tokenizer'")
+    monkeypatch.setattr(migrations, "MIGRATIONS", [
+        dataclasses.replace(m, sqlite=no_trigram) if m.version == 3 else m for m in MIGRATIONS
+    ])
+
+    async def run() -> None:
+        db = await SqliteDatabase.connect(str(tmp_path / "t.db"))
+        try:
+            rows = await db.fetchall("SELECT version FROM schema_version ORDER BY version")
+            assert [r["version"] for r in rows] == [m.version for m in MIGRATIONS]
+            assert not db.players_fts
+            await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES ('p1', 'Joanna Lee', 0, 0)")
+            await db.commit()
+            assert [r["name"] for r in await search_players(db, "ANNA", 10)] == ["Joanna Lee"]
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_failed_required_migration_aborts_and_leaves_the_schema_unchanged(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(migrations, "MIGRATIONS", [
+        dataclasses.replace(m, sqlite="SELECT * FROM missing;") if m.version == 4 else m for m in MIGRATIONS
+    ])
+
+    async def run() -> None:
+        async with aiosqlite.connect(str(tmp_path / "t.db")) as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                await migrate_sqlite(conn)
+            cur = await conn.execute("SELECT name FROM sqlite_master WHERE name IN ('players', 'schema_version')")
+            assert await cur.fetchall() == []
+
+    asyncio.run(run())
+
+
+def test_connect_closes_the_connection_when_a_migration_fails(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(migrations, "MIGRATIONS", [
+        dataclasses.replace(m, sqlite="SELECT * FROM missing;") if m.version == 4 else m for m in MIGRATIONS
+    ])
+    closed = []
+    monkeypatch.setattr(aiosqlite.Connection, "close", _recording_close(aiosqlite.Connection.close, closed))
+
+    async def run() -> None:
+        with pytest.raises(sqlite3.OperationalError):
+            await SqliteDatabase.connect(str(tmp_path / "t.db"))
+        assert len(closed) == 1
+
+    asyncio.run(run())
+
+
+def _recording_close(close, closed: list):
+    async def recording_close(self) -> None:
+        closed.append(self)
+        await close(self)
+    return recording_close
@@ -0,0 +1,110 @@
+import asyncio
+
+from app.read_model import ReadModel
+
+
+def test_views_are_served_from_memory_until_invalidated() -> None:
+    async def run() -> None:
+        rm = ReadModel()
+        loads: list[int] = []
+
+        async def load() -> list[int]:
+            loads.append(1)
+            return [len(loads)]
+
+        etag = rm.etag
+        assert await rm.get(("players",), load) == [1]
+        assert await rm.get(("players",), load) == [1]
+        assert len(loads) == 1
+        assert rm.etag == etag
+
+        rm.invalidate()
+        assert rm.etag != etag
+        assert await rm.get(("players",), load) == [2]
+
+    asyncio.run(run())
+
+
+def test_result_racing_a_write_is_not_cached() -> None:
+    async def run() -> None:
+        rm = ReadModel()
+
+        async def load_during_write() -> str:
+            rm.invalidate()
+            return "stale"
+
+        async def load_fresh() -> str:
+            return "fresh"
+
+        assert await rm.get(("tables",), load_during_write) == "stale"
+        assert await rm.get(("tables",), load_fresh) == "fresh"
+
+    asyncio.run(run())
+
+
+def test_invalidations_reach_every_worker_process(tmp_path) -> None:
+    from app.read_model import invalidate_roster, read_model
+    from app.settings import AppSettings
+    from app.tournaments import TournamentRegistry
+
+    settings = AppSettings(
+        database_path=str(tmp_path / "app.db"),
+        event_bus="shared",
+        bus_socket_path=str(tmp_path / "bus.sock"),
+    )
+
+    async def run() -> None:
+        a, b = TournamentRegistry(settings), TournamentRegistry(settings)
+        await a.open()
+        await b.open()
+        try:
+            rm_a, rm_b = read_model(a.default.db), read_model(b.default.db)
+
+            async def load() -> str:
+                return "players"
+
+            await rm_a.get(("players",), load)
+            await rm_b.get(("players",), load)
+            etag_a, etag_b = rm_a.etag, rm_b.etag
+
+            # A write on worker A ...
+            invalidate_roster(a.default.db)
+            assert rm_a.etag != etag_a
+            # ... drops worker B's views and ETag too.
+            for _ in range(50):
+                if rm_b.etag != etag_b:
+                    break
+                await asyncio.sleep(0.01)
+            assert rm_b.etag != etag_b
+            assert ("players",) not in rm_b._views
+            # A doesn't bump again when its own message comes back.
+            await asyncio.sleep(0.05)
+            assert rm_a.version == 2
+        finally:
+            await b.close()
+            await a.close()
+
+    asyncio.run(run())
+
+
+def test_views_cached_inside_a_rolled_back_transaction_are_dropped(run_with_db) -> None:
+    from app.read_model import invalidate_roster, read_model
+
+    async def run(db) -> None:
+        rm = read_model(db)
+
+        async def load() -> list:
+            return await db.fetchall("SELECT id FROM players")
+
+        try:
+            async with db.transaction():
+                await db.execute("INSERT INTO players (id, name, eliminated, created_at_ms) VALUES ('p1', 'Ann', 0, 0)")
+                invalidate_roster(db)
+                # the writing task reads (and caches) its own uncommitted row
+                assert await rm.get(("players",), load) == [{"id": "p1"}]
+                raise RuntimeError("roll back")
+        except RuntimeError:
+            pass
+        assert await rm.get(("players",), load) == []
+
+    run_with_db(run)
@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+
+from app.events import Event, EventBus
+from app.relay import UnixSocketRelay
+
+WORKERS = 4
+EVENTS_PER_WORKER = 50
+
+
+def _worker(index: int, path: str, barrier, results) -> None:
+    async def run() -> None:
+        relay = UnixSocketRelay(path)
+        bus = EventBus()
+        bus.attach(relay, "t1")
+        await relay.start()
+        sub = bus.subscribe()
+        first = asyncio.create_task(sub.__anext__())
+        await asyncio.sleep(0)
+        await asyncio.to_thread(barrier.wait)  # everyone connected and subscribed
+
+        for n in range(EVENTS_PER_WORKER):
+            await bus.publish(Event("sound", {"worker": index, "n": n}))
+        got = [await first]
+        while len(got) < WORKERS * EVENTS_PER_WORKER:
+            got.append(await asyncio.wait_for(sub.__anext__(), 10))
+        results.put((index, [(e.payload["worker"], e.payload["n"], e.seq) for e in got]))
+
+        await asyncio.to_thread(barrier.wait)  # nobody takes the broker down early
+        await sub.aclose()
+        await relay.close()
+
+    asyncio.run(run())
+
+
+def test_workers_see_the_same_events_in_the_same_order(tmp_path) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(WORKERS)
+    results = ctx.Queue()
+    path = str(tmp_path / "bus.sock")
+    procs = [ctx.Process(target=_worker, args=(i, path, barrier, results)) for i in range(WORKERS)]
+    for p in procs:
+        p.start()
+    try:
+        seen = dict(results.get(timeout=30) for _ in procs)
+    finally:
+        for p in procs:
+            p.join(timeout=10)
+            if p.is_alive():
+                p.kill()
+
+    orders = [[(w, n) for w, n, _ in seen[i]] for i in range(WORKERS)]
+    assert all(order == orders[0] for order in orders)
+    assert sorted(orders[0]) == [(w, n) for w in range(WORKERS) for n in range(EVENTS_PER_WORKER)]
+    for w in range(WORKERS):
+        assert [n for ww, n in orders[0] if ww == w] == list(range(EVENTS_PER_WORKER))
+    # each process numbers them consecutively on its own bus
+    assert [seq for _, _, seq in seen[0]] == list(range(1, WORKERS * EVENTS_PER_WORKER + 1))
+
+
+def test_another_process_takes_over_the_broker(tmp_path) -> None:
+    async def run() -> None:
+        path = str(tmp_path / "bus.sock")
+        first, second = UnixSocketRelay(path), UnixSocketRelay(path)
+        got, gaps = [], []
+        second.subscribe("t1", got.append, on_gap=lambda: gaps.append(True))
+        await first.start()
+        await second.start()
+        assert first._server is not None and second._server is None
+
+        await first.close()
+        for _ in range(100):
+            if second._server is not None and gaps:
+                break
+            await asyncio.sleep(0.02)
+        assert second._server is not None and gaps == [True]
+
+        await second.publish("t1", {"type": "sound", "payload": {"n": 1}})
+        await asyncio.sleep(0.05)
+        assert got == [{"type": "sound", "payload": {"n": 1}}]
+        await second.close()
+
+    asyncio.run(run())
+
+
+def test_a_bad_message_or_failing_handler_does_not_stop_delivery(tmp_path) -> None:
+    async def run() -> None:
+        relay = UnixSocketRelay(str(tmp_path / "bus.sock"))
+        got: list[dict] = []
+
+        def flaky(msg: dict) -> None:
+            if msg["payload"].get("boom"):
+                raise KeyError("boom")
+            got.append(msg)
+
+        relay.subscribe("t1", flaky)
+        await relay.start()
+        try:
+            await relay._send("t1 {not json")
+            await relay.publish("t1", {"type": "x", "payload": {"boom": True}})
+            await relay.publish("t1", {"type": "x", "payload": {"n": 1}})
+            for _ in range(100):
+                if got:
+                    break
+                await asyncio.sleep(0.01)
+            assert got == [{"type": "x", "payload": {"n": 1}}]
+        finally:
+            await relay.close()
+
+    asyncio.run(run())
@@ -0,0 +1,163 @@
+import asyncio
+from typing import Optional
+
+from app.scheduler import TimerScheduler
+from app.utils import now_ms
+
+
+class FakeTimer:
+    def __init__(self, name: str, deadline: Optional[int], fired: list[str]) -> None:
+        self.name = name
+        self.deadline = deadline
+        self.fired = fired
+
+    async def next_deadline_ms(self) -> Optional[int]:
+        return self.deadline
+
+    async def _tick(self) -> None:
+        if self.deadline is not None and now_ms() >= self.deadline:
+            self.fired.append(self.name)
+            self.deadline = None
+
+
+def test_scheduler_fires_timers_in_deadline_order() -> None:
+    async def run() -> None:
+        fired: list[str] = []
+        base = now_ms()
+        sched = TimerScheduler()
+        for name, offset in [("c", 90), ("a", 30), ("b", 60), ("idle", None)]:
+            sched.add(FakeTimer(name, None if offset is None else base + offset, fired))
+        await sched.start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await sched.stop()
+        assert fired == ["a", "b", "c"]
+
+    asyncio.run(run())
+
+
+def test_schedule_recomputes_moved_deadline() -> None:
+    async def run() -> None:
+        fired: list[str] = []
+        sched = TimerScheduler()
+        timer = FakeTimer("t", now_ms() + 60_000, fired)
+        sched.add(timer)
+        await sched.start()
+        try:
+            await asyncio.sleep(0.01)
+            timer.deadline = now_ms() + 20
+            sched.schedule(timer)
+            await asyncio.sleep(0.1)
+            assert fired == ["t"]
+
+            # Removed timers are never ticked again.
+            timer.deadline = now_ms() + 20
+            sched.remove(timer)
+            sched.schedule(timer)
+            await asyncio.sleep(0.1)
+            assert fired == ["t"]
+        finally:
+            await sched.stop()
+
+    asyncio.run(run())
+
+
+class StuckTimer:
+    """Always due, and either raises or leaves its deadline where it was."""
+
+    def __init__(self, *, raises: bool) -> None:
+        self.deadline = now_ms() - 1
+        self.raises = raises
+        self.ticks = 0
+
+    async def next_deadline_ms(self) -> Optional[int]:
+        return self.deadline
+
+    async def _tick(self) -> None:
+        self.ticks += 1
+        if self.raises:
+            raise RuntimeError("boom")
+
+
+def test_stalled_or_failing_ticks_back_off() -> None:
+    async def run() -> None:
+        fired: list[str] = []
+        sched = TimerScheduler(min_rearm_ms=20)
+        raising, stuck = StuckTimer(raises=True), StuckTimer(raises=False)
+        healthy = FakeTimer("ok", now_ms() + 100, fired)
+        for timer in (raising, stuck, healthy):
+            sched.add(timer)
+        await sched.start()
+        try:
+            await asyncio.sleep(0.3)
+        finally:
+            await sched.stop()
+        # 20 + 40 + 80 + 160 ms of backoff: a handful of ticks, not thousands.
+        assert 2 <= raising.ticks <= 6
+        assert 2 <= stuck.ticks <= 6
+        assert fired == ["ok"]
+
+        # A tick that moves the deadline on clears the backoff.
+        stuck.deadline = now_ms() + 60_000
+        sched._ticked[stuck] = (now_ms(), False)
+        sched.schedule(stuck)
+        await sched._recompute()
+        assert stuck not in sched._stalls
+
+    asyncio.run(run())
+
+
+def test_stop_is_not_lost_to_a_concurrent_wake_up() -> None:
+    async def run() -> None:
+        sched = TimerScheduler()
+        timer = FakeTimer("t", None, [])
+        sched.add(timer)
+        await sched.start()
+        await asyncio.sleep(0.01)
+        task = sched._task
+        # A cancelled tick re-queues its timer just as stop() cancels the loop.
+        sched.schedule(timer)
+        task.cancel()
+        await asyncio.wait([task], timeout=1)
+        assert task.cancelled()
+
+    asyncio.run(run())
+
+
+class SlowTimer:
+    """Due now; its tick hangs until released, like a timer waiting on a slow database."""
+
+    def __init__(self) -> None:
+        self.deadline: Optional[int] = now_ms()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.finished = False
+
+    async def next_deadline_ms(self) -> Optional[int]:
+        return self.deadline
+
+    async def _tick(self) -> None:
+        self.deadline = None
+        self.started.set()
+        await self.release.wait()
+        self.finished = True
+
+
+def test_stop_cancels_ticks_in_flight() -> None:
+    async def run() -> None:
+        sched = TimerScheduler()
+        timer = SlowTimer()
+        sched.add(timer)
+        await sched.start()
+        await asyncio.wait_for(timer.started.wait(), 1)
+        (tick,) = sched._tick_tasks
+
+        await asyncio.wait_for(sched.stop(), 1)
+        assert tick.done() and not sched._tick_tasks
+        # Nothing after the tick's pending await runs once stop() has returned.
+        timer.release.set()
+        await asyncio.sleep(0.01)
+        assert not timer.finished
+
+    asyncio.run(run())
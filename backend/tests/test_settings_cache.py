@@ -0,0 +1,40 @@
+from app.db import compile_settings, get_settings, get_settings_snapshot, set_settings
+
+
+def test_compile_settings_precomputes_durations_and_sounds() -> None:
+    snap = compile_settings(
+        {
+            "levels": [
+                {"type": "regular", "minutes": 20},
+                {"type": "break", "minutes": 5},
+            ],
+            "sounds": {"half": "half.mp3"},
+        },
+        version=3,
+    )
+    assert snap.version == 3
+    assert [lvl.duration_ms for lvl in snap.levels] == [1_200_000, 300_000]
+    assert [lvl.is_break for lvl in snap.levels] == [False, True]
+    assert snap.sounds == {"half": "half.mp3"}
+    assert snap.level_duration_ms(5) == 0
+
+
+def test_set_settings_replaces_cache_and_bumps_version(run_with_db) -> None:
+    async def run(db) -> None:
+        first = await get_settings_snapshot(db)
+        assert await get_settings_snapshot(db) is first
+
+        new = dict(first.raw, levels=[{"type": "regular", "minutes": 1}])
+        snap = await set_settings(db, new)
+        assert snap.version == first.version + 1
+        assert snap.levels[0].duration_ms == 60_000
+
+        # The cache does not alias the caller's dict.
+        new["levels"].append({"type": "regular", "minutes": 2})
+        assert len((await get_settings(db))["levels"]) == 1
+
+        # And it matches what was written.
+        db._settings_snapshot = None
+        assert (await get_settings(db))["levels"] == [{"type": "regular", "minutes": 1}]
+
+    run_with_db(run)
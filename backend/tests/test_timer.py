@@ -0,0 +1,154 @@
+import asyncio
+
+from app.db import get_settings, get_settings_snapshot, set_settings
+from app.events import EventBus
+from app.timer import TimerService, now_ms
+
+
+def test_next_deadline_is_none_while_paused(run_with_db) -> None:
+    async def run(db) -> None:
+        timer = TimerService(conn=db, bus=EventBus())
+        await timer.load()
+        snap = await get_settings_snapshot(db)
+        assert timer._next_deadline_ms(snap) is None
+
+        await timer.resume()
+        finish = timer.finish_at_server_ms
+        total = snap.level_duration_ms(0)
+        timer._last_persist_ms = finish  # take persistence out of the picture
+        assert timer._next_deadline_ms(snap) == finish - total // 2
+        timer._half_fired = True
+        assert timer._next_deadline_ms(snap) == finish - 30_000
+
+    run_with_db(run)
+
+
+def test_level_end_fires_on_deadline_after_rearm(run_with_db) -> None:
+    async def run(db) -> None:
+        bus = EventBus()
+        timer = TimerService(conn=db, bus=bus)
+        try:
+            await timer.load()
+            await timer.resume()
+            await timer.start()
+
+            async def wait_for_transition() -> int:
+                async for ev in bus.subscribe():
+                    if ev.type == "sound" and ev.payload["cue"] == "transition":
+                        return now_ms()
+
+            waiter = asyncio.create_task(wait_for_transition())
+            await asyncio.sleep(0)
+
+            # Pull the end of the level in to 100 ms from now.
+            target = now_ms() + 100
+            timer.finish_at_server_ms = target
+            timer._rearm()
+
+            fired_at = await asyncio.wait_for(waiter, 2)
+            assert fired_at >= target
+            assert fired_at - target < 50
+            assert timer.current_level_index == 1
+        finally:
+            await timer.stop()
+
+    run_with_db(run)
+
+
+def test_persist_skips_unchanged_state_until_stale(run_with_db, monkeypatch) -> None:
+    import app.timer as timer_mod
+
+    writes: list[dict] = []
+    real_set_state = timer_mod.set_state
+
+    async def counting_set_state(conn, **kw):
+        writes.append(kw)
+        await real_set_state(conn, **kw)
+
+    monkeypatch.setattr(timer_mod, "set_state", counting_set_state)
+
+    async def run(db) -> None:
+        timer = TimerService(conn=db, bus=EventBus(), persist_max_staleness_ms=60_000)
+        await timer.load()
+        await timer.resume()
+        assert len(writes) == 1
+
+        await timer._persist()
+        await timer._persist()
+        assert len(writes) == 1
+
+        await timer.add_time(60_000)
+        assert len(writes) == 2
+
+        timer._last_persist_ms -= 60_000
+        await timer._persist()
+        assert len(writes) == 3
+
+        await timer.stop()
+        assert len(writes) == 4
+
+    run_with_db(run)
+
+
+def test_settings_are_only_published_when_they_change(run_with_db) -> None:
+    async def run(db) -> None:
+        bus = EventBus()
+        timer = TimerService(conn=db, bus=bus)
+        await timer.load()
+        await timer.add_time(60_000)
+        settings = await get_settings(db)
+        await timer.apply_settings(await set_settings(db, {**settings, "levels": settings["levels"][:2]}))
+
+        published = [bus._ring[seq] for seq in range(1, bus.last_seq + 1)]
+        assert [(e.type, e.payload.get("version")) for e in published] == [
+            ("settings", 1), ("state", None), ("state", None), ("settings", 2), ("state", None),
+        ]
+        assert all("settings" not in e.payload for e in published if e.type == "state")
+        assert [e.payload["state"]["settings_version"] for e in published if e.type == "state"] == [1, 1, 2]
+
+        # New connections still get the settings with the latest state.
+        _, frame = bus.snapshot_frame()
+        assert '"levels"' in frame
+
+        # A +1 minute tap used to carry the whole settings blob with it.
+        delta = len(published[2].frame)
+        assert delta * 10 < delta + len(published[0].frame)
+
+    run_with_db(run)
+
+
+def test_shrinking_levels_past_current_index_does_not_spin(run_with_db) -> None:
+    async def run(db) -> None:
+        timer = TimerService(conn=db, bus=EventBus())
+        ticks = 0
+        real_tick = timer._tick
+
+        async def counting_tick() -> None:
+            nonlocal ticks
+            ticks += 1
+            await real_tick()
+
+        timer._tick = counting_tick
+        try:
+            await timer.load()
+            await timer.go_to_level(2)
+            await timer.resume()
+            await timer.start()
+
+            # Drop the current level from the schedule, inside its last 30 s.
+            settings = await get_settings(db)
+            snap = await set_settings(db, {**settings, "levels": settings["levels"][:2]})
+            await timer.apply_settings(snap)
+            timer.finish_at_server_ms = now_ms() + 20_000
+            timer._rearm()
+
+            assert timer._next_deadline_ms(snap) == min(
+                timer.finish_at_server_ms, timer._last_persist_ms + timer._persist_max_staleness_ms
+            )
+            await asyncio.sleep(0.2)
+            assert ticks <= 1
+            assert timer.current_level_index == 2
+        finally:
+            await timer.stop()
+
+    run_with_db(run)
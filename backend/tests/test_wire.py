@@ -0,0 +1,34 @@
+import json
+
+import msgpack
+
+from app.events import Event
+from app.wire import HOLES, FrameTemplate
+
+
+def test_frame_template_fills_holes_in_both_formats() -> None:
+    msg = {"type": "state", "payload": {"state": {"server_time_ms": HOLES[0]}, "name": "Zoë"}, "seq": HOLES[1]}
+    template = FrameTemplate(msg)
+
+    expected = {"type": "state", "payload": {"state": {"server_time_ms": 1_790_000_000_000}, "name": "Zoë"}, "seq": 7}
+    assert json.loads(template.text(1_790_000_000_000, 7)) == expected
+    assert msgpack.unpackb(template.binary(1_790_000_000_000, 7)) == expected
+    assert msgpack.unpackb(template.binary(0, 8))["seq"] == 8
+
+
+def test_frame_template_holes_cannot_be_faked_by_message_content() -> None:
+    fake = str(2**64 - 1)
+    msg = {"seq": HOLES[1], "payload": {"name": fake, "levels": [2**64 - 2, {"t": HOLES[0]}], "n": 2**64 - 1}}
+    template = FrameTemplate(msg)
+
+    expected = {"seq": 7, "payload": {"name": fake, "levels": [2**64 - 2, {"t": 5}], "n": 2**64 - 1}}
+    assert json.loads(template.text(5, 7)) == expected
+    assert msgpack.unpackb(template.binary(5, 7)) == expected
+
+
+def test_event_packed_matches_frame() -> None:
+    ev = Event("sound", {"cue": "half", "play_id": 3})
+    ev.seq = 12
+    assert ev.packed is ev.packed
+    assert msgpack.unpackb(ev.packed) == json.loads(ev.frame)
+    assert len(ev.packed) < len(ev.frame)
@@ -0,0 +1,183 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import ws_manager as wsm
+from app.clock import ClockBeacon
+from app.db import get_settings, set_settings
+from app.events import Event, EventBus
+from app.ws_manager import ClientEvicted, WSManager, websocket_endpoint
+
+
+class FakeWebSocket:
+    """Records frames; a stalled one never finishes a send, like a client that stopped reading."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.stalled = stalled
+        self.sent: list = []
+        self.closed_with = None
+
+    async def accept(self, subprotocol=None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        await self._send(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._send(data)
+
+    async def _send(self, data) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason=None) -> None:
+        self.closed_with = code
+
+
+class EndpointSocket(FakeWebSocket):
+    """Enough of a WebSocket to run websocket_endpoint against one tournament's bus."""
+
+    def __init__(self, bus: EventBus, query: dict[str, str], stalled: bool = False, db=None) -> None:
+        super().__init__(stalled)
+        tournament = SimpleNamespace(id="default", db=db, bus=bus)
+        registry = SimpleNamespace(get=lambda tid: tournament)
+        self.app = SimpleNamespace(state=SimpleNamespace(tournaments=registry, clock_beacon=ClockBeacon(0)))
+        self.scope = {"subprotocols": []}
+        self.path_params: dict[str, str] = {}
+        self.query_params = query
+        self.incoming: asyncio.Queue = asyncio.Queue()
+
+    async def receive(self) -> dict:
+        return await self.incoming.get()
+
+    def send_json(self, msg: dict) -> None:
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(msg)})
+
+    async def received(self, n: int) -> list[dict]:
+        for _ in range(100):
+            if len(self.sent) >= n:
+                break
+            await asyncio.sleep(0.01)
+        return [json.loads(f) for f in self.sent]
+
+
+async def _bus_with_events(capacity: int, sounds: int) -> EventBus:
+    bus = EventBus(capacity=capacity)
+    await bus.publish(Event("state", {"state": {"running": False, "remaining_s": 60}}))
+    for n in range(sounds):
+        await bus.publish(Event("sound", {"cue": "half", "play_id": n}))
+    return bus
+
+
+async def _run_endpoint(ws: EndpointSocket, check) -> None:
+    endpoint = asyncio.create_task(websocket_endpoint(ws))
+    try:
+        await check()
+    finally:
+        ws.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(endpoint, 1)
+
+
+def test_stalled_client_is_evicted_without_holding_up_the_others(monkeypatch) -> None:
+    monkeypatch.setattr(wsm, "SEND_TIMEOUT_S", 0.05)
+    manager = WSManager()
+    monkeypatch.setattr(wsm, "ws_manager", manager)
+
+    async def run() -> None:
+        bus = await _bus_with_events(capacity=8, sounds=0)
+        stuck, ws = EndpointSocket(bus, {}, stalled=True), EndpointSocket(bus, {})
+        stuck_endpoint = asyncio.create_task(websocket_endpoint(stuck))
+
+        async def check() -> None:
+            assert [f["type"] for f in await ws.received(1)] == ["state"]
+            await bus.publish(Event("sound", {"cue": "break", "play_id": 1}))
+            frames = await ws.received(2)
+            assert [f["type"] for f in frames] == ["state", "sound"]
+            # the stalled client's endpoint gives up on its own and closes the socket
+            await asyncio.wait_for(stuck_endpoint, 1)
+            assert stuck.closed_with == 1011
+            assert manager.evicted == 1 and manager.client_count == 1
+
+        await _run_endpoint(ws, check)
+        assert manager.client_count == 0
+
+        client = await manager.connect(FakeWebSocket(stalled=True))
+        with pytest.raises(ClientEvicted):
+            await client.send("late")
+        with pytest.raises(ClientEvicted):
+            await client.send("later")
+        assert client.evicted == "send timeout" and manager.evicted == 2
+
+    asyncio.run(run())
+
+
+def test_client_without_resume_gets_the_snapshot_at_once(monkeypatch) -> None:
+    monkeypatch.setattr(wsm, "RESUME_WAIT_S", 5)
+
+    async def run() -> None:
+        bus = await _bus_with_events(capacity=8, sounds=2)
+        ws = EndpointSocket(bus, {})
+
+        async def check() -> None:
+            await asyncio.sleep(0.1)  # well inside RESUME_WAIT_S, without sending anything
+            frames = await ws.received(1)
+            assert [f["type"] for f in frames] == ["state"]
+            assert frames[0]["seq"] == bus.last_seq and frames[0]["epoch"] == bus.epoch
+
+        await _run_endpoint(ws, check)
+
+    asyncio.run(run())
+
+
+def test_snapshot_read_from_the_database_carries_the_settings_version(run_with_db) -> None:
+    async def run(db) -> None:
+        snap = await set_settings(db, {**await get_settings(db), "name": "Friday"})
+        bus = EventBus()  # nothing published yet: the snapshot comes from the database
+        ws = EndpointSocket(bus, {}, db=db)
+
+        async def check() -> None:
+            (frame,) = await ws.received(1)
+            assert frame["type"] == "state" and frame["payload"]["settings"]["name"] == "Friday"
+            assert frame["payload"]["state"]["settings_version"] == snap.version > 1
+
+        await _run_endpoint(ws, check)
+
+    run_with_db(run)
+
+
+def test_resume_within_the_ring_replays_missed_events() -> None:
+    async def run() -> None:
+        bus = await _bus_with_events(capacity=8, sounds=4)
+        ws = EndpointSocket(bus, {"resume": "1"})
+        ws.send_json({"type": "resume", "payload": {"epoch": bus.epoch, "last_seq": 3}})
+
+        async def check() -> None:
+            frames = await ws.received(2)
+            assert [(f["type"], f["seq"]) for f in frames] == [("sound", 4), ("sound", 5)]
+
+        await _run_endpoint(ws, check)
+
+    asyncio.run(run())
+
+
+def test_resume_past_the_ring_falls_back_to_a_snapshot() -> None:
+    async def run() -> None:
+        bus = await _bus_with_events(capacity=4, sounds=8)
+        ws = EndpointSocket(bus, {"resume": "1"})
+        ws.send_json({"type": "resume", "payload": {"epoch": bus.epoch, "last_seq": 1}})
+
+        async def check() -> None:
+            frames = await ws.received(1)
+            assert [f["type"] for f in frames] == ["state"]
+            assert frames[0]["seq"] == bus.last_seq
+            await bus.publish(Event("sound", {"cue": "five", "play_id": 99}))
+            frames = await ws.received(2)
+            assert frames[1]["seq"] == bus.last_seq
+            assert bus.stats.resyncs == 1
+
+        await _run_endpoint(ws, check)
+
+    asyncio.run(run())
@@ -1,4 +1,4 @@
-import React, { useMemo } from "react";
+import React, { useMemo, useState } from "react";
 import { Announcement, Player, Table } from "../types";
 import { useTranslation } from "react-i18next";
 import { Trans } from "react-i18next";
@@ -8,6 +8,9 @@ function fmtTs(ms: number) {
   return d.toLocaleTimeString([], { hour: "2-digit", minute: "2-digit", second: "2-digit" });
 }
 
+// announcements shown at first, and added by each "load more"
+const SHOW_STEP = 10;
+
 function dedupeAnnouncements(items: Announcement[]): Announcement[] {
   const seen = new Set<string>();
   const out: Announcement[] = [];
@@ -26,17 +29,29 @@ export default function Announcements({
   items,
   playersById,
   tablesById,
-  compact = false
+  compact = false,
+  hasMore = false,
+  onLoadMore
 }: {
   items: Announcement[];
   playersById: Record<string, Player>;
   tablesById: Record<string, Table>;
   compact?: boolean;
+  hasMore?: boolean; // older announcements exist on the server beyond `items`
+  onLoadMore?: () => Promise<void>;
 }) {
   const { t } = useTranslation();
+  const [shown, setShown] = useState(SHOW_STEP);
 
   const unique = useMemo(() => dedupeAnnouncements(items), [items]);
-  const show = unique.slice(0, compact ? 1 : 10);
+  const show = unique.slice(0, compact ? 1 : shown);
+  const canShowMore = !compact && (unique.length > shown || (hasMore && !!onLoadMore));
+
+  async function showMore() {
+    // fetch the next page only once the loaded ones are all on screen
+    if (unique.length < shown + SHOW_STEP && hasMore && onLoadMore) await onLoadMore();
+    setShown((n) => n + SHOW_STEP);
+  }
 
   return (
     <div className="card">
@@ -149,6 +164,14 @@ export default function Announcements({
           ))}
         </div>
       )}
+
+      {canShowMore ? (
+        <div className="row" style={{ justifyContent: "center", marginTop: 10 }}>
+          <button className="btn" onClick={() => showMore()}>
+            {t("announcements.loadMore")}
+          </button>
+        </div>
+      ) : null}
     </div>
   );
 }
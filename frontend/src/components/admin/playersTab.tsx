@@ -1,15 +1,14 @@
-import React, { useMemo, useState } from "react";
+import React, { useState } from "react";
 import { Player } from "../../types";
+import { ApiError, apiGet } from "../../utils/api";
 import { useTranslation } from "react-i18next";
 
 function AddPlayersModal({
   open,
-  players,
   onAddPlayer,
   onClose
 }: {
   open: boolean;
-  players: Player[];
   onAddPlayer: (name?: string) => Promise<void>;
   onClose: () => void;
 }) {
@@ -18,24 +17,32 @@ function AddPlayersModal({
   const [input, setInput] = useState("");
   const [pendingPlayers, setPendingPlayers] = useState<string[]>([]);
   const [submitting, setSubmitting] = useState(false);
-
-  const existingNames = useMemo(() => {
-    return new Set(players.map((p) => p.name.trim().toLowerCase()).filter(Boolean));
-  }, [players]);
+  // names someone else added after they were checked
+  const [alreadyAdded, setAlreadyAdded] = useState<string[]>([]);
 
   function normalizeName(s: string) {
     return s.trim().replace(/\s+/g, " ");
   }
 
-  function addOne(nameRaw: string) {
+  // Only a page of the roster is loaded, so ask the server (which also refuses duplicates on add)
+  async function nameTaken(name: string) {
+    const key = name.toLowerCase();
+    try {
+      const hits = await apiGet<Player[]>(`/api/players/search?q=${encodeURIComponent(name)}&limit=50`);
+      return hits.some((p) => normalizeName(p.name).toLowerCase() === key);
+    } catch {
+      return false;
+    }
+  }
+
+  async function addOne(nameRaw: string) {
     const name = normalizeName(nameRaw);
     if (!name) return;
 
     const key = name.toLowerCase();
-    if (existingNames.has(key)) return;
-    if (pendingPlayers.some((p) => p.toLowerCase() === key)) return;
+    if (await nameTaken(name)) return;
 
-    setPendingPlayers((prev) => [...prev, name]);
+    setPendingPlayers((prev) => (prev.some((p) => p.toLowerCase() === key) ? prev : [...prev, name]));
   }
 
   function addFromInput() {
@@ -57,6 +64,7 @@ function AddPlayersModal({
   function resetAndClose() {
     setInput("");
     setPendingPlayers([]);
+    setAlreadyAdded([]);
     setSubmitting(false);
     onClose();
   }
@@ -65,9 +73,22 @@ function AddPlayersModal({
     if (pendingPlayers.length === 0) return;
 
     setSubmitting(true);
+    const taken: string[] = [];
     try {
       for (const name of pendingPlayers) {
-        await onAddPlayer(name);
+        try {
+          await onAddPlayer(name);
+        } catch (e) {
+          // 409: added elsewhere since nameTaken() passed; skip it, keep going
+          if (!(e instanceof ApiError && e.status === 409)) throw e;
+          taken.push(name);
+        }
+        // a failure leaves only the names not added yet
+        setPendingPlayers((prev) => prev.filter((p) => p !== name));
+      }
+      if (taken.length > 0) {
+        setAlreadyAdded(taken);
+        return;
       }
       resetAndClose();
     } finally {
@@ -178,6 +199,12 @@ function AddPlayersModal({
 
         <hr />
 
+        {alreadyAdded.length > 0 && (
+          <div className="muted" style={{ marginBottom: 10 }}>
+            {t("players.alreadyAdded", { names: alreadyAdded.join(", ") })}
+          </div>
+        )}
+
         <div className="row" style={{ justifyContent: "flex-end", gap: 10 }}>
           <button className="btn" onClick={resetAndClose} disabled={submitting}>
             {t("common.cancel")}
@@ -203,7 +230,9 @@ export function PlayersTab({
   onAddPlayer,
   onRenamePlayer,
   onToggleElim,
-  onDeletePlayer
+  onDeletePlayer,
+  hasMore,
+  onLoadMore
 }: {
   players: Player[];
   search: string;
@@ -213,6 +242,8 @@ export function PlayersTab({
   onRenamePlayer: (p: Player, name: string) => Promise<void>;
   onToggleElim: (p: Player) => Promise<void>;
   onDeletePlayer: (p: Player) => Promise<void>;
+  hasMore: boolean;
+  onLoadMore: () => Promise<void>;
 }) {
   const { t } = useTranslation();
   const [addOpen, setAddOpen] = useState(false);
@@ -230,7 +261,6 @@ export function PlayersTab({
 
       <AddPlayersModal
         open={addOpen}
-        players={players}
         onAddPlayer={onAddPlayer}
         onClose={() => setAddOpen(false)}
       />
@@ -281,7 +311,16 @@ export function PlayersTab({
                   className="input"
                   defaultValue={p.name}
                   disabled={p.eliminated}
-                  onBlur={(e) => onRenamePlayer(p, e.target.value)}
+                  onBlur={async (e) => {
+                    const input = e.target;
+                    try {
+                      await onRenamePlayer(p, input.value);
+                    } catch (err) {
+                      if (!(err instanceof ApiError && err.status === 409)) throw err;
+                      input.value = p.name;
+                      alert(t("players.nameTaken", { name: p.name }));
+                    }
+                  }}
                   onKeyDown={(e) => {
                     if (e.key === "Enter") (e.target as HTMLInputElement).blur();
                     if (e.key === "Escape") {
@@ -334,6 +373,14 @@ export function PlayersTab({
           ) : null}
         </tbody>
       </table>
+
+      {hasMore ? (
+        <div className="row" style={{ justifyContent: "center", marginTop: 10 }}>
+          <button className="btn" onClick={() => onLoadMore()}>
+            {t("players.loadMore")}
+          </button>
+        </div>
+      ) : null}
     </div>
   );
 }
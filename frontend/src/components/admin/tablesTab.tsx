@@ -230,7 +230,7 @@ function AddTablesModal({
 export function TablesTab({
   tables,
   seatsByTable,
-  players,
+  unseatedPlayers: unseated,
   playersById,
   onAddTable,
   onUpdateTable,
@@ -245,7 +245,7 @@ export function TablesTab({
 }: {
   tables: Table[];
   seatsByTable: Record<string, Seat[]>;
-  players: Player[];
+  unseatedPlayers: Player[];
   playersById: Record<string, Player>;
   onAddTable: (name: string, seats: number) => Promise<void>;
   onUpdateTable: (t: Table, patch: Partial<Table>) => Promise<void>;
@@ -280,12 +280,11 @@ export function TablesTab({
 
   const unseatedPlayers = useMemo(() => {
     const q = unseatedSearch.trim().toLowerCase();
-    return (players ?? [])
-      .filter((p) => !p.eliminated)
+    return (unseated ?? [])
       .filter((p) => !seatedIds.has(p.id))
       .filter((p) => (q ? p.name.toLowerCase().includes(q) : true))
       .sort((a, b) => a.name.localeCompare(b.name));
-  }, [players, seatedIds, unseatedSearch]);
+  }, [unseated, seatedIds, unseatedSearch]);
 
   React.useEffect(() => {
     if (!seatFlash?.keys?.length) return;
@@ -9,6 +9,8 @@ export function TimerTab({
   state,
   remainingMs,
   announcements,
+  hasMoreAnnouncements,
+  onLoadMoreAnnouncements,
   playersById,
   tablesById,
   onPause,
@@ -23,6 +25,8 @@ export function TimerTab({
   state: any | null;
   remainingMs: number | null;
   announcements: Announcement[];
+  hasMoreAnnouncements: boolean;
+  onLoadMoreAnnouncements: () => Promise<void>;
   playersById: Record<string, Player>;
   tablesById: Record<string, Table>;
   onPause: () => Promise<any>;
@@ -110,7 +114,13 @@ export function TimerTab({
       </div>
 
       <div className="col">
-        <Announcements items={announcements} playersById={playersById} tablesById={tablesById} />
+        <Announcements
+          items={announcements}
+          playersById={playersById}
+          tablesById={tablesById}
+          hasMore={hasMoreAnnouncements}
+          onLoadMore={onLoadMoreAnnouncements}
+        />
       </div>
     </div>
   );
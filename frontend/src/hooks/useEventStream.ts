@@ -1,12 +1,16 @@
 import { useEffect, useState } from "react";
 import { Announcement, Settings, State } from "../types";
 
-type WSMsg =
-  | { type: "state"; payload: { settings: Settings; state: State } }
+type WSMsg = (
+  | { type: "state"; payload: { settings?: Settings; state: State } } // settings only in snapshots
+  | { type: "settings"; payload: { version: number; settings: Settings } }
   | { type: "tick"; payload: Partial<State> } // optional (can keep for other fields)
   | { type: "sound"; payload: { file: string | null; play_id: number } }
   | { type: "announcement"; payload: Announcement }
-  | { type: "pong"; payload: { client_send_ms: number; server_time_ms: number } };
+  | { type: "pong"; payload: { client_send_ms: number; server_time_ms: number } }
+  | { type: "clock"; payload: { server_time_ms: number; interval_ms: number } } // server clock beacon
+  | { type: "liveness"; payload: Record<string, never> } // server asks for a sign of life
+) & { seq?: number; epoch?: string }; // bus position, used to resume after a reconnect
 
 function wsUrl(path: string) {
   const proto = window.location.protocol === "https:" ? "wss" : "ws";
@@ -18,6 +22,14 @@ let ws: WebSocket | null = null;
 let wsConnecting = false;
 let retry = 0;
 
+// last bus event seen, so a reconnect only replays what was missed
+let lastSeq: number | null = null;
+let busEpoch: string | null = null;
+
+// version of store.settings; state events only carry the version number
+let settingsVersion: number | null = null;
+let settingsFetch: Promise<void> | null = null;
+
 // clock sync
 let offsetMs = 0; // serverNow ~= Date.now() + offsetMs
 type PongSample = { rtt: number; offset: number; t: number };
@@ -34,6 +46,21 @@ let timerStatus: "excelent" | "good" | "neutral" | "bad" | "unknown" =  "unknown
 let offsetEmaAbsErr = 0;   // ms, EMA of |offset - offsetMs|
 let rttEma = 0;            // ms, EMA of RTT
 
+// Tuning thresholds
+const BAD_ERR_MS = 150;   // offset still noisy
+const OK_ERR_MS = 60;     // reasonably stable
+const GOOD_ERR_MS = 25;   // very stable
+const OK_RTT_MS = 120;    // decent network
+
+// On connect: this many back-to-back pings for a quick initial offset estimate.
+// After that the server's clock beacons keep it current; the ping loop only
+// runs while no beacons arrive (e.g. an older server, or beacons disabled).
+const BURST_SAMPLES = 5;
+let burstLeft = 0;
+let beaconsActive = false;
+let beaconSamples: number[] = [];
+let beaconWatchdog: number | null = null;
+
 // store
 let store: {
   settings: Settings | null;
@@ -88,12 +115,6 @@ function updateOffsetFromPong(clientSendMs: number, serverTimeMs: number) {
   // fast until stable, then slow down
   const now = clientRecvMs;
 
-  // Tuning thresholds
-  const BAD_ERR_MS = 150;   // offset still noisy
-  const OK_ERR_MS = 60;     // reasonably stable
-  const GOOD_ERR_MS = 25;   // very stable
-  const OK_RTT_MS = 120;    // decent network
-
   // Determine stability
   const isGood = offsetEmaAbsErr < GOOD_ERR_MS && rttEma < OK_RTT_MS;
   const isOk = offsetEmaAbsErr < OK_ERR_MS;
@@ -132,6 +153,54 @@ function updateOffsetFromPong(clientSendMs: number, serverTimeMs: number) {
   startPingLoop(2000);
 }
 
+function updateOffsetFromBeacon(serverTimeMs: number, intervalMs: number) {
+  const clientRecvMs = Date.now();
+
+  // The beacon left the server one-way-delay ago: estimate that as half the
+  // best RTT from the pings.
+  let oneWay = 0;
+  if (samples.length > 0) {
+    let best = samples[0];
+    for (const s of samples) if (s.rtt < best.rtt) best = s;
+    oneWay = best.rtt / 2;
+  }
+  const measuredOffset = serverTimeMs + oneWay - clientRecvMs;
+
+  // Any extra delay (busy server or network) only makes a beacon look late,
+  // so the largest offset in the window is the most accurate one.
+  beaconSamples.push(measuredOffset);
+  if (beaconSamples.length > SAMPLE_WINDOW) beaconSamples.shift();
+  const bestOffset = Math.max(...beaconSamples);
+
+  const alpha = 0.15;
+  offsetMs = offsetMs * (1 - alpha) + bestOffset * alpha;
+
+  offsetEmaAbsErr = offsetEmaAbsErr * 0.9 + Math.abs(measuredOffset - offsetMs) * 0.1;
+  if (offsetEmaAbsErr > BAD_ERR_MS) timerStatus = "bad";
+  else if (offsetEmaAbsErr >= OK_ERR_MS) timerStatus = "neutral";
+  else if (offsetEmaAbsErr < GOOD_ERR_MS) timerStatus = "excelent";
+  else timerStatus = "good";
+
+  if (!beaconsActive) {
+    beaconsActive = true;
+    stopPingLoop();
+  }
+  // Beacons stopped (server restarted with them off, proxy buffering, ...):
+  // go back to pinging.
+  if (beaconWatchdog != null) window.clearTimeout(beaconWatchdog);
+  beaconWatchdog = window.setTimeout(() => {
+    stopBeacons();
+    if (ws) startPingLoop(pingPeriodMs);
+  }, intervalMs * 3);
+}
+
+function stopBeacons() {
+  if (beaconWatchdog != null) window.clearTimeout(beaconWatchdog);
+  beaconWatchdog = null;
+  beaconSamples = [];
+  beaconsActive = false;
+}
+
 function sendPing() {
   if (!ws || ws.readyState !== WebSocket.OPEN) return;
   const client_send_ms = Date.now();
@@ -141,6 +210,13 @@ function sendPing() {
 }
 
 function startPingLoop(periodMs: number) {
+  // clock beacons keep the offset current; no need to ping
+  if (beaconsActive) {
+    pingPeriodMs = periodMs;
+    stopPingLoop();
+    return;
+  }
+
   // restart only if period changed
   if (pingLooper != null && periodMs === pingPeriodMs) return;
 
@@ -179,6 +255,24 @@ function computeRemainingMs(state: State | null): number | null {
   }
 }
 
+function fetchSettings() {
+  if (settingsFetch) return settingsFetch;
+  settingsFetch = (async () => {
+    try {
+      const r = await fetch("/api/settings");
+      const data = await r.json();
+      store.settings = data.settings;
+      settingsVersion = data.version;
+      emit();
+    } catch {
+      // ignore
+    } finally {
+      settingsFetch = null;
+    }
+  })();
+  return settingsFetch;
+}
+
 async function ensureInitialState() {
   if (store.settings && store.state) return;
   try {
@@ -186,6 +280,7 @@ async function ensureInitialState() {
     const data = await r.json();
     store.settings = data.settings;
     store.state = data.state;
+    if (typeof data?.settings_version === "number") settingsVersion = data.settings_version;
 
     if (data?.state?.server_time_ms) {
       seedOffsetFromServerTime(data.state.server_time_ms);
@@ -202,7 +297,9 @@ function ensureSocket() {
   wsConnecting = true;
 
   const connect = () => {
-    ws = new WebSocket(wsUrl("/ws"));
+    // ?resume=1 tells the server to wait for our resume message before sending a snapshot
+    const resuming = busEpoch != null && lastSeq != null;
+    ws = new WebSocket(wsUrl(resuming ? "/ws?resume=1" : "/ws"));
 
     ws.onopen = () => {
       wsConnecting = false;
@@ -210,13 +307,18 @@ function ensureSocket() {
       store.connected = true;
       emit();
 
-      // immediate sync ping + start ping loop
-      try {
-        const client_send_ms = Date.now();
-        ws?.send(JSON.stringify({ type: "ping", payload: { client_send_ms } }));
-      } catch {
-        // ignore
+      // resume must be the first message; the server falls back to a full snapshot
+      if (resuming) {
+        try {
+          ws?.send(JSON.stringify({ type: "resume", payload: { epoch: busEpoch, last_seq: lastSeq } }));
+        } catch {
+          // ignore
+        }
       }
+
+      // sync burst (each pong triggers the next ping) + ping loop until beacons arrive
+      burstLeft = BURST_SAMPLES - 1;
+      sendPing();
       startPingLoop(pingPeriodMs);
     };
 
@@ -227,6 +329,7 @@ function ensureSocket() {
       wsConnecting = false;
 
       stopPingLoop();
+      stopBeacons();
 
       // reconnect with backoff
       retry += 1;
@@ -244,16 +347,47 @@ function ensureSocket() {
       try {
         const msg: WSMsg = JSON.parse(evt.data);
 
+        if (typeof msg.epoch === "string") busEpoch = msg.epoch;
+        if (typeof msg.seq === "number") lastSeq = msg.seq;
+
         if (msg.type === "pong") {
           updateOffsetFromPong(msg.payload.client_send_ms, msg.payload.server_time_ms);
+          if (burstLeft > 0) {
+            burstLeft -= 1;
+            sendPing();
+          }
           return;
         }
 
-        if (msg.type === "state") {
+        if (msg.type === "liveness") {
+          sendPing(); // any message will do; a ping also refreshes the offset
+          return;
+        }
+
+        if (msg.type === "clock") {
+          updateOffsetFromBeacon(msg.payload.server_time_ms, msg.payload.interval_ms);
+          return;
+        }
+
+        if (msg.type === "settings") {
           store.settings = msg.payload.settings;
+          settingsVersion = msg.payload.version;
+          emit();
+          return;
+        }
+
+        if (msg.type === "state") {
           store.state = msg.payload.state;
 
           const st: any = msg.payload.state as any;
+          if (msg.payload.settings) {
+            store.settings = msg.payload.settings;
+            if (typeof st?.settings_version === "number") settingsVersion = st.settings_version;
+          } else if (typeof st?.settings_version === "number" && st.settings_version !== settingsVersion) {
+            // missed the settings event (e.g. state fetched before it): load on demand
+            fetchSettings();
+          }
+
           if (typeof st?.server_time_ms === "number") {
             seedOffsetFromServerTime(st.server_time_ms);
           }
@@ -339,6 +473,7 @@ export function useEventStream() {
       // If nobody is listening anymore, close the socket
       if (listeners.size === 0) {
         stopPingLoop();
+        stopBeacons();
         try {
           ws?.close();
         } catch {}
@@ -1,47 +1,89 @@
 import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { apiGet } from "../utils/api";
-import { Announcement, Player, Seat, Table } from "../types";
+import { Announcement, Page, Player, Seat, Table } from "../types";
 
 type TourneyDataOpts = {
   playerSearch?: string;   // optional search query for /api/players
   auto?: boolean;          // default true: load on mount and when search changes
+  playerPageSize?: number; // players per page (default 100); loadMorePlayers() fetches the next one
 };
 
+const ANNOUNCEMENT_PAGE_SIZE = 50;
+// the server's largest page; used to walk whole listings in as few requests as possible
+const MAX_PAGE_SIZE = 500;
+
+function pageUrl(path: string, params: Record<string, string | number | null>) {
+  const qs = Object.entries(params)
+    .filter(([, v]) => v !== null && v !== "")
+    .map(([k, v]) => `${k}=${encodeURIComponent(String(v))}`)
+    .join("&");
+  return qs ? `${path}?${qs}` : path;
+}
+
+// Every page of a listing, for the few views that need all of it (e.g. the unseated players)
+async function fetchAllPages<T>(path: string, params: Record<string, string | number | null>): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await apiGet<Page<T>>(pageUrl(path, { ...params, limit: MAX_PAGE_SIZE, cursor }));
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}
+
+// Append a page, skipping rows already shown (a player eliminated between pages comes round again)
+function appendPage<T extends { id?: string | number }>(prev: T[], items: T[]): T[] {
+  const seen = new Set(prev.map((x) => x.id));
+  return [...prev, ...items.filter((x) => x.id === undefined || !seen.has(x.id))];
+}
+
 export function useTourneyData(opts: TourneyDataOpts = {}) {
-  const { playerSearch = "", auto = true } = opts;
+  const { playerSearch = "", auto = true, playerPageSize = 100 } = opts;
 
   const [sounds, setSounds] = useState<string[]>([]);
   const [players, setPlayers] = useState<Player[]>([]);
+  const [unseatedPlayers, setUnseatedPlayers] = useState<Player[]>([]);
   const [tables, setTables] = useState<Table[]>([]);
   const [seats, setSeats] = useState<Seat[]>([]);
   const [announcements, setAnnouncements] = useState<Announcement[]>([]);
+  const [playersCursor, setPlayersCursor] = useState<string | null>(null);
+  const [announcementsCursor, setAnnouncementsCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   // prevent overlapping loads
   const inFlightRef = useRef<Promise<void> | null>(null);
+  // bumped by every reload, so a "load more" that started before it is dropped
+  const generationRef = useRef(0);
+  const moreInFlightRef = useRef({ players: false, announcements: false });
 
   const reload = useCallback(async () => {
     if (inFlightRef.current) return inFlightRef.current;
 
+    generationRef.current += 1;
     setLoading(true);
     setError(null);
 
     const p = (async () => {
       try {
-        const [snd, pls, tbs, sts, anns] = await Promise.all([
+        const [snd, pls, unseated, tbs, sts, anns] = await Promise.all([
           apiGet<{ files: string[] }>("/api/sounds"),
-          apiGet<Player[]>(`/api/players?q=${encodeURIComponent(playerSearch)}`),
+          apiGet<Page<Player>>(pageUrl("/api/players", { q: playerSearch, limit: playerPageSize })),
+          fetchAllPages<Player>("/api/players", { eliminated: "false", unseated: "true" }),
           apiGet<Table[]>("/api/tables"),
           apiGet<Seat[]>("/api/seats"),
-          apiGet<{ items: Announcement[] }>("/api/announcements?limit=50"),
+          apiGet<Page<Announcement>>(pageUrl("/api/announcements", { limit: ANNOUNCEMENT_PAGE_SIZE })),
         ]);
 
         setSounds(snd.files);
-        setPlayers(pls);
+        setPlayers(pls.items);
+        setPlayersCursor(pls.next_cursor);
+        setUnseatedPlayers(unseated);
         setTables(tbs);
         setSeats(sts);
         setAnnouncements(anns.items);
+        setAnnouncementsCursor(anns.next_cursor);
       } catch (e: any) {
         setError(String(e?.message ?? e));
       } finally {
@@ -52,17 +94,60 @@ export function useTourneyData(opts: TourneyDataOpts = {}) {
 
     inFlightRef.current = p;
     return p;
-  }, [playerSearch]);
+  }, [playerSearch, playerPageSize]);
+
+  const loadMorePlayers = useCallback(async () => {
+    if (!playersCursor || moreInFlightRef.current.players) return;
+    moreInFlightRef.current.players = true;
+    const generation = generationRef.current;
+    try {
+      const page = await apiGet<Page<Player>>(
+        pageUrl("/api/players", { q: playerSearch, limit: playerPageSize, cursor: playersCursor })
+      );
+      if (generation !== generationRef.current) return;
+      setPlayers((prev) => appendPage(prev, page.items));
+      setPlayersCursor(page.next_cursor);
+    } catch (e: any) {
+      setError(String(e?.message ?? e));
+    } finally {
+      moreInFlightRef.current.players = false;
+    }
+  }, [playerSearch, playerPageSize, playersCursor]);
+
+  const loadMoreAnnouncements = useCallback(async () => {
+    if (!announcementsCursor || moreInFlightRef.current.announcements) return;
+    moreInFlightRef.current.announcements = true;
+    const generation = generationRef.current;
+    try {
+      const page = await apiGet<Page<Announcement>>(
+        pageUrl("/api/announcements", { limit: ANNOUNCEMENT_PAGE_SIZE, cursor: announcementsCursor })
+      );
+      if (generation !== generationRef.current) return;
+      setAnnouncements((prev) => appendPage(prev, page.items));
+      setAnnouncementsCursor(page.next_cursor);
+    } catch (e: any) {
+      setError(String(e?.message ?? e));
+    } finally {
+      moreInFlightRef.current.announcements = false;
+    }
+  }, [announcementsCursor]);
 
   useEffect(() => {
     if (!auto) return;
     reload();
   }, [auto, reload]);
 
-  const playersById = useMemo(
-    () => Object.fromEntries(players.map((p) => [p.id, p])),
-    [players]
-  );
+  // Seated players may be on pages not loaded yet; the seat listing carries their names.
+  const playersById = useMemo(() => {
+    const m: Record<string, Player> = {};
+    for (const s of seats) {
+      if (s.player_id && s.player_name) {
+        m[s.player_id] = { id: s.player_id, name: s.player_name, eliminated: !!s.player_eliminated };
+      }
+    }
+    for (const p of players) m[p.id] = p;
+    return m;
+  }, [players, seats]);
 
   const tablesById = useMemo(
     () => Object.fromEntries(tables.map((t) => [t.id, t])),
@@ -79,6 +164,7 @@ export function useTourneyData(opts: TourneyDataOpts = {}) {
   return {
     sounds,
     players,
+    unseatedPlayers, // every active player without a seat, whatever page `players` is on
     tables,
     seats,
     announcements,
@@ -87,6 +173,11 @@ export function useTourneyData(opts: TourneyDataOpts = {}) {
     tablesById,
     seatsByTable,
 
+    hasMorePlayers: playersCursor !== null,
+    loadMorePlayers,
+    hasMoreAnnouncements: announcementsCursor !== null,
+    loadMoreAnnouncements,
+
     loading,
     error,
     reload,
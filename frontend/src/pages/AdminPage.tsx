@@ -29,8 +29,23 @@ export default function AdminPage() {
     if (!levelsDirty) setLevelsDraft(settings.levels ?? []);
   }, [settings, levelsDirty]);
 
-  const { sounds, players, tables, announcements, playersById, tablesById, seatsByTable, error, reload, setAnnouncements } =
-    useTourneyData({ playerSearch: search, auto: true });
+  const {
+    sounds,
+    players,
+    unseatedPlayers,
+    tables,
+    announcements,
+    playersById,
+    tablesById,
+    seatsByTable,
+    hasMorePlayers,
+    loadMorePlayers,
+    hasMoreAnnouncements,
+    loadMoreAnnouncements,
+    error,
+    reload,
+    setAnnouncements
+  } = useTourneyData({ playerSearch: search, auto: true });
 
   const seatByPlayer = useMemo(() => {
     const out: Record<string, { tableId: string; tableName: string; seatNum: number }> = {};
@@ -212,6 +227,8 @@ export default function AdminPage() {
           state={state}
           remainingMs={remainingMs}
           announcements={announcements}
+          hasMoreAnnouncements={hasMoreAnnouncements}
+          onLoadMoreAnnouncements={loadMoreAnnouncements}
           playersById={playersById}
           tablesById={tablesById}
           onPause={timerPause}
@@ -234,6 +251,8 @@ export default function AdminPage() {
           onRenamePlayer={renamePlayer}
           onToggleElim={toggleElim}
           onDeletePlayer={deletePlayer}
+          hasMore={hasMorePlayers}
+          onLoadMore={loadMorePlayers}
         />
       ) : null}
 
@@ -254,7 +273,7 @@ export default function AdminPage() {
         <TablesTab
           tables={tables}
           seatsByTable={seatsByTable}
-          players={players}
+          unseatedPlayers={unseatedPlayers}
           playersById={playersById}
           onAddTable={addTable}
           onUpdateTable={updateTable}
@@ -34,12 +34,16 @@ export type State = {
   server_time_ms: number;
   remaining_ms: number;
   finish_at_server_ms: number;
+  settings_version?: number;
 };
 
 export type Player = { id: string; name: string; eliminated: boolean; };
 
 export type Table = { id: string; name: string; seats: number; enabled: boolean; };
 
-export type Seat = { table_id: string; table_name: string; seat_num: number; player_id: string | null; };
+export type Seat = { table_id: string; table_name: string; seat_num: number; player_id: string | null; player_name?: string | null; player_eliminated?: boolean | null; };
 
 export type Announcement = { id?: number; created_at_ms: number; type: string; payload: any; };
+
+// One page of a keyset-paginated listing; pass next_cursor back as ?cursor= for the next one.
+export type Page<T> = { items: T[]; next_cursor: string | null; };
@@ -1,6 +1,13 @@
+// A non-2xx response; `status` tells e.g. a 409 conflict from other failures
+export class ApiError extends Error {
+  constructor(public status: number, message: string) {
+    super(message);
+  }
+}
+
 export async function apiGet<T>(path: string): Promise<T> {
   const res = await fetch(path, { credentials: "same-origin" });
-  if (!res.ok) throw new Error(await res.text());
+  if (!res.ok) throw new ApiError(res.status, await res.text());
   return res.json();
 }
 
@@ -11,7 +18,7 @@ export async function apiPost<T>(path: string, body?: any): Promise<T> {
     body: body !== undefined ? JSON.stringify(body) : undefined,
     credentials: "same-origin"
   });
-  if (!res.ok) throw new Error(await res.text());
+  if (!res.ok) throw new ApiError(res.status, await res.text());
   return res.json();
 }
 
@@ -22,7 +29,7 @@ export async function apiPut<T>(path: string, body: any): Promise<T> {
     body: JSON.stringify(body),
     credentials: "same-origin"
   });
-  if (!res.ok) throw new Error(await res.text());
+  if (!res.ok) throw new ApiError(res.status, await res.text());
   return res.json();
 }
 
@@ -33,12 +40,12 @@ export async function apiPatch<T>(path: string, body: any): Promise<T> {
     body: JSON.stringify(body),
     credentials: "same-origin"
   });
-  if (!res.ok) throw new Error(await res.text());
+  if (!res.ok) throw new ApiError(res.status, await res.text());
   return res.json();
 }
 
 export async function apiDelete<T>(path: string): Promise<T> {
   const res = await fetch(path, { method: "DELETE", credentials: "same-origin" });
-  if (!res.ok) throw new Error(await res.text());
+  if (!res.ok) throw new ApiError(res.status, await res.text());
   return res.json();
 }